@@ -0,0 +1,36 @@
+"""rendered documents
+
+Revision ID: 2d9f4c6a8e13
+Revises: 5b8e0d3f6c27
+Create Date: 2026-10-17 16:02:14.508213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '2d9f4c6a8e13'
+down_revision = '5b8e0d3f6c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rendered_documents',
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('revision_id', sa.Integer(), nullable=False),
+        sa.Column('documents', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['revision_id'], ['revisions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('cache_key', 'revision_id'),
+        mysql_charset='utf8',
+        mysql_engine='Postgre'
+    )
+
+
+def downgrade():
+    op.drop_table('rendered_documents')
@@ -0,0 +1,109 @@
+"""content-addressed document blobs
+
+Revision ID: 3c2f5b7d9a41
+Revises: 918bbfd28185
+Create Date: 2026-10-17 09:12:40.512316
+
+"""
+import hashlib
+import logging
+
+from alembic import op
+from oslo_serialization import jsonutils as json
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = '3c2f5b7d9a41'
+down_revision = '918bbfd28185'
+branch_labels = None
+depends_on = None
+
+LOG = logging.getLogger('alembic.runtime.migration')
+
+select_deleted_documents = text("""
+select id, meta from documents where deleted = true
+""")
+
+update_metadata_hash = text("""
+update documents set metadata_hash = :metadata_hash where id = :id
+""")
+
+copy_data_blobs = text("""
+insert into document_blobs (hash, content, created_at, deleted)
+ select distinct on (data_hash) data_hash, data, now(), false from documents
+ on conflict (hash) do nothing
+""")
+
+copy_metadata_blobs = text("""
+insert into document_blobs (hash, content, created_at, deleted)
+ select distinct on (metadata_hash) metadata_hash, meta, now(), false
+ from documents
+ on conflict (hash) do nothing
+""")
+
+restore_blobs = text("""
+update documents d set data = b1.content, meta = b2.content
+ from document_blobs b1, document_blobs b2
+ where b1.hash = d.data_hash and b2.hash = d.metadata_hash
+""")
+
+
+def _make_hash(data):
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def upgrade():
+    op.create_table('document_blobs',
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('hash', sa.String(), nullable=False),
+        sa.Column('content', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.PrimaryKeyConstraint('hash'),
+        mysql_charset='utf8',
+        mysql_engine='Postgre'
+    )
+
+    conn = op.get_bind()
+
+    # Deletion markers used to store the hash of empty metadata alongside
+    # their actual metadata. Blobs are keyed by the hash of their content, so
+    # recompute those hashes before copying anything over.
+    LOG.info("Recomputing metadata hashes for deleted documents")
+    rs = conn.execute(select_deleted_documents)
+    updates = [{'id': row[0], 'metadata_hash': _make_hash(row[1])}
+               for row in rs]
+    if updates:
+        conn.execute(update_metadata_hash, updates)
+
+    LOG.info("Copying document data and metadata into 'document_blobs'")
+    conn.execute(copy_data_blobs)
+    conn.execute(copy_metadata_blobs)
+
+    op.create_foreign_key('documents_data_hash_fkey', 'documents',
+                          'document_blobs', ['data_hash'], ['hash'])
+    op.create_foreign_key('documents_metadata_hash_fkey', 'documents',
+                          'document_blobs', ['metadata_hash'], ['hash'])
+    op.drop_column('documents', 'data')
+    op.drop_column('documents', 'meta')
+
+
+def downgrade():
+    op.add_column('documents',
+        sa.Column('meta', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('documents',
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+    conn = op.get_bind()
+    conn.execute(restore_blobs)
+
+    op.alter_column('documents', 'meta', nullable=False)
+    op.drop_constraint('documents_metadata_hash_fkey', 'documents',
+                       type_='foreignkey')
+    op.drop_constraint('documents_data_hash_fkey', 'documents',
+                       type_='foreignkey')
+    op.drop_table('document_blobs')
@@ -0,0 +1,52 @@
+"""validation rollups
+
+Revision ID: 5b8e0d3f6c27
+Revises: 7e1a9c4d2b58
+Create Date: 2026-10-17 14:26:51.830427
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = '5b8e0d3f6c27'
+down_revision = '7e1a9c4d2b58'
+branch_labels = None
+depends_on = None
+
+LOG = logging.getLogger('alembic.runtime.migration')
+
+populate_rollups = text("""
+insert into validation_rollups
+ (revision_id, name, worst_status, count, created_at, deleted)
+ select revision_id, name, min(status), count(*), now(), false
+ from validations group by revision_id, name
+""")
+
+
+def upgrade():
+    op.create_table('validation_rollups',
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('revision_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('worst_status', sa.String(length=8), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['revision_id'], ['revisions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('revision_id', 'name'),
+        mysql_charset='utf8',
+        mysql_engine='Postgre'
+    )
+
+    LOG.info("Populating 'validation_rollups' from 'validations'")
+    conn = op.get_bind()
+    conn.execute(populate_rollups)
+
+
+def downgrade():
+    op.drop_table('validation_rollups')
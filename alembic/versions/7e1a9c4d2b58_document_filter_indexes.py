@@ -0,0 +1,34 @@
+"""document filter indexes
+
+Revision ID: 7e1a9c4d2b58
+Revises: 3c2f5b7d9a41
+Create Date: 2026-10-17 11:03:18.274190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e1a9c4d2b58'
+down_revision = '3c2f5b7d9a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_document_blobs_content', 'document_blobs',
+                    ['content'], postgresql_using='gin',
+                    postgresql_ops={'content': 'jsonb_path_ops'})
+    op.create_index('ix_documents_schema', 'documents', ['schema'],
+                    postgresql_ops={'schema': 'varchar_pattern_ops'})
+    op.create_index('ix_documents_data_hash', 'documents', ['data_hash'])
+    op.create_index('ix_documents_metadata_hash', 'documents',
+                    ['metadata_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_documents_metadata_hash', table_name='documents')
+    op.drop_index('ix_documents_data_hash', table_name='documents')
+    op.drop_index('ix_documents_schema', table_name='documents')
+    op.drop_index('ix_document_blobs_content', table_name='document_blobs')
@@ -0,0 +1,197 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compiled JSONPaths for the subset of JSONPath used by Deckhand.
+
+Document paths are almost always made of dotted keys, quoted keys, ``[n]``
+indices and ``[*]``. Such paths are compiled once into a sequence of steps
+which are evaluated directly against the data, which is much faster than
+evaluating them with jsonpath_ng. :func:`parse` returns None for any other
+path, in which case callers fall back to jsonpath_ng.
+"""
+
+import copy
+import functools
+import re
+
+_FIELD, _INDEX, _ALL = range(3)
+_MISSING = object()
+
+# Mirrors the identifiers and quoted strings accepted by jsonpath_ng, minus
+# escape sequences.
+_TOKEN_RE = re.compile(r"""
+    \.(?P<field>[A-Za-z_@][A-Za-z0-9_@\-]*)
+    | \.'(?P<single_quoted>[^'\\]*)'
+    | \."(?P<double_quoted>[^"\\]*)"
+    | \[(?P<index>\d+)\]
+    | \[(?P<all>\*)\]
+""", re.VERBOSE)
+# Keywords of jsonpath_ng which aren't keys.
+_RESERVED_WORDS = ('where', 'wherenot')
+
+
+class UnsupportedUpdate(Exception):
+    """Raised by :meth:`CompiledPath.update` when it can't update the data,
+    which should then be updated using jsonpath_ng instead.
+    """
+
+
+class CompiledPath(object):
+    """A compiled JSONPath.
+
+    Returns the same matches as jsonpath_ng for the same path.
+    """
+
+    __slots__ = ('_steps', '_updatable')
+
+    def __init__(self, steps):
+        self._steps = steps
+        self._updatable = all(kind != _ALL for kind, _ in steps)
+
+    def find(self, data):
+        """Return the values in ``data`` matching the path.
+
+        :param data: Data to search.
+        :returns: List of values found, in order.
+        :rtype: list
+        """
+        matches = [data]
+        for kind, key in self._steps:
+            next_matches = []
+            for value in matches:
+                if kind == _FIELD:
+                    try:
+                        value = value.get(key, _MISSING)
+                    except (AttributeError, TypeError):
+                        continue
+                    if value is not _MISSING:
+                        next_matches.append(value)
+                elif kind == _INDEX:
+                    if isinstance(value, (list, str)) and len(value) > key:
+                        next_matches.append(value[key])
+                elif value is not None:
+                    # Like jsonpath_ng, ``[*]`` treats anything but a list as
+                    # a list of one element.
+                    if isinstance(value, list):
+                        next_matches.extend(value)
+                    elif isinstance(value, (dict, int, float, str)):
+                        next_matches.append(value)
+            matches = next_matches
+        return matches
+
+    def update(self, data, replace, owned=None):
+        """Return a copy of ``data`` with the value at the path replaced.
+
+        Missing keys and indices along the path are created, as empty dicts
+        and lists padded with empty dicts. Only the dicts and lists leading to
+        the value are copied: everything else is shared with ``data``.
+
+        :param data: Data to update. Not modified, unless in ``owned``.
+        :param replace: Function called with the value at the path, or an
+            empty dict if missing, which returns its replacement.
+        :param owned: Dicts and lists keyed by ``id`` which are updated in
+            place rather than copied. Those copied or created by this update
+            are added to it, so that further updates of the returned data
+            don't copy them again.
+        :type owned: dict
+        :returns: The updated copy of ``data``.
+        :raises UnsupportedUpdate: If the path contains ``[*]`` or if the
+            data along the path isn't the dict or list the path expects.
+        """
+        if not self._updatable:
+            raise UnsupportedUpdate()
+        return self._update(data, replace, owned)
+
+    def _update(self, data, replace, owned):
+        # Copy the containers along the path first, then assign the values
+        # from the bottom up, so that nothing is modified if ``replace``
+        # fails.
+        if owned is None:
+            owned = {}
+        containers = []
+        value = data
+        for kind, key in self._steps:
+            if kind == _FIELD:
+                if value is _MISSING:
+                    container = {}
+                elif not isinstance(value, dict):
+                    raise UnsupportedUpdate()
+                elif id(value) in owned:
+                    container = value
+                else:
+                    container = copy.copy(value)
+                value = container.get(key, _MISSING)
+            else:
+                if value is _MISSING:
+                    container = []
+                elif not isinstance(value, list):
+                    raise UnsupportedUpdate()
+                elif id(value) in owned:
+                    container = value
+                else:
+                    container = list(value)
+                value = container[key] if len(container) > key else _MISSING
+            containers.append(container)
+
+        value = replace({} if value is _MISSING else value)
+        for (kind, key), container in zip(reversed(self._steps),
+                                          reversed(containers)):
+            if kind == _INDEX and len(container) <= key:
+                container.extend({} for _ in range(key - len(container)))
+                container.append(value)
+            else:
+                container[key] = value
+            # Keeping a reference also ensures that the id isn't reused.
+            owned.setdefault(id(container), container)
+            value = container
+        return value
+
+
+@functools.lru_cache(maxsize=1024)
+def parse(jsonpath):
+    """Compile ``jsonpath``.
+
+    :param jsonpath: JSONPath, starting with "$" or relative to the root.
+    :type jsonpath: str
+    :returns: The compiled path, or None if ``jsonpath`` isn't made only of
+        keys, quoted keys, ``[n]`` indices and ``[*]``.
+    :rtype: :class:`CompiledPath`
+    """
+    if jsonpath.startswith('$'):
+        remainder = jsonpath[1:]
+    elif jsonpath.startswith('['):
+        remainder = jsonpath
+    else:
+        remainder = '.' + jsonpath
+
+    steps = []
+    position = 0
+    while position < len(remainder):
+        match = _TOKEN_RE.match(remainder, position)
+        if not match:
+            return None
+        position = match.end()
+        if match.group('field') is not None:
+            if match.group('field') in _RESERVED_WORDS:
+                return None
+            steps.append((_FIELD, match.group('field')))
+        elif match.group('single_quoted') is not None:
+            steps.append((_FIELD, match.group('single_quoted')))
+        elif match.group('double_quoted') is not None:
+            steps.append((_FIELD, match.group('double_quoted')))
+        elif match.group('index') is not None:
+            steps.append((_INDEX, int(match.group('index'))))
+        else:
+            steps.append((_ALL, None))
+    return CompiledPath(tuple(steps))
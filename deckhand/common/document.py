@@ -41,6 +41,9 @@ class DocumentDict(dict):
 
     """
 
+    # Documents are numerous, so they have no ``__dict__``.
+    __slots__ = ('_replaced_by',)
+
     @property
     def meta(self):
         return (self.schema, self.layer, self.name)
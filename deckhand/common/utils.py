@@ -14,6 +14,7 @@
 
 import ast
 import copy
+import functools
 import re
 import six
 import string
@@ -24,6 +25,7 @@ from beaker.util import parse_cache_config_options
 import jsonpath_ng
 from oslo_log import log as logging
 
+from deckhand.common import compiled_path
 from deckhand.common.document import DocumentDict as document_dict
 from deckhand.conf import config
 from deckhand import errors
@@ -40,6 +42,8 @@ _CACHE_OPTS = {
 _CACHE = CacheManager(**parse_cache_config_options(_CACHE_OPTS))
 
 _ARRAY_RE = re.compile(r'.*\[\d+\].*')
+_PATH_SEGMENT_RE = re.compile(r'^([^\[\]\'"*]+)((?:\[\d+\])*)$')
+_PATH_INDEX_RE = re.compile(r'\[(\d+)\]')
 
 
 def safe_yaml_dump(data):
@@ -114,23 +118,20 @@ def jsonpath_parse(data, jsonpath, match_all=False):
         # Do something with the extracted secret from the source document.
     """
     jsonpath = _normalize_jsonpath(jsonpath)
-    p = _jsonpath_parse(jsonpath)
-
-    matches = p.find(data)
-    if matches:
-        result = [m.value for m in matches]
+    compiled = compiled_path.parse(jsonpath)
+    if compiled is not None:
+        result = compiled.find(data)
+    else:
+        result = [m.value for m in _jsonpath_parse(jsonpath).find(data)]
+    if result:
         return result if match_all else result[0]
 
 
-def _execute_replace(data, value, jsonpath, pattern=None, recurse=None):
-    # These are O(1) reference copies to avoid accidentally modifying source
-    # data. We only want to update destination data.
-    data_copy = copy.copy(data)
-    value_copy = copy.copy(value)
-
-    path = _jsonpath_parse(jsonpath)
-    path_to_change = path.find(data_copy)
+def _replace_value(to_replace, value, jsonpath, pattern=None, recurse=None):
+    # Returns what replaces ``to_replace``, the value found at ``jsonpath``.
     recurse = recurse or {}
+    if not pattern:
+        return value
 
     def _try_replace_pattern(to_replace):
         try:
@@ -141,12 +142,12 @@ def _execute_replace(data, value, jsonpath, pattern=None, recurse=None):
             # to_replace and a pattern has been provided since it is
             # otherwise impossible to do the look-up.
             replacement = re.sub(pattern,
-                                 six.text_type(value_copy),
+                                 six.text_type(value),
                                  to_replace)
         except TypeError as e:
             LOG.error('Failed to substitute the value %s into %s '
                       'using pattern %s. Details: %s',
-                      six.text_type(value_copy), to_replace, pattern,
+                      six.text_type(value), to_replace, pattern,
                       six.text_type(e))
             raise errors.MissingDocumentPattern(jsonpath=jsonpath,
                                                 pattern=pattern)
@@ -173,24 +174,27 @@ def _execute_replace(data, value, jsonpath, pattern=None, recurse=None):
                 else:
                     _replace_pattern_recursively(v, depth + 1, max_depth)
 
-    to_replace = path_to_change[0].value
-    if pattern:
-        if recurse:
-            max_depth = recurse.get('depth', -1)
-            # Recursion is only possible for lists/dicts.
-            if isinstance(to_replace, (dict, list)):
-                _replace_pattern_recursively(to_replace, 0, max_depth)
-                return data_copy
-            else:
-                # Edge case to handle a path that leads to a string value
-                # (not a list or dict). Even though no recursion is
-                # technically possible, gracefully handle this by
-                # performing non-recursive pattern replacement on the str.
-                return path.update(data_copy, _try_replace_pattern(to_replace))
-        else:
-            return path.update(data_copy, _try_replace_pattern(to_replace))
-    else:
-        return path.update(data_copy, value_copy)
+    # Recursion is only possible for lists/dicts. Otherwise, gracefully
+    # handle a path that leads to a string value by performing non-recursive
+    # pattern replacement on the str.
+    if recurse and isinstance(to_replace, (dict, list)):
+        # The nested data is updated in place, so copy it first.
+        to_replace = copy.deepcopy(to_replace)
+        _replace_pattern_recursively(to_replace, 0, recurse.get('depth', -1))
+        return to_replace
+    return _try_replace_pattern(to_replace)
+
+
+def _execute_replace(data, value, jsonpath, pattern=None, recurse=None):
+    # These are O(1) reference copies to avoid accidentally modifying source
+    # data. We only want to update destination data.
+    data_copy = copy.copy(data)
+    value_copy = copy.copy(value)
+
+    path = _jsonpath_parse(jsonpath)
+    to_replace = path.find(data_copy)[0].value
+    return path.update(data_copy, _replace_value(
+        to_replace, value_copy, jsonpath, pattern=pattern, recurse=recurse))
 
 
 def _execute_data_expansion(data, jsonpath):
@@ -223,8 +227,40 @@ def _execute_data_expansion(data, jsonpath):
         d = d.get(path)
 
 
+def _copy_path(data, jsonpath):
+    """Return a shallow copy of ``data`` in which each container leading to
+    the value at ``jsonpath`` is copied as well, so that the value can be
+    updated without modifying ``data``. Everything else is shared with
+    ``data``.
+    """
+    keys = []
+    for segment in jsonpath.split('.')[1:]:
+        match = _PATH_SEGMENT_RE.match(segment)
+        if not match:
+            # Which containers a path with quoted keys, wildcards and the
+            # like touches can't be told without evaluating it.
+            return copy.deepcopy(data)
+        keys.append(match.group(1))
+        keys.extend(int(i) for i in _PATH_INDEX_RE.findall(match.group(2)))
+
+    data_copy = copy.copy(data)
+    container = data_copy
+    for key in keys[:-1]:
+        try:
+            value = container[key]
+        except (IndexError, KeyError, TypeError):
+            break
+        if not isinstance(value, (dict, list)):
+            break
+        value = copy.copy(value)
+        container[key] = value
+        container = value
+    return data_copy
+
+
 def jsonpath_replace(data, value, jsonpath, pattern=None, recurse=None,
-                     src_pattern=None, src_match_group=0, src_deepcopy=None):
+                     src_pattern=None, src_match_group=0, src_deepcopy=None,
+                     owned=None):
     """Update value in ``data`` at the path specified by ``jsonpath``.
 
     If the nested path corresponding to ``jsonpath`` isn't found in ``data``,
@@ -270,6 +306,12 @@ def jsonpath_replace(data, value, jsonpath, pattern=None, recurse=None,
     :param src_deepcopy: Create a completely independent copy of source value
         which allows to make changes where by applying more substitutions.
         It is set to False by default for backward compatibility.
+    :param owned: Dicts and lists within ``data``, keyed by ``id``, which may
+        be updated in place rather than copied, as by
+        :meth:`deckhand.common.compiled_path.CompiledPath.update`. Lets
+        several values of the same data be replaced while copying each
+        container at most once.
+    :type owned: dict
     :returns: Updated value at ``data[jsonpath]``.
     :raises: MissingDocumentPattern if ``pattern`` is not None and
         ``data[jsonpath]`` doesn't exist.
@@ -277,10 +319,7 @@ def jsonpath_replace(data, value, jsonpath, pattern=None, recurse=None,
 
     """
 
-    # These are O(1) reference copies to avoid accidentally modifying source
-    # data. We only want to update destination data.
     # Deepcopy isn't O(1), so use it wizely, only when it's needed.
-    data_copy = copy.copy(data)
     if src_deepcopy:
         value_copy = copy.deepcopy(value)
     else:
@@ -308,6 +347,20 @@ def jsonpath_replace(data, value, jsonpath, pattern=None, recurse=None,
         raise ValueError('The provided jsonpath %s does not begin with "." '
                          'or "$"' % jsonpath)
 
+    compiled = compiled_path.parse(jsonpath)
+    if compiled is not None:
+        try:
+            return compiled.update(data, functools.partial(
+                _replace_value, value=value_copy, jsonpath=jsonpath,
+                pattern=pattern, recurse=recurse), owned=owned)
+        except compiled_path.UnsupportedUpdate:
+            pass
+
+    # Only the containers along the path are copied to avoid modifying the
+    # source data, which may be shared with other documents. We only want to
+    # update destination data.
+    data_copy = _copy_path(data, jsonpath)
+
     # Deckhand should be smart enough to create the nested keys in the
     # data if they don't exist and a pattern isn't required.
     path = _jsonpath_parse(jsonpath)
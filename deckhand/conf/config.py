@@ -49,6 +49,23 @@ barbican_opts = [
 ]
 
 
+compaction_group = cfg.OptGroup(
+    name='compaction',
+    title='Compaction Options',
+    help="Options for compacting the revision history, which removes old "
+         "revisions that are neither tagged nor validated.")
+
+
+compaction_opts = [
+    cfg.IntOpt('retention_days', default=90, min=0,
+               help="How long (in days) revisions are retained before they "
+                    "may be removed by compaction."),
+    cfg.StrOpt('archive_dir', default='/var/lib/deckhand/archive',
+               help="Directory in which revisions are archived before they "
+                    "are removed by compaction."),
+]
+
+
 engine_group = cfg.OptGroup(
     name='engine',
     title='Engine Options',
@@ -66,6 +83,62 @@ engine_opts = [
     cfg.IntOpt('cache_timeout', default='3600',
                help="How long (in seconds) document rendering results should "
                     "remain cached in memory."),
+    cfg.StrOpt('cache_type', default='memory',
+               choices=['memory', 'file', 'dbm'],
+               help="Backend for the document rendering cache. ``memory`` "
+                    "keeps a separate cache in each API worker. ``file`` "
+                    "and ``dbm`` keep the cache under ``cache_data_dir``, "
+                    "so that it is shared by all API workers on a host and "
+                    "survives worker restarts."),
+    cfg.StrOpt('cache_data_dir', default='/var/lib/deckhand/cache',
+               help="Directory in which the document rendering cache is "
+                    "kept when ``cache_type`` is ``file`` or ``dbm``."),
+    cfg.BoolOpt('enable_rendered_snapshots', default=False,
+                help="Whether to persist post-validated rendered documents "
+                     "in the database, so that they are read back rather "
+                     "than rendered again once no longer cached. Documents "
+                     "rendered from encrypted documents are never "
+                     "persisted."),
+    cfg.IntOpt('prerender_workers', default=0, min=0,
+               help="Number of threads in each API worker that render new "
+                    "revisions in the background, so that their rendered "
+                    "documents are cached by the time they are first "
+                    "requested. This only serves requests by clients "
+                    "allowed to list encrypted documents which set "
+                    "``cleartext-secrets``: other requests render the "
+                    "revision themselves. Each revision is rendered and "
+                    "post-validated once created, secrets included. 0 "
+                    "disables pre-rendering."),
+    cfg.IntOpt('prerender_queue_size', default=10, min=1,
+               help="Maximum number of revisions waiting to be pre-rendered "
+                    "by each API worker. Further revisions are rendered "
+                    "when first requested instead."),
+    cfg.IntOpt('render_workers', default=0, min=0,
+               help="Number of processes in each API worker that render "
+                    "independent groups of documents of a large revision "
+                    "in parallel. Documents are only rendered together if "
+                    "they are layered or substituted into one another. 0 "
+                    "renders all documents in the API worker itself. "
+                    "Ignored for renders run by ``render_pool_workers``, "
+                    "so that the two aren't combined."),
+    cfg.IntOpt('render_workers_threshold', default=1000, min=0,
+               help="Minimum number of documents of a revision left to "
+                    "render for them to be rendered by ``render_workers``. "
+                    "Smaller revisions are rendered in the API worker "
+                    "itself, as sending them to other processes would cost "
+                    "more than it saves."),
+    cfg.IntOpt('render_pool_workers', default=0, min=0,
+               help="Number of processes in each API worker that render "
+                    "revisions, post-validate rendered documents and "
+                    "compute deep diffs for API requests, so that these "
+                    "don't hold up the API worker's other threads. 0 runs "
+                    "them in the thread handling the request. Renders run "
+                    "by these processes don't use ``render_workers``."),
+    cfg.IntOpt('render_pool_queue_size', default=10, min=0,
+               help="Maximum number of jobs waiting for a process of "
+                    "``render_pool_workers`` in each API worker. Requests "
+                    "needing further jobs are rejected with a 503 response "
+                    "and a ``Retry-After`` header."),
 ]
 
 
@@ -98,6 +171,7 @@ default_opts = [
 def register_opts(conf):
     conf.register_group(barbican_group)
     conf.register_opts(barbican_opts, group=barbican_group)
+    conf.register_opts(compaction_opts, group=compaction_group)
     conf.register_opts(engine_opts, group=engine_group)
     conf.register_opts(jsonpath_opts, group=jsonpath_group)
     conf.register_opts(default_opts)
@@ -115,6 +189,7 @@ def list_opts():
             ks_loading.get_auth_plugin_conf_options('password') +
             ks_loading.get_auth_plugin_conf_options('v3password')
         ),
+        compaction_group: compaction_opts,
         engine_group: engine_opts,
         barbican_group: (
             barbican_opts +
@@ -20,6 +20,7 @@ from oslo_utils import excutils
 from deckhand.common import utils
 from deckhand.common import document as document_wrapper
 from deckhand.control import base as api_base
+from deckhand.control import prerender
 from deckhand.control.views import document as document_view
 from deckhand.db.sqlalchemy import api as db_api
 from deckhand.engine import document_validation
@@ -66,6 +67,8 @@ class BucketsResource(api_base.BaseResource):
 
         created_documents = self._create_revision_documents(
             bucket_name, documents)
+        if created_documents:
+            prerender.schedule(created_documents[0]['revision_id'])
 
         resp.text = utils.safe_yaml_dump(
             self.view_builder.list(created_documents))
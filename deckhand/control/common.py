@@ -26,6 +26,7 @@ from deckhand.common import document as document_wrapper
 from deckhand.db.sqlalchemy import api as db_api
 from deckhand import engine
 from deckhand.engine import cache as engine_cache
+from deckhand.engine import document_validation
 from deckhand.engine import secrets_manager
 from deckhand import errors
 from deckhand import types
@@ -77,6 +78,10 @@ def sanitize_params(allowed_params):
                 'limit': {
                     'func': lambda x: abs(int(x)),
                     'type': int
+                },
+                'marker': {
+                    'func': lambda x: abs(int(x)),
+                    'type': int
                 }
             }
 
@@ -146,7 +151,8 @@ def invalidate_cache_data():
     engine_cache.invalidate()
 
 
-def get_rendered_docs(revision_id, cleartext_secrets=False, **filters):
+def get_rendered_docs(revision_id, cleartext_secrets=False,
+                      document_filters=None, **filters):
     """Helper for retrieving rendered documents for ``revision_id``.
 
     Retrieves raw documents from DB, renders them, and returns rendered result
@@ -155,6 +161,9 @@ def get_rendered_docs(revision_id, cleartext_secrets=False, **filters):
     :param int revision_id: Revision ID whose documents to render.
     :param bool cleartext_secrets: Whether to show unencrypted data as
         cleartext.
+    :param dict document_filters: Filters selecting the rendered documents
+        needed, so that only these and the documents they depend on are
+        rendered. The result set can still include other documents.
     :param filters: Filters used for retrieving raw documents from DB.
     :returns: List of rendered documents.
     :rtype: list[dict]
@@ -168,7 +177,8 @@ def get_rendered_docs(revision_id, cleartext_secrets=False, **filters):
             revision_id,
             documents,
             encryption_sources=encryption_sources,
-            cleartext_secrets=cleartext_secrets)
+            cleartext_secrets=cleartext_secrets,
+            document_filters=document_filters)
     except (errors.BarbicanClientException,
             errors.BarbicanServerException,
             errors.InvalidDocumentLayer,
@@ -192,6 +202,20 @@ def get_rendered_docs(revision_id, cleartext_secrets=False, **filters):
         raise e
 
 
+def validate_rendered_docs(revision_id, rendered_documents):
+    """Helper for post-validating rendered documents for ``revision_id``.
+
+    :param int revision_id: Revision ID whose documents were rendered.
+    :param list rendered_documents: Rendered documents to validate.
+    :raises InvalidDocumentFormat: If validation fails.
+    """
+    data_schemas = db_api.revision_documents_get(
+        schema=types.DATA_SCHEMA_SCHEMA, deleted=False)
+    validator = document_validation.DocumentValidation(
+        rendered_documents, data_schemas, pre_validate=False)
+    engine.validate_render(revision_id, rendered_documents, validator)
+
+
 def _retrieve_documents_for_rendering(revision_id, **filters):
     """Retrieve all necessary documents needed for rendering. If a layering
     policy isn't found in the current revision, retrieve it in a subsequent
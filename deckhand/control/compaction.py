@@ -0,0 +1,42 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import falcon
+
+from oslo_log import log as logging
+
+from deckhand.common import utils
+from deckhand.control import base as api_base
+from deckhand.engine import revision_compaction
+from deckhand import policy
+
+LOG = logging.getLogger(__name__)
+
+
+class CompactionResource(api_base.BaseResource):
+    """API resource for realizing revision history compaction."""
+
+    @policy.authorize('deckhand:compact_revisions')
+    def on_post(self, req, resp):
+        """Removes old revisions that are neither tagged nor validated.
+
+        The ``retention_days`` query parameter overrides the configured
+        retention window.
+        """
+        retention_days = req.get_param_as_int('retention_days', min_value=0)
+        result = revision_compaction.compact_revisions(
+            retention_days=retention_days)
+
+        resp.status = falcon.HTTP_200
+        resp.text = utils.safe_yaml_dump(result)
@@ -15,6 +15,7 @@
 import falcon
 
 from deckhand.control.base import BaseResource
+from deckhand.engine import render_pool
 
 
 class HealthResource(BaseResource):
@@ -24,8 +25,15 @@ class HealthResource(BaseResource):
     Deckhand's health status. The response must be returned within 30 seconds
     for Deckhand to be deemed "healthy".
     Unauthenticated GET.
+
+    The response headers report the number of jobs pending in the render pool
+    of the API worker and the average time recent jobs waited for it.
     """
     no_authentication_methods = ['GET']
 
     def on_get(self, req, resp):
+        stats = render_pool.get_stats()
+        resp.set_header('X-Deckhand-Render-Queue-Depth', str(stats['depth']))
+        resp.set_header('X-Deckhand-Render-Queue-Wait',
+                        '%.3f' % stats['wait_time'])
         resp.status = falcon.HTTP_204
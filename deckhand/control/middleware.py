@@ -20,6 +20,8 @@ from oslo_log import log as logging
 import six
 
 import deckhand.context
+from deckhand.control import prerender
+from deckhand.db.sqlalchemy import api as db_api
 from deckhand import errors
 
 CONF = cfg.CONF
@@ -183,6 +185,39 @@ class YAMLTranslator(HookableMiddlewareMixin, object):
                 setattr(resp, attr, yaml.safe_dump_all(resp_attr, **kwargs))
 
 
+class DatabaseSessionMiddleware(object):
+    """Bind a single database session to each request.
+
+    All the database calls made while handling a request share the same
+    session, whose transaction is committed if the request succeeds and
+    rolled back otherwise. Read-only requests are served by the read
+    replica, if one is configured.
+    """
+
+    READ_ONLY_METHODS = ('GET', 'HEAD')
+
+    def process_request(self, req, resp):
+        db_api.bind_request_session(
+            read_only=req.method in self.READ_ONLY_METHODS)
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        db_api.release_request_session(commit=req_succeeded)
+
+
+class PreRenderMiddleware(object):
+    """Pre-render the revisions created by a request once it succeeded.
+
+    Must come before ``DatabaseSessionMiddleware`` so that revisions are only
+    pre-rendered once the request's transaction has been committed.
+    """
+
+    def process_request(self, req, resp):
+        prerender.submit_scheduled(succeeded=False)
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        prerender.submit_scheduled(succeeded=req_succeeded)
+
+
 class LoggingMiddleware(object):
     def process_resource(self, req, resp, resource, params):
         # don't log health checks
@@ -0,0 +1,153 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Render new revisions in the background.
+
+Clients typically request the rendered documents of a revision right after
+creating it. Revisions created by a request are scheduled via
+:func:`schedule` and, once the request's transaction is committed, rendered
+and post-validated by a bounded pool of threads which populates the
+rendering cache. Requests for a revision being pre-rendered wait for the
+result via :func:`wait` rather than rendering it a second time.
+"""
+
+import concurrent.futures
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from deckhand.control import common
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+_LOCK = threading.Lock()
+_EXECUTOR = None
+# Revisions being pre-rendered (or waiting to be), mapped to their futures.
+_IN_FLIGHT = {}
+_request_state = threading.local()
+
+
+def _enabled():
+    # Pre-rendering is pointless if its result isn't kept anywhere.
+    return CONF.engine.prerender_workers > 0 and (
+        CONF.engine.enable_cache or CONF.engine.enable_rendered_snapshots)
+
+
+def _get_executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+            max_workers=CONF.engine.prerender_workers,
+            thread_name_prefix='deckhand-prerender')
+    return _EXECUTOR
+
+
+def _prerender(revision_id):
+    # Render the revision as requested by a client allowed to see all
+    # documents, with the default options of the rendered-documents API.
+    filters = {
+        'metadata.storagePolicy': ['cleartext', 'encrypted'],
+        'deleted': False
+    }
+    try:
+        rendered_documents, cache_hit = common.get_rendered_docs(
+            revision_id, cleartext_secrets=True, **filters)
+        if not cache_hit:
+            common.validate_rendered_docs(revision_id, rendered_documents)
+    except Exception:
+        # The error is reported to whoever requests the revision next.
+        LOG.warning('Failed to pre-render revision %s.', revision_id,
+                    exc_info=True)
+    else:
+        LOG.debug('Pre-rendered revision %s.', revision_id)
+
+
+def _done(revision_id, future):
+    with _LOCK:
+        if _IN_FLIGHT.get(revision_id) is future:
+            del _IN_FLIGHT[revision_id]
+
+
+def submit(revision_id):
+    """Pre-render ``revision_id`` in the background.
+
+    Ignored if pre-rendering is disabled, if the revision is already being
+    pre-rendered or if ``[engine] prerender_queue_size`` revisions already
+    are.
+
+    :param revision_id: Revision ID to pre-render.
+    :type revision_id: int
+    """
+    if not _enabled():
+        return
+
+    with _LOCK:
+        if revision_id in _IN_FLIGHT:
+            return
+        if len(_IN_FLIGHT) >= CONF.engine.prerender_queue_size:
+            LOG.debug('Pre-render queue is full; not pre-rendering revision '
+                      '%s.', revision_id)
+            return
+        future = _get_executor().submit(_prerender, revision_id)
+        _IN_FLIGHT[revision_id] = future
+    future.add_done_callback(lambda f: _done(revision_id, f))
+
+
+def schedule(revision_id):
+    """Pre-render ``revision_id`` once the current request has succeeded.
+
+    :param revision_id: Revision ID created by the current request.
+    :type revision_id: int
+    """
+    if not _enabled():
+        return
+    if getattr(_request_state, 'revision_ids', None) is None:
+        _request_state.revision_ids = []
+    _request_state.revision_ids.append(revision_id)
+
+
+def submit_scheduled(succeeded=True):
+    """Submit the revisions scheduled by the current request.
+
+    :param succeeded: Whether the request, and thus its transaction,
+        succeeded. If not, the scheduled revisions are discarded.
+    """
+    revision_ids = getattr(_request_state, 'revision_ids', None) or []
+    _request_state.revision_ids = None
+    if succeeded:
+        for revision_id in revision_ids:
+            submit(revision_id)
+
+
+def wait(revision_id):
+    """Wait for ``revision_id`` to be pre-rendered, if it is being rendered.
+
+    If the revision is still waiting to be pre-rendered, it is taken off the
+    queue instead, as rendering it right away is faster than waiting.
+
+    :param revision_id: Revision ID about to be rendered.
+    :type revision_id: int
+    """
+    try:
+        revision_id = int(revision_id)
+    except (TypeError, ValueError):
+        return
+    with _LOCK:
+        future = _IN_FLIGHT.get(revision_id)
+    if future is None or future.cancel():
+        return
+    LOG.debug('Waiting for revision %s to be pre-rendered.', revision_id)
+    concurrent.futures.wait([future])
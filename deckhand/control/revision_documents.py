@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+
 import falcon
 
 from oslo_log import log as logging
@@ -20,13 +22,11 @@ import six
 from deckhand.common import utils
 from deckhand.control import base as api_base
 from deckhand.control import common
+from deckhand.control import prerender
 from deckhand.control.views import document as document_view
 from deckhand.db.sqlalchemy import api as db_api
-from deckhand import engine
-from deckhand.engine import document_validation
 from deckhand import errors
 from deckhand import policy
-from deckhand import types
 
 LOG = logging.getLogger(__name__)
 
@@ -66,20 +66,24 @@ class RevisionDocumentsResource(api_base.BaseResource):
             filters['metadata.storagePolicy'].append('encrypted')
         filters['deleted'] = False  # Never return deleted documents to user.
 
+        # Documents are streamed from the database and consumed lazily below,
+        # so only the documents being returned are held in memory at once.
         try:
-            documents = db_api.revision_documents_get(
+            documents = db_api.revision_documents_iter(
                 revision_id, **filters)
         except errors.RevisionNotFound as e:
             LOG.exception(six.text_type(e))
             raise falcon.HTTPNotFound(description=e.format_message())
 
         if not cleartext_secrets:
-            documents = utils.redact_documents(documents)
+            documents = (utils.redact_document(d) for d in documents)
 
-        # Sorts by creation date by default.
-        documents = utils.multisort(documents, sort_by, order_by)
+        # Documents are streamed in order of creation date, which is the
+        # default sort order.
+        if sort_by is not None or order_by == 'desc':
+            documents = utils.multisort(documents, sort_by, order_by)
         if limit is not None:
-            documents = documents[:limit]
+            documents = itertools.islice(documents, limit)
 
         resp.status = falcon.HTTP_200
         resp.text = utils.safe_yaml_dump(self.view_builder.list(documents))
@@ -120,41 +124,46 @@ class RenderedDocumentsResource(api_base.BaseResource):
         if cleartext_secrets is None:
             cleartext_secrets = True
         req.params.pop('cleartext-secrets', None)
+        order_by = req.params.pop('order', None)
+        sort_by = req.params.pop('sort', None)
+        limit = req.params.pop('limit', None)
+        user_filters = req.params.copy()
+
+        # If the revision is being pre-rendered, use the result instead of
+        # rendering it again.
+        prerender.wait(revision_id)
+        # Unless the revision was already rendered, only the documents
+        # matching the user filters are rendered, along with those they depend
+        # on.
         rendered_documents, cache_hit = common.get_rendered_docs(
-            revision_id, cleartext_secrets, **filters)
+            revision_id, cleartext_secrets, document_filters=user_filters,
+            **filters)
 
         # If the rendered documents result set is cached, then post-validation
         # for that result set has already been performed successfully, so it
-        # can be safely skipped over as an optimization.
+        # can be safely skipped over as an optimization. Otherwise, only the
+        # documents rendered for the user filters are post-validated.
         if not cache_hit:
-            data_schemas = db_api.revision_documents_get(
-                schema=types.DATA_SCHEMA_SCHEMA, deleted=False)
-            validator = document_validation.DocumentValidation(
-                rendered_documents, data_schemas, pre_validate=False)
-            engine.validate_render(revision_id, rendered_documents, validator)
+            common.validate_rendered_docs(revision_id, rendered_documents)
 
         # Filters to be applied post-rendering, because many documents are
-        # involved in rendering. User filters can only be applied once all
-        # documents have been rendered. Note that `layering` module only
-        # returns concrete documents, so no filtering for that is needed here.
-        order_by = req.params.pop('order', None)
-        sort_by = req.params.pop('sort', None)
-        limit = req.params.pop('limit', None)
-        user_filters = req.params.copy()
+        # involved in rendering. Note that `layering` module only returns
+        # concrete documents, so no filtering for that is needed here.
 
         if not cleartext_secrets:
-            rendered_documents = utils.redact_documents(rendered_documents)
+            rendered_documents = (
+                utils.redact_document(d) for d in rendered_documents)
 
-        rendered_documents = [
+        rendered_documents = (
             d for d in rendered_documents if utils.deepfilter(
-                d, **user_filters)]
+                d, **user_filters))
 
         if sort_by:
             rendered_documents = utils.multisort(
                 rendered_documents, sort_by, order_by)
 
         if limit is not None:
-            rendered_documents = rendered_documents[:limit]
+            rendered_documents = itertools.islice(rendered_documents, limit)
 
         resp.status = falcon.HTTP_200
         resp.text = utils.safe_yaml_dump(
@@ -54,7 +54,7 @@ class RevisionsResource(api_base.BaseResource):
         included.
         """
         try:
-            revision = db_api.revision_get(revision_id)
+            revision = db_api.revision_summary_get(revision_id)
         except errors.RevisionNotFound as e:
             with excutils.save_and_reraise_exception():
                 message = (e.format_message())
@@ -65,14 +65,21 @@ class RevisionsResource(api_base.BaseResource):
         resp.text = utils.safe_yaml_dump(revision_resp)
 
     @policy.authorize('deckhand:list_revisions')
-    @common.sanitize_params(['tag', 'order', 'sort'])
+    @common.sanitize_params(['tag', 'order', 'sort', 'limit', 'marker'])
     def _list_revisions(self, req, resp):
         order_by = req.params.pop('order', None)
         sort_by = req.params.pop('sort', None)
+        limit = req.params.pop('limit', None)
+        marker = req.params.pop('marker', None)
 
-        revisions = db_api.revision_get_all(**req.params)
-        if sort_by:
-            revisions = utils.multisort(revisions, sort_by, order_by)
+        try:
+            revisions = db_api.revision_summary_get_all(
+                tags=req.params.get('tags.[*].tag'), sort_by=sort_by,
+                order_by=order_by, limit=limit, marker=marker)
+        except errors.RevisionNotFound as e:
+            with excutils.save_and_reraise_exception():
+                message = (e.format_message())
+                LOG.exception(message)
 
         resp.status = falcon.HTTP_200
         resp.text = utils.safe_yaml_dump(self.view_builder.list(revisions))
@@ -19,6 +19,7 @@ from oslo_utils import excutils
 
 from deckhand.common import utils
 from deckhand.control import base as api_base
+from deckhand.control import prerender
 from deckhand.control.views import revision as revision_view
 from deckhand.db.sqlalchemy import api as db_api
 from deckhand import errors
@@ -55,6 +56,8 @@ class RollbackResource(api_base.BaseResource):
                 message = (e.format_message())
                 LOG.exception(message)
 
+        prerender.schedule(rollback_revision['id'])
+
         revision_resp = self.view_builder.show(rollback_revision)
         resp.status = falcon.HTTP_201
         resp.text = utils.safe_yaml_dump(revision_resp)
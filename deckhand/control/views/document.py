@@ -33,8 +33,13 @@ class ViewBuilder(common.ViewBuilder):
     def list(self, documents):
         resp_list = []
         attrs = ['id', 'metadata', 'data', 'schema']
+        # ``documents`` may be any iterable, including a generator, so it is
+        # consumed exactly once.
+        first_document = None
 
         for document in documents:
+            if first_document is None:
+                first_document = document
             if document.get('deleted'):
                 continue
             if document['schema'].startswith(types.VALIDATION_POLICY_SCHEMA):
@@ -51,10 +56,10 @@ class ViewBuilder(common.ViewBuilder):
         # are either deleted or validation policies. Either way, we still need
         # to return bucket_id and revision_id, which should be the same
         # across all the documents in ``documents``.
-        if not resp_list and documents:
+        if not resp_list and first_document is not None:
             resp_obj = {'status': {}}
-            resp_obj['status']['bucket'] = documents[0].get('bucket_name')
-            resp_obj['status']['revision'] = documents[0].get('revision_id')
+            resp_obj['status']['bucket'] = first_document.get('bucket_name')
+            resp_obj['status']['revision'] = first_document.get('revision_id')
             return [resp_obj]
 
         return resp_list
@@ -24,6 +24,13 @@ class ViewBuilder(common.ViewBuilder):
 
     _collection_name = 'revisions'
 
+    def _get_buckets(self, revision):
+        # Revision summaries come with their bucket names already aggregated;
+        # otherwise derive them from the revision's documents.
+        if 'buckets' in revision:
+            return revision['buckets']
+        return [d['bucket_name'] for d in revision['documents']]
+
     def list(self, revisions):
         resp_body = {
             'count': len(revisions),
@@ -32,14 +39,12 @@ class ViewBuilder(common.ViewBuilder):
 
         for revision in revisions:
             body = {'tags': set(), 'buckets': set()}
-            rev_documents = revision.pop('documents')
 
             for attr in ('id', 'created_at'):
                 body[utils.to_camel_case(attr)] = revision[attr]
 
             body['tags'].update([t['tag'] for t in revision['tags']])
-            body['buckets'].update(
-                [d['bucket_name'] for d in rev_documents])
+            body['buckets'].update(self._get_buckets(revision))
 
             body['tags'] = sorted(body['tags'])
             body['buckets'] = sorted(body['buckets'])
@@ -76,8 +81,7 @@ class ViewBuilder(common.ViewBuilder):
         for tag in revision['tags']:
             tags.setdefault(tag['tag'], tag['data'])
 
-        buckets = sorted(
-            set([d['bucket_name'] for d in revision['documents']]))
+        buckets = sorted(set(self._get_buckets(revision)))
 
         return {
             'id': revision.get('id'),
@@ -14,35 +14,74 @@
 
 """Defines interface for DB access."""
 
+import collections
 import contextlib
 import copy
 import functools
 import hashlib
+import re
 import threading
 import six
 
-from oslo_config import cfg
+from beaker.cache import CacheManager
+from beaker.util import parse_cache_config_options
 from oslo_db import exception as db_exception
 from oslo_db import options
 from oslo_db.sqlalchemy import enginefacade
 from oslo_log import log as logging
 from oslo_serialization import jsonutils as json
+from oslo_utils import timeutils
+import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
 from sqlalchemy import text
 
+from deckhand.common import document as document_wrapper
 from deckhand.common import utils
+from deckhand.conf import config
 from deckhand.db.sqlalchemy import models
 from deckhand.engine import utils as eng_utils
 from deckhand import errors
 from deckhand import types
 
 LOG = logging.getLogger(__name__)
-CONF = cfg.CONF
+CONF = config.CONF
 
 options.set_defaults(CONF)
 
 _context_manager = None
 _LOCK = threading.Lock()
+# Holds the session bound to the request being handled by this thread, along
+# with the IDs of the revisions already known to exist during that request.
+_request_state = threading.local()
+
+# The ValidationPolicy documents of a revision never change, so the
+# validations they expect are cached per revision. Created on first use so
+# that the configured ``[engine] cache_timeout`` is honored.
+_VALIDATION_POLICY_CACHE = None
+
+# Columns populated from user-supplied documents on creation.
+_DOCUMENT_COLUMNS = ('schema', 'name', 'layer', 'meta', 'data', 'data_hash',
+                     'metadata_hash', 'orig_revision_id')
+# Number of document rows fetched per round trip when streaming documents.
+_DOCUMENT_ROWS_BATCH_SIZE = 100
+# Keys within a nested filter path that can be compiled into SQL.
+_FILTER_PATH_KEY = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _get_validation_policy_cache():
+    global _VALIDATION_POLICY_CACHE
+    if _VALIDATION_POLICY_CACHE is None:
+        cache_opts = {
+            'cache.type': 'memory',
+            'cache.expire': CONF.engine.cache_timeout,
+        }
+        cache_manager = CacheManager(
+            **parse_cache_config_options(cache_opts))
+        _VALIDATION_POLICY_CACHE = cache_manager.get_cache(
+            'validation_policies_cache')
+    return _VALIDATION_POLICY_CACHE
 
 
 def _create_context_manager():
@@ -53,6 +92,7 @@ def _create_context_manager():
                 _context_manager = enginefacade.transaction_context()
                 _context_manager.configure(
                     connection=CONF.database.connection,
+                    slave_connection=CONF.database.slave_connection,
                     sqlite_fk=True)
     return _context_manager
 
@@ -68,19 +108,118 @@ def get_engine():
 
 
 def get_session(autocommit=True, expire_on_commit=False):
+    request_session = _get_request_session()
+    if request_session is not None:
+        return request_session
     return _create_context_manager().writer.get_sessionmaker()(
         expire_on_commit=expire_on_commit)
 
 
+def _get_request_session():
+    return getattr(_request_state, 'session', None)
+
+
+def _owns_session(session):
+    """Whether a DB API call is responsible for closing its session.
+
+    Calls close the session they create themselves, but never the one that
+    is bound to the current request.
+    """
+    return session is None and _get_request_session() is None
+
+
+def _replica_configured():
+    return bool(CONF.database.slave_connection)
+
+
+def bind_request_session(read_only=False):
+    """Bind a single session to the request handled by the current thread.
+
+    Until :func:`release_request_session` is called, every DB API call made
+    without an explicit session shares this session and its transaction,
+    which forms the unit of work for the request.
+
+    :param read_only: Whether the request only reads from the database. If
+        ``True`` and ``[database] slave_connection`` is configured, the
+        session is connected to the read replica instead of the primary.
+    """
+    context_manager = _create_context_manager()
+    if read_only:
+        maker = context_manager.reader.get_sessionmaker()
+    else:
+        maker = context_manager.writer.get_sessionmaker()
+    _request_state.session = maker(expire_on_commit=False)
+    _request_state.read_only = read_only and _replica_configured()
+    _request_state.existing_revisions = set()
+
+
+def _reads_from_replica():
+    return getattr(_request_state, 'read_only', False)
+
+
+def _use_primary_for_request():
+    """Rebind the current request's session to the primary.
+
+    A replica may lag behind the primary, for instance when a client reads
+    a revision it has just created. Rather than reporting data that the
+    client already knows to exist as missing, the rest of the request is
+    served by the primary.
+    """
+    LOG.debug('Read replica is behind the primary; using the primary for '
+              'the rest of the request.')
+    _get_request_session().close()
+    _request_state.session = _create_context_manager().writer\
+        .get_sessionmaker()(expire_on_commit=False)
+    _request_state.read_only = False
+
+
+def _retry_on_primary(session):
+    """Whether a lookup that found nothing should be retried on the primary.
+
+    :param session: Database session object the lookup was made with.
+    :returns: True if the lookup was made against the read replica, in which
+        case the request has been rebound to the primary.
+    """
+    if _reads_from_replica() and session is _get_request_session():
+        _use_primary_for_request()
+        return True
+    return False
+
+
+def release_request_session(commit=True):
+    """Finish the unit of work bound via :func:`bind_request_session`.
+
+    :param commit: Commit the request's transaction if ``True``, else roll
+        it back.
+    """
+    session = _get_request_session()
+    _request_state.session = None
+    _request_state.read_only = False
+    _request_state.existing_revisions = None
+
+    if session is None:
+        return
+    try:
+        if commit:
+            session.commit()
+        else:
+            session.rollback()
+    finally:
+        session.close()
+
+
 @contextlib.contextmanager
 def _session_begin(session):
     """Start a new transaction or join the existing one.
 
     In SQLAlchemy 2.0, sessions auto-begin on first use. Calling begin()
-    a second time raises InvalidRequestError. This helper avoids that.
+    a second time raises InvalidRequestError. An existing transaction is
+    joined through a savepoint instead, so that a failed write can be rolled
+    back without aborting the enclosing unit of work.
     """
     if session.in_transaction():
-        yield
+        with session.begin_nested():
+            yield
     else:
         with session.begin():
             yield
@@ -95,10 +234,11 @@ def drop_db():
 def setup_db(connection_string, create_tables=False):
     if _context_manager is not None:
         try:
-            _context_manager.writer.get_engine().dispose()
+            _context_manager.dispose_pool()
         except Exception:
             LOG.debug('Failed to dispose existing DB engine', exc_info=True)
     _reset_context_manager()
+    _get_validation_policy_cache().clear()
     models.register_models(get_engine(), connection_string)
     if create_tables:
         models.create_tables(get_engine())
@@ -119,6 +259,13 @@ def raw_query(query, **kwargs):
 
     stmt = text(query)
     stmt = stmt.bindparams(**kwargs)
+
+    # Run as part of the request's unit of work, if any, so that the query
+    # both sees and is committed along with the request's other changes.
+    request_session = _get_request_session()
+    if request_session is not None:
+        return request_session.execute(stmt)
+
     with get_engine().connect() as conn:
         result = conn.execute(stmt)
         conn.commit()
@@ -200,13 +347,10 @@ def documents_create(bucket_name, documents, session=None):
         # The documents to be deleted are computed by comparing the documents
         # for the previous revision (if it exists) that belong to `bucket_name`
         # with `documents`: the difference between the former and the latter.
-        document_history = [
-            d for d in revision_documents_get(bucket_name=bucket_name,
-                                              session=session)
-        ]
+        document_metas = set(eng_utils.meta(d) for d in documents)
         documents_to_delete = [
-            h for h in document_history if eng_utils.meta(h) not in [
-                eng_utils.meta(d) for d in documents]
+            h for h in _bucket_documents_get(bucket_name, session=session)
+            if eng_utils.meta(h) not in document_metas
         ]
 
         # Only create a revision if any docs have been created, changed or
@@ -218,14 +362,8 @@ def documents_create(bucket_name, documents, session=None):
         if documents_to_delete:
             LOG.debug('Deleting documents: %s.',
                       [eng_utils.meta(d) for d in documents_to_delete])
-            deleted_documents = []
-
-            for d in documents_to_delete:
-                doc = document_delete(d, revision['id'], bucket,
-                                      session=session)
-
-                deleted_documents.append(doc)
-                resp.append(doc)
+            resp.extend(documents_delete(documents_to_delete, revision['id'],
+                                         bucket, session=session))
 
         if documents_to_create:
             LOG.debug(
@@ -240,14 +378,8 @@ def documents_create(bucket_name, documents, session=None):
                 if not doc.get('orig_revision_id'):
                     doc['orig_revision_id'] = doc['revision_id']
 
-                try:
-                    doc.save(session=session)
-                except db_exception.DBDuplicateEntry:
-                    raise errors.DuplicateDocumentExists(
-                        schema=doc['schema'], layer=doc['layer'],
-                        name=doc['name'], bucket=bucket['name'])
-
-                resp.append(doc.to_dict())
+            resp.extend(d.to_dict() for d in _documents_bulk_insert(
+                documents_to_create, session=session))
     # NOTE(fmontei): The orig_revision_id is not copied into the
     # revision_id for each created document, because the revision_id here
     # should reference the just-created revision. In case the user needs
@@ -268,30 +400,46 @@ def document_delete(document, revision_id, bucket, session=None):
     :param session: Database session object.
     :return: dict representation of deleted document
     """
-    session = session or get_session()
+    return documents_delete([document], revision_id, bucket,
+                            session=session)[0]
 
-    doc = models.Document()
-    # Store bare minimum information about the document.
-    doc['schema'] = document['schema']
-    doc['name'] = document['name']
-    doc['layer'] = document['layer']
-    doc['data'] = {}
-    doc['meta'] = document['metadata']
-    doc['data_hash'] = _make_hash({})
-    doc['metadata_hash'] = _make_hash({})
-    doc['bucket_id'] = bucket['id']
-    doc['revision_id'] = revision_id
-
-    # Save and mark the document as `deleted` in the database.
-    try:
-        doc.save(session=session)
-    except db_exception.DBDuplicateEntry:
-        raise errors.DuplicateDocumentExists(
-            schema=doc['schema'], layer=doc['layer'],
-            name=doc['name'], bucket=bucket['name'])
-    doc.safe_delete(session=session)
 
-    return doc.to_dict()
+def documents_delete(documents, revision_id, bucket, session=None):
+    """Delete many documents at once.
+
+    Inserts a deletion marker carrying the bare minimum information about
+    each document in ``documents`` using batched ``INSERT`` statements.
+
+    :param documents: List of document objects/dicts to be deleted.
+    :param revision_id: id of the revision where the documents are to be
+        deleted
+    :param bucket: bucket object/dict where the documents will be deleted from
+    :param session: Database session object.
+    :returns: List of dict representations of deleted documents.
+    """
+    session = session or get_session()
+    deleted_at = timeutils.utcnow()
+
+    # Store bare minimum information about each document and mark it as
+    # `deleted` in the database.
+    values = [{
+        'schema': document['schema'],
+        'name': document['name'],
+        'layer': document['layer'],
+        'data': {},
+        'meta': document['metadata'],
+        'data_hash': _make_hash({}),
+        'metadata_hash': _make_hash(document['metadata']),
+        'bucket_id': bucket['id'],
+        'revision_id': revision_id,
+        'orig_revision_id': None,
+        'deleted': True,
+        'deleted_at': deleted_at
+    } for document in documents]
+
+    with _session_begin(session):
+        return [d.to_dict() for d in _documents_bulk_insert(
+            values, session=session)]
 
 
 def documents_delete_from_buckets_list(bucket_names, session=None):
@@ -312,35 +460,145 @@ def documents_delete_from_buckets_list(bucket_names, session=None):
 
         for bucket_name in bucket_names:
 
-            documents_to_delete = [
-                d for d in revision_documents_get(bucket_name=bucket_name,
-                                                  session=session)
-                if "deleted" not in d or not d['deleted']
-            ]
+            documents_to_delete = _bucket_documents_get(
+                bucket_name, exclude_deleted=True, session=session)
 
             bucket = bucket_get_or_create(bucket_name, session=session)
 
             if documents_to_delete:
                 LOG.debug('Deleting documents: %s.',
                           [eng_utils.meta(d) for d in documents_to_delete])
-
-                for document in documents_to_delete:
-                    document_delete(document, revision['id'], bucket,
-                                    session=session)
+                documents_delete(documents_to_delete, revision['id'], bucket,
+                                 session=session)
 
     return revision
 
 
+def _documents_bulk_insert(values, session):
+    """Insert document rows using batched ``INSERT ... RETURNING`` statements.
+
+    Any ``data`` and ``meta`` entries in ``values`` are stored as
+    content-addressed blobs keyed by ``data_hash`` and ``metadata_hash``
+    respectively. Entries without them must reference existing blobs.
+
+    :param values: List of dictionaries keyed by ``Document`` column names.
+    :param session: Database session object.
+    :returns: The inserted ``Document`` objects, in the order of ``values``.
+    """
+    blobs = {}
+    rows = []
+    for value in values:
+        value = value.copy()
+        if 'data' in value:
+            blobs.setdefault(value['data_hash'], value.pop('data'))
+        if 'meta' in value:
+            blobs.setdefault(value['metadata_hash'], value.pop('meta'))
+        rows.append(value)
+
+    _document_blobs_create(blobs, session)
+
+    stmt = sa.insert(models.Document).returning(
+        models.Document, sort_by_parameter_order=True)
+    documents = session.scalars(stmt, rows).all()
+
+    # Pull the referenced blobs into the session with a single query so that
+    # serializing the new documents doesn't load blobs one row at a time.
+    hashes = set()
+    for document in documents:
+        hashes.update((document.data_hash, document.metadata_hash))
+    if hashes:
+        session.query(models.DocumentBlob)\
+            .filter(models.DocumentBlob.hash.in_(hashes))\
+            .all()
+
+    return documents
+
+
+def _document_blobs_create(blobs, session):
+    """Store content-addressed blobs, skipping those that already exist.
+
+    :param blobs: Dictionary mapping content hashes to content.
+    :param session: Database session object.
+    """
+    if not blobs:
+        return
+
+    values = [{'hash': h, 'content': c} for h, c in blobs.items()]
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        insert = (postgresql.insert if dialect == 'postgresql'
+                  else sqlite.insert)
+        session.execute(
+            insert(models.DocumentBlob).on_conflict_do_nothing(
+                index_elements=['hash']),
+            values)
+    else:
+        existing_hashes = set(
+            row.hash for row in session.query(models.DocumentBlob.hash)
+            .filter(models.DocumentBlob.hash.in_(blobs.keys())))
+        values = [v for v in values if v['hash'] not in existing_hashes]
+        if values:
+            session.execute(sa.insert(models.DocumentBlob), values)
+
+
+def _bucket_documents_get(bucket_name, exclude_deleted=False, session=None):
+    """Return the newest row of each document that belongs to a bucket.
+
+    Only the columns needed to compute and record deletions are loaded.
+    """
+    session = session or get_session()
+    doc = models.Document
+
+    meta_blob = sa_orm.aliased(models.DocumentBlob)
+
+    latest = _latest_document_ids(session)
+    query = session.query(doc.schema, doc.layer, doc.name,
+                          meta_blob.content.label('meta'), doc.deleted)\
+        .join(latest, latest.c.id == doc.id)\
+        .join(meta_blob, meta_blob.hash == doc.metadata_hash)\
+        .join(models.Bucket, models.Bucket.id == doc.bucket_id)\
+        .filter(models.Bucket.name == bucket_name)
+    if exclude_deleted:
+        query = query.filter(doc.deleted.is_(False))
+
+    return [{
+        'schema': row.schema,
+        'layer': row.layer,
+        'name': row.name,
+        'metadata': row.meta,
+        'deleted': row.deleted
+    } for row in query.order_by(doc.id)]
+
+
+def _existing_documents_get(documents, session):
+    """Return the newest live row for each document in ``documents``.
+
+    Fetches the change-detection columns for the whole batch in one query.
+
+    :returns: Dictionary keyed by (``schema``, ``layer``, ``name``).
+    """
+    doc = models.Document
+    names = set(d['name'] for d in documents)
+    if not names:
+        return {}
+
+    latest = _latest_document_ids(session, None, doc.name.in_(names))
+    query = session.query(doc.schema, doc.layer, doc.name, doc.data_hash,
+                          doc.metadata_hash, doc.revision_id,
+                          doc.orig_revision_id,
+                          models.Bucket.name.label('bucket_name'))\
+        .join(latest, latest.c.id == doc.id)\
+        .join(models.Bucket, models.Bucket.id == doc.bucket_id)\
+        .filter(doc.deleted.is_(False))
+
+    return {(row.schema, row.layer, row.name): row for row in query}
+
+
 def _documents_create(bucket_name, documents, session=None):
     documents = copy.deepcopy(documents)
     session = session or get_session()
-    filters = ('name', 'schema', 'layer')
-    changed_documents = []
-
-    def _document_create(document):
-        model = models.Document()
-        model.update(document)
-        return model
+    unique_keys = set()
 
     for document in documents:
         document.setdefault('data', {})
@@ -351,49 +609,49 @@ def _documents_create(bucket_name, documents, session=None):
         document['data_hash'] = _make_hash(document['data'])
         document['metadata_hash'] = _make_hash(document['meta'])
 
-        try:
-            existing_document = document_get(
-                session=session,
-                raw_dict=True, deleted=False, revision_id='latest',
-                **{x: document[x] for x in filters})
-        except errors.DocumentNotFound:
-            # Ignore bad data at this point. Allow creation to bubble up the
-            # error related to bad data.
-            existing_document = None
+        unique_key = (document['schema'], document['layer'], document['name'])
+        if unique_key in unique_keys:
+            raise errors.DuplicateDocumentExists(
+                schema=document['schema'], layer=document['layer'],
+                name=document['name'], bucket=bucket_name)
+        unique_keys.add(unique_key)
+
+    existing_documents = _existing_documents_get(documents, session)
+
+    for document in documents:
+        existing_document = existing_documents.get(
+            (document['schema'], document['layer'], document['name']))
 
         if existing_document:
             # If the document already exists in another bucket, raise an error.
-            if existing_document['bucket_name'] != bucket_name:
+            if existing_document.bucket_name != bucket_name:
                 raise errors.DuplicateDocumentExists(
-                    schema=existing_document['schema'],
-                    name=existing_document['name'],
-                    layer=existing_document['layer'],
-                    bucket=existing_document['bucket_name'])
+                    schema=existing_document.schema,
+                    name=existing_document.name,
+                    layer=existing_document.layer,
+                    bucket=existing_document.bucket_name)
 
             # By this point we know existing_document and document have the
-            # same name, schema and layer due to the filters passed to the DB
-            # query. But still want to check whether the document is precisely
-            # the same one by comparing metadata/data hashes.
-            if (existing_document['data_hash'] == document['data_hash'] and
-                existing_document['metadata_hash'] == document[
+            # same name, schema and layer. But still want to check whether the
+            # document is precisely the same one by comparing metadata/data
+            # hashes.
+            if (existing_document.data_hash == document['data_hash'] and
+                existing_document.metadata_hash == document[
                     'metadata_hash']):
                 # Since the document has not changed, reference the original
                 # revision in which it was created. This is necessary so that
                 # the correct revision history is maintained.
-                if existing_document['orig_revision_id']:
-                    document['orig_revision_id'] = existing_document[
-                        'orig_revision_id']
+                if existing_document.orig_revision_id:
+                    document['orig_revision_id'] = existing_document\
+                        .orig_revision_id
                 else:
-                    document['orig_revision_id'] = existing_document[
-                        'revision_id']
+                    document['orig_revision_id'] = existing_document\
+                        .revision_id
 
     # Create all documents, even unchanged ones, for the current revision. This
     # makes the generation of the revision diff a lot easier.
-    for document in documents:
-        doc = _document_create(document)
-        changed_documents.append(doc)
-
-    return changed_documents
+    return [{k: document.get(k) for k in _DOCUMENT_COLUMNS}
+            for document in documents]
 
 
 def _fill_in_metadata_defaults(document):
@@ -420,6 +678,140 @@ def _make_hash(data):
         json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
 
 
+def _is_nested_filter(filter_key):
+    return any([x in filter_key for x in ('.', 'schema')])
+
+
+def _schema_criterion(filter_val):
+    """Compile a ``schema`` filter into a SQL criterion.
+
+    Mirrors the namespace matching done by :func:`utils.deepfilter`:
+    ``promenade`` matches every schema in the ``promenade`` namespace and
+    ``promenade/Node`` matches every version of that kind.
+    """
+    doc = models.Document
+
+    if isinstance(filter_val, (list, tuple)):
+        if not all(isinstance(x, six.string_types) for x in filter_val):
+            return None
+        return doc.schema.in_(filter_val)
+    elif not isinstance(filter_val, six.string_types):
+        return None
+
+    criterion = doc.schema == filter_val
+    # A fully qualified schema (namespace/kind/version) only matches itself.
+    if filter_val.count('/') < 2:
+        criterion = sa.or_(
+            criterion,
+            doc.schema.startswith(filter_val + '/', autoescape=True))
+    return criterion
+
+
+def _json_filter_values(filter_val):
+    """Return the JSON values a scalar filter value can match.
+
+    String literals like "true" or "False" also match JSON booleans, in line
+    with the boolean transformation performed by :func:`utils.deepfilter`.
+    """
+    scalar_types = six.string_types + six.integer_types + (bool, float)
+
+    if isinstance(filter_val, dict):
+        if not all(isinstance(v, scalar_types) for v in filter_val.values()):
+            return None
+        return [filter_val]
+    elif not isinstance(filter_val, scalar_types):
+        return None
+
+    values = [filter_val]
+    if isinstance(filter_val, six.string_types):
+        if filter_val.lower() in ('true', 'false'):
+            values.append(filter_val.lower() == 'true')
+    return values
+
+
+def _json_criterion(column, path, filter_val):
+    """Compile a nested filter into JSONB containment (``@>``) criteria.
+
+    :param column: JSONB column holding the document section.
+    :param path: List of keys leading to the filtered attribute within
+        ``column``.
+    :param filter_val: A scalar, dictionary (subset match) or list of
+        scalars (any match).
+    :returns: A SQL criterion or ``None`` if ``filter_val`` can't be
+        expressed in SQL.
+    """
+    if isinstance(filter_val, (list, tuple)):
+        if any(isinstance(x, dict) for x in filter_val):
+            return None
+        candidates = filter_val
+    else:
+        candidates = [filter_val]
+
+    json_values = []
+    for candidate in candidates:
+        values = _json_filter_values(candidate)
+        if values is None:
+            return None
+        json_values.extend(values)
+
+    if not json_values:
+        return sa.false()
+
+    criteria = []
+    for value in json_values:
+        for key in reversed(path):
+            value = {key: value}
+        criteria.append(column.contains(value))
+    return sa.or_(*criteria)
+
+
+def _filter_documents_query(session, query, filters):
+    """Push document ``filters`` down to the database where possible.
+
+    ``schema`` filters are compiled into prefix matches for every backend.
+    Filters against nested ``metadata`` and ``data`` attributes are compiled
+    into JSONB containment checks on PostgreSQL, which are backed by GIN
+    indexes. Anything else, including nested filters on backends without
+    native JSON support, is left for :func:`utils.deepfilter`.
+
+    :param session: Database session object.
+    :param query: Query yielding ``Document`` objects.
+    :param filters: Dictionary of nested filters.
+    :returns: Tuple of the filtered query and the filters that still need to
+        be applied in Python.
+    """
+    doc = models.Document
+    supports_json = session.get_bind().dialect.name == 'postgresql'
+    blobs = {}
+    remaining_filters = {}
+
+    for filter_key, filter_val in filters.items():
+        criterion = None
+        path = filter_key.split('.')
+
+        if filter_key == 'schema':
+            criterion = _schema_criterion(filter_val)
+        elif (supports_json and len(path) > 1 and
+                path[0] in ('metadata', 'data') and
+                filter_key != 'metadata.schema' and
+                all(_FILTER_PATH_KEY.match(k) for k in path[1:])):
+            if path[0] not in blobs:
+                blob = sa_orm.aliased(models.DocumentBlob)
+                hash_column = (doc.metadata_hash if path[0] == 'metadata'
+                               else doc.data_hash)
+                query = query.join(blob, blob.hash == hash_column)
+                blobs[path[0]] = blob
+            criterion = _json_criterion(
+                blobs[path[0]].content, path[1:], filter_val)
+
+        if criterion is None:
+            remaining_filters[filter_key] = filter_val
+        else:
+            query = query.filter(criterion)
+
+    return query, remaining_filters
+
+
 def document_get(session=None, raw_dict=False, revision_id=None, **filters):
     """Retrieve the first document for ``revision_id`` that match ``filters``.
 
@@ -433,7 +825,7 @@ def document_get(session=None, raw_dict=False, revision_id=None, **filters):
     :returns: Dictionary representation of retrieved document.
     :raises: DocumentNotFound if the document wasn't found.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -446,26 +838,29 @@ def document_get(session=None, raw_dict=False, revision_id=None, **filters):
         elif revision_id:
             filters['revision_id'] = revision_id
 
-        # TODO(fmontei): Currently Deckhand doesn't support filtering by nested
-        # JSON fields via sqlalchemy. For now, filter the documents using all
-        # "regular" filters via sqlalchemy and all nested filters via Python.
+        # Filter the documents using all "regular" filters and as many nested
+        # filters as the database supports via sqlalchemy. Whatever nested
+        # filters remain are applied via Python.
         nested_filters = {}
         for f in filters.copy():
-            if any([x in f for x in ('.', 'schema')]):
+            if _is_nested_filter(f):
                 nested_filters.setdefault(f, filters.pop(f))
 
         # Documents with the same metadata.name and schema can exist across
         # different revisions, so it is necessary to order documents by
         # creation date, then return the first document that matches all
         # desired filters.
-        documents = session.query(models.Document)\
+        query = session.query(models.Document)\
             .filter_by(**filters)\
-            .order_by(models.Document.created_at.desc())\
-            .all()
+            .order_by(models.Document.created_at.desc())
+        query, python_filters = _filter_documents_query(
+            session, query, nested_filters)
+        if not python_filters:
+            query = query.limit(1)
 
-        for doc in documents:
+        for doc in query.all():
             d = doc.to_dict(raw_dict=raw_dict)
-            if utils.deepfilter(d, **nested_filters):
+            if utils.deepfilter(d, **python_filters):
                 return d
 
         filters.update(nested_filters)
@@ -488,7 +883,7 @@ def document_get_all(session=None, raw_dict=False, revision_id=None,
         out revision documents.
     :returns: Dictionary representation of each retrieved document.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -501,29 +896,25 @@ def document_get_all(session=None, raw_dict=False, revision_id=None,
         elif revision_id:
             filters['revision_id'] = revision_id
 
-        # TODO(fmontei): Currently Deckhand doesn't support filtering by nested
-        # JSON fields via sqlalchemy. For now, filter the documents using all
-        # "regular" filters via sqlalchemy and all nested filters via Python.
+        # Filter the documents using all "regular" filters and as many nested
+        # filters as the database supports via sqlalchemy. Whatever nested
+        # filters remain are applied via Python.
         nested_filters = {}
         for f in filters.copy():
-            if any([x in f for x in ('.', 'schema')]):
+            if _is_nested_filter(f):
                 nested_filters.setdefault(f, filters.pop(f))
 
         # Retrieve the most recently created documents for the revision,
         # because documents with the same metadata.name and schema can exist
         # across different revisions.
-        documents = session.query(models.Document)\
-            .filter_by(**filters)\
-            .order_by(models.Document.created_at.desc())\
-            .all()
-
-        final_documents = []
-        for doc in documents:
-            d = doc.to_dict(raw_dict=raw_dict)
-            if utils.deepfilter(d, **nested_filters):
-                final_documents.append(d)
-
-        return final_documents
+        query = _document_rows_query(session, *[
+            getattr(models.Document, k) == v for k, v in filters.items()])\
+            .order_by(models.Document.created_at.desc())
+        query, python_filters = _filter_documents_query(
+            session, query, nested_filters)
+
+        return [d for d in _document_rows_iter(query, raw_dict=raw_dict)
+                if utils.deepfilter(d, **python_filters)]
     finally:
         if own_session:
             session.close()
@@ -565,7 +956,7 @@ def bucket_get_all(session=None, **filters):
     :param session: Database session object.
     :returns: List of dictionary representations of retrieved buckets.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -605,21 +996,28 @@ def revision_get(revision_id=None, session=None):
     :returns: Dictionary representation of retrieved revision.
     :raises RevisionNotFound: if the revision was not found.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
-        try:
-            revision = session.query(models.Revision)\
-                .filter_by(id=revision_id)\
-                .one()\
-                .to_dict()
-        except sa_orm.exc.NoResultFound:
+        revision = session.query(models.Revision)\
+            .filter_by(id=revision_id)\
+            .one_or_none()
+        if revision is None:
+            if _retry_on_primary(session):
+                return revision_get(revision_id)
             raise errors.RevisionNotFound(revision_id=revision_id)
 
-        revision['documents'] = _update_revision_history(revision['documents'])
+        documents = _document_rows_query(
+            session, models.Document.revision_id == revision.id)\
+            .order_by(models.Document.id)
+        revision_dict = super(models.Revision, revision).to_dict()
+        revision_dict.pop('documents', None)
+        revision_dict['tags'] = [tag.to_dict() for tag in revision.tags]
+        revision_dict['documents'] = _update_revision_history(
+            list(_document_rows_iter(documents)))
 
-        return revision
+        return revision_dict
     finally:
         if own_session:
             session.close()
@@ -631,7 +1029,7 @@ def revision_get_latest(session=None):
     :param session: Database session object.
     :returns: Dictionary representation of latest revision.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -663,12 +1061,48 @@ def require_revision_exists(f):
     """
     @functools.wraps(f)
     def wrapper(revision_id=None, *args, **kwargs):
-        if revision_id:
-            revision_get(revision_id, session=kwargs.get('session'))
+        if revision_id and not revision_exists(
+                revision_id, session=kwargs.get('session')):
+            raise errors.RevisionNotFound(revision_id=revision_id)
         return f(revision_id, *args, **kwargs)
     return wrapper
 
 
+def revision_exists(revision_id, session=None):
+    """Check whether the specified `revision_id` exists.
+
+    Only the existence of the revision is queried; none of its documents are
+    loaded. Within a request, revisions found to exist are remembered for the
+    rest of the request.
+
+    :param revision_id: The ID corresponding to the ``Revision`` object.
+    :param session: Database session object.
+    :returns: True if the revision exists, else False.
+    """
+    existing_revisions = getattr(_request_state, 'existing_revisions', None)
+    if (existing_revisions is not None and
+            six.text_type(revision_id) in existing_revisions):
+        return True
+
+    own_session = _owns_session(session)
+    session = session or get_session()
+
+    try:
+        exists = session.query(sa.literal(1))\
+            .filter(models.Revision.id == revision_id)\
+            .first() is not None
+    finally:
+        if own_session:
+            session.close()
+
+    if not exists and _retry_on_primary(session):
+        return revision_exists(revision_id)
+
+    if exists and existing_revisions is not None:
+        existing_revisions.add(six.text_type(revision_id))
+    return exists
+
+
 def _update_revision_history(documents):
     # Since documents that are unchanged across revisions need to be saved for
     # each revision, we need to ensure that the original revision is shown
@@ -686,7 +1120,7 @@ def revision_get_all(session=None, **filters):
     :param session: Database session object.
     :returns: List of dictionary representations of retrieved revisions.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -707,6 +1141,262 @@ def revision_get_all(session=None, **filters):
             session.close()
 
 
+def _revision_tags_get(revision_ids, session):
+    tags = {}
+    for tag in session.query(models.RevisionTag)\
+            .filter(models.RevisionTag.revision_id.in_(revision_ids))\
+            .order_by(models.RevisionTag.id):
+        tags.setdefault(tag.revision_id, []).append(
+            {'tag': tag.tag, 'data': tag.data})
+    return tags
+
+
+def _revision_buckets_get(revision_ids, session):
+    buckets = {}
+    rows = session.query(models.Document.revision_id, models.Bucket.name)\
+        .join(models.Bucket, models.Bucket.id == models.Document.bucket_id)\
+        .filter(models.Document.revision_id.in_(revision_ids))\
+        .distinct()
+    for revision_id, bucket_name in rows:
+        buckets.setdefault(revision_id, []).append(bucket_name)
+    return {k: sorted(v) for k, v in buckets.items()}
+
+
+def revision_summary_get_all(tags=None, sort_by=None, order_by=None,
+                             limit=None, marker=None, session=None):
+    """Return a summary of each revision without loading its documents.
+
+    Each summary includes the distinct names of the buckets with documents
+    in the revision and the revision's tags, which are all aggregated by the
+    database.
+
+    :param tags: Tag or list of tags. Only revisions with any of these tags
+        are returned.
+    :param sort_by: Revision attribute or list of attributes to sort by.
+        Only ``id`` and ``created_at`` are supported. Defaults to
+        ``created_at``.
+    :param order_by: "asc" or "desc". Defaults to "asc".
+    :param limit: Maximum number of revisions to return.
+    :param marker: ID of the last revision of the previous page. Only
+        revisions sorted after it are returned.
+    :param session: Database session object.
+    :returns: List of dictionaries with the ``id``, ``created_at``, ``tags``
+        and ``buckets`` of each revision.
+    :raises RevisionNotFound: if the ``marker`` revision was not found.
+    :raises InvalidInputException: if ``sort_by`` has an unsupported
+        attribute.
+    """
+    rev = models.Revision
+    if sort_by is None:
+        sort_by = 'created_at'
+    if not isinstance(sort_by, list):
+        sort_by = [sort_by]
+    for key in sort_by:
+        if key not in ('id', 'created_at'):
+            raise errors.InvalidInputException(input_var='sort=%s' % key)
+    # Always sort by ID last so that the keyset used for pagination is unique.
+    sort_columns = [getattr(rev, k) for k in sort_by] + [rev.id]
+
+    own_session = _owns_session(session)
+    session = session or get_session()
+    descending = order_by == 'desc'
+
+    try:
+        query = session.query(rev.id, rev.created_at)
+
+        if tags is not None:
+            if not isinstance(tags, (list, tuple)):
+                tags = [tags]
+            query = query.filter(
+                session.query(models.RevisionTag.id)
+                .filter(models.RevisionTag.revision_id == rev.id,
+                        models.RevisionTag.tag.in_(tags))
+                .exists())
+
+        if marker is not None:
+            marker_key = session.query(*sort_columns)\
+                .filter(rev.id == marker)\
+                .one_or_none()
+            if marker_key is None:
+                raise errors.RevisionNotFound(revision_id=marker)
+            keyset = sa.tuple_(*sort_columns)
+            query = query.filter(keyset < sa.tuple_(*marker_key)
+                                 if descending else
+                                 keyset > sa.tuple_(*marker_key))
+
+        query = query.order_by(*[c.desc() if descending else c.asc()
+                                 for c in sort_columns])
+        if limit is not None:
+            query = query.limit(limit)
+
+        revisions = query.all()
+        revision_ids = [r.id for r in revisions]
+        if not revision_ids:
+            return []
+
+        revision_tags = _revision_tags_get(revision_ids, session)
+        revision_buckets = _revision_buckets_get(revision_ids, session)
+
+        return [{
+            'id': r.id,
+            'created_at': r.created_at.isoformat(),
+            'tags': revision_tags.get(r.id, []),
+            'buckets': revision_buckets.get(r.id, [])
+        } for r in revisions]
+    finally:
+        if own_session:
+            session.close()
+
+
+def revision_summary_get(revision_id, session=None):
+    """Return a summary of the specified `revision_id`.
+
+    Only the revision's ``ValidationPolicy`` documents are loaded; bucket
+    names are aggregated by the database.
+
+    :param revision_id: The ID corresponding to the ``Revision`` object.
+    :param session: Database session object.
+    :returns: Dictionary with the ``id``, ``created_at``, ``tags``,
+        ``buckets`` and validation policy ``documents`` of the revision.
+    :raises RevisionNotFound: if the revision was not found.
+    """
+    own_session = _owns_session(session)
+    session = session or get_session()
+
+    try:
+        revision = session.query(models.Revision.id,
+                                 models.Revision.created_at)\
+            .filter_by(id=revision_id)\
+            .one_or_none()
+        if revision is None:
+            if _retry_on_primary(session):
+                return revision_summary_get(revision_id)
+            raise errors.RevisionNotFound(revision_id=revision_id)
+
+        validation_policies = session.query(models.Document)\
+            .filter(models.Document.revision_id == revision.id,
+                    models.Document.schema.startswith(
+                        types.VALIDATION_POLICY_SCHEMA))\
+            .order_by(models.Document.id)\
+            .all()
+
+        return {
+            'id': revision.id,
+            'created_at': revision.created_at.isoformat(),
+            'tags': _revision_tags_get([revision.id], session).get(
+                revision.id, []),
+            'buckets': _revision_buckets_get([revision.id], session).get(
+                revision.id, []),
+            'documents': _update_revision_history(
+                [d.to_dict() for d in validation_policies])
+        }
+    finally:
+        if own_session:
+            session.close()
+
+
+def _revisions_archive_iter(revision_ids, session):
+    """Lazily load each revision in ``revision_ids`` with its documents."""
+    doc = models.Document
+    for revision_id, created_at in session.query(
+            models.Revision.id, models.Revision.created_at)\
+            .filter(models.Revision.id.in_(revision_ids))\
+            .order_by(models.Revision.id):
+        documents = _document_rows_query(
+            session, doc.revision_id == revision_id).order_by(doc.id)
+        yield {
+            'id': revision_id,
+            'created_at': created_at.isoformat(),
+            'documents': list(_document_rows_iter(documents))
+        }
+
+
+def revisions_compact(older_than, archive=None, session=None):
+    """Collapse old revisions into the revisions that succeed them.
+
+    Removes every revision created before ``older_than`` that has neither
+    tags, validations nor ValidationPolicy documents, except for the latest
+    revision. Documents of a removed revision that are still the newest for
+    their key as of the next surviving revision are moved into that
+    revision, and ``orig_revision_id`` references to a removed revision are
+    rewritten to the next surviving revision. The cumulative documents of
+    every surviving revision -- as listed with ``include_history`` -- are
+    thus unchanged, but the documents that revision holds directly include
+    the moved ones. Revisions with ValidationPolicy documents are kept so
+    that the validations expected of the surviving revisions are unchanged.
+    Blobs no longer referenced by any document are removed as well.
+
+    :param older_than: Datetime before which revisions may be removed.
+    :param archive: Callable invoked with an iterable of the revisions about
+        to be removed, each including its documents, before anything is
+        removed.
+    :param session: Database session object.
+    :returns: List of IDs of the removed revisions.
+    """
+    session = session or get_session()
+    rev = models.Revision
+    doc = models.Document
+
+    with _session_begin(session):
+        latest_id = session.query(sa.func.max(rev.id)).scalar()
+        removed_ids = [r.id for r in session.query(rev.id).filter(
+            rev.created_at < older_than,
+            rev.id != latest_id,
+            ~sa.exists().where(models.RevisionTag.revision_id == rev.id),
+            ~sa.exists().where(models.Validation.revision_id == rev.id),
+            ~sa.exists().where(
+                doc.revision_id == rev.id,
+                doc.schema.startswith(types.VALIDATION_POLICY_SCHEMA)))
+            .order_by(rev.id)]
+        if not removed_ids:
+            return []
+
+        if archive is not None:
+            archive(_revisions_archive_iter(removed_ids, session))
+
+        # Every revision strictly between two consecutive surviving revisions
+        # is removed and folded into the later of the two.
+        removed = set(removed_ids)
+        previous_id = 0
+        for (revision_id,) in session.query(rev.id).order_by(rev.id):
+            if revision_id in removed:
+                continue
+            if revision_id - previous_id > 1:
+                folded = sa.and_(doc.revision_id > previous_id,
+                                 doc.revision_id < revision_id)
+                latest = _latest_document_ids(session, revision_id)
+                session.query(doc)\
+                    .filter(folded, doc.id.in_(sa.select(latest.c.id)))\
+                    .update({doc.revision_id: revision_id},
+                            synchronize_session=False)
+                session.query(doc)\
+                    .filter(doc.orig_revision_id > previous_id,
+                            doc.orig_revision_id < revision_id)\
+                    .update({doc.orig_revision_id: revision_id},
+                            synchronize_session=False)
+                # Superseded documents are deleted by cascade.
+                session.query(rev)\
+                    .filter(rev.id > previous_id, rev.id < revision_id)\
+                    .delete(synchronize_session=False)
+            previous_id = revision_id
+
+        blob = models.DocumentBlob
+        session.query(blob)\
+            .filter(blob.hash.notin_(sa.union(
+                sa.select(doc.data_hash), sa.select(doc.metadata_hash))))\
+            .delete(synchronize_session=False)
+
+    existing_revisions = getattr(_request_state, 'existing_revisions', None)
+    if existing_revisions:
+        existing_revisions.difference_update(
+            six.text_type(r) for r in removed_ids)
+    # The documents held by the surviving revisions changed.
+    _get_validation_policy_cache().clear()
+
+    LOG.info('Compacted revisions: %s.', removed_ids)
+    return removed_ids
+
+
 def revision_delete_all():
     """Delete all revisions and resets primary key index back to 1 for each
     table in the database.
@@ -724,15 +1414,131 @@ def revision_delete_all():
         # NOTE(fmontei): While cascade should delete all data from all tables,
         # we also need to reset the index to 1 for each table.
         for table in ['buckets', 'revisions', 'revision_tags', 'documents',
-                      'validations']:
-            with engine.connect() as conn:
-                conn.execute(
-                    text(
-                        "TRUNCATE TABLE %s RESTART IDENTITY CASCADE;"
-                        % table))
-                conn.commit()
+                      'document_blobs', 'validations', 'validation_rollups']:
+            raw_query("TRUNCATE TABLE %s RESTART IDENTITY CASCADE;" % table)
     else:
         raw_query("DELETE FROM revisions;")
+        raw_query("DELETE FROM document_blobs;")
+
+    # Revision IDs are reused from now on.
+    _get_validation_policy_cache().clear()
+
+    existing_revisions = getattr(_request_state, 'existing_revisions', None)
+    if existing_revisions:
+        existing_revisions.clear()
+
+
+def _latest_document_ids(session, revision_id=None, *criteria):
+    """Build a subquery of the newest document ID per unique key.
+
+    Selects the most recent row for each (``schema``, ``layer``, ``name``)
+    among all revisions up to and including ``revision_id``. PostgreSQL uses
+    ``DISTINCT ON``; other backends fall back to a ``ROW_NUMBER()`` window
+    function.
+
+    :param session: Database session object.
+    :param revision_id: ID of the revision at which to stop looking back. If
+        ``None``, all revisions are considered.
+    :param criteria: Additional criteria restricting the candidate rows. Only
+        criteria over the unique key columns preserve the "newest per key"
+        semantics.
+    :returns: Subquery with a single ``id`` column.
+    """
+    doc = models.Document
+    unique_key = (doc.schema, doc.layer, doc.name)
+    newest_first = (doc.revision_id.desc(), doc.id.desc())
+
+    if revision_id is not None:
+        criteria += (doc.revision_id <= revision_id,)
+
+    if session.get_bind().dialect.name == 'postgresql':
+        return session.query(doc.id.label('id'))\
+            .filter(*criteria)\
+            .distinct(*unique_key)\
+            .order_by(*(unique_key + newest_first))\
+            .subquery()
+
+    ranked = session.query(
+        doc.id.label('id'),
+        sa.func.row_number().over(
+            partition_by=unique_key,
+            order_by=newest_first).label('rank'))\
+        .filter(*criteria)\
+        .subquery()
+    return session.query(ranked.c.id)\
+        .filter(ranked.c.rank == 1)\
+        .subquery()
+
+
+def _document_rows_query(session, *criteria):
+    """Build a query of lightweight document rows.
+
+    Unlike ``Document`` objects, rows carry their ``data``, ``metadata`` and
+    bucket name as plain columns, so they can be streamed in batches without
+    populating the session's identity map.
+
+    :param session: Database session object.
+    :param criteria: Criteria restricting the selected documents.
+    :returns: Query yielding document rows.
+    """
+    doc = models.Document
+    data_blob = sa_orm.aliased(models.DocumentBlob)
+    meta_blob = sa_orm.aliased(models.DocumentBlob)
+
+    return session.query(*(list(doc.__table__.columns) + [
+        data_blob.content.label('data'),
+        meta_blob.content.label('meta'),
+        models.Bucket.name.label('bucket_name')]))\
+        .join(data_blob, data_blob.hash == doc.data_hash)\
+        .join(meta_blob, meta_blob.hash == doc.metadata_hash)\
+        .outerjoin(models.Bucket, models.Bucket.id == doc.bucket_id)\
+        .filter(*criteria)
+
+
+def _document_rows_iter(query, raw_dict=False):
+    """Lazily convert the rows of ``query`` into document dictionaries.
+
+    Rows are fetched ``_DOCUMENT_ROWS_BATCH_SIZE`` at a time, using a
+    server-side cursor where the backend supports one.
+
+    :param query: Query built by :func:`_document_rows_query`.
+    :param raw_dict: Whether to keep the ``meta`` key rather than renaming it
+        to ``metadata``.
+    :returns: Generator of dictionaries shaped like ``Document.to_dict``.
+    """
+    for row in query.yield_per(_DOCUMENT_ROWS_BATCH_SIZE):
+        d = row._asdict()
+        for k in ('created_at', 'updated_at', 'deleted_at'):
+            if d[k]:
+                d[k] = d[k].isoformat()
+        if not raw_dict:
+            d['metadata'] = d.pop('meta')
+        yield d
+
+
+def _latest_document_rows_query(session, revision_id, filters, *order_by):
+    """Build a query for the newest document row per unique key.
+
+    :param session: Database session object.
+    :param revision_id: ID of the revision at which to stop looking back.
+    :param filters: Dictionary of filters. A ``deleted`` filter of ``False``
+        drops keys whose newest row is a deletion marker.
+    :param order_by: Columns by which to order the rows.
+    :returns: Tuple of the query and the filters that still need to be
+        applied in Python.
+    """
+    doc = models.Document
+    filters = filters.copy()
+    latest = _latest_document_ids(session, revision_id)
+    query = _document_rows_query(session)\
+        .join(latest, latest.c.id == doc.id)
+
+    if filters.get('deleted', None) is False:
+        filters.pop('deleted')
+        query = query.filter(doc.deleted.is_(False))
+
+    query, filters = _filter_documents_query(session, query, filters)
+    return query.order_by(*order_by), filters
 
 
 @require_revision_exists
@@ -752,7 +1558,7 @@ def revision_documents_get(revision_id=None, include_history=True,
         ``filters``, including document revision history if applicable.
     :raises RevisionNotFound: if the revision was not found.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
     revision_documents = []
 
@@ -768,7 +1574,17 @@ def revision_documents_get(revision_id=None, include_history=True,
                     .order_by(models.Revision.created_at.desc())\
                     .first()
 
-            if revision:
+            if revision and include_history and unique_only:
+                # Let the database pick the newest document per unique key
+                # rather than materializing the entire revision history.
+                query, filters = _latest_document_rows_query(
+                    session, revision.id, filters,
+                    models.Document.revision_id.desc(), models.Document.id)
+                revision_documents = _update_revision_history(
+                    list(_document_rows_iter(query)))
+                return [d for d in revision_documents
+                        if utils.deepfilter(d, **filters)]
+            elif revision:
                 revision_documents = revision.to_dict()['documents']
                 if include_history:
                     relevant_revisions = session.query(models.Revision)\
@@ -795,6 +1611,118 @@ def revision_documents_get(revision_id=None, include_history=True,
             session.close()
 
 
+@require_revision_exists
+def revision_documents_iter(revision_id=None, session=None, **filters):
+    """Stream the unique documents that match filters for `revision_id`.
+
+    Like :func:`revision_documents_get` with its default arguments, except
+    that documents are fetched from the database in batches and yielded one
+    at a time, ordered by creation date, so that memory use stays bounded
+    however large the revision is.
+
+    :param revision_id: The ID corresponding to the ``Revision`` object. If the
+        ID is ``None``, then stream the latest revision, if one exists.
+    :param session: Database session object.
+    :param filters: Key-value pairs used for filtering out revision documents.
+    :returns: Generator of revision documents for ``revision_id`` that match
+        the ``filters``.
+    :raises RevisionNotFound: if the revision was not found.
+    """
+    own_session = _owns_session(session)
+    session = session or get_session()
+    doc = models.Document
+
+    if not revision_id:
+        revision_id = session.query(models.Revision.id)\
+            .order_by(models.Revision.created_at.desc())\
+            .limit(1)\
+            .scalar()
+    if not revision_id:
+        if own_session:
+            session.close()
+        return iter([])
+
+    query, filters = _latest_document_rows_query(
+        session, revision_id, filters,
+        doc.created_at, doc.revision_id.desc(), doc.id)
+
+    def documents():
+        try:
+            for d in _document_rows_iter(query):
+                if d['orig_revision_id']:
+                    d['revision_id'] = d['orig_revision_id']
+                if utils.deepfilter(d, **filters):
+                    yield d
+        finally:
+            if own_session:
+                session.close()
+
+    return documents()
+
+
+####################
+
+
+def rendered_documents_get(cache_key, session=None):
+    """Retrieve a snapshot of rendered documents.
+
+    :param cache_key: Digest of the rendering inputs the snapshot was
+        rendered from.
+    :param session: Database session object.
+    :returns: List of rendered documents, or None if no snapshot exists.
+    """
+    own_session = _owns_session(session)
+    session = session or get_session()
+
+    try:
+        documents = session.query(models.RenderedDocuments.documents)\
+            .filter_by(cache_key=cache_key)\
+            .limit(1)\
+            .scalar()
+    finally:
+        if own_session:
+            session.close()
+
+    if documents is None:
+        return None
+    return document_wrapper.DocumentDict.from_list(documents)
+
+
+@require_revision_exists
+def rendered_documents_create(revision_id, cache_key, documents,
+                              session=None):
+    """Persist a snapshot of the rendered documents for ``revision_id``.
+
+    If a snapshot already exists for ``revision_id`` and ``cache_key``, the
+    request is ignored.
+
+    :param revision_id: ID corresponding to ``Revision`` DB object.
+    :param cache_key: Digest of the rendering inputs ``documents`` were
+        rendered from.
+    :param documents: List of post-validated rendered documents.
+    :param session: Database session object.
+    """
+    # Snapshots are written while serving read-only requests.
+    if session is None and _reads_from_replica():
+        _use_primary_for_request()
+    session = session or get_session()
+    snapshot = models.RenderedDocuments
+    dialect = session.get_bind().dialect.name
+    values = {'revision_id': revision_id, 'cache_key': cache_key,
+              'documents': documents}
+
+    with _session_begin(session):
+        if dialect in ('postgresql', 'sqlite'):
+            insert = (postgresql.insert if dialect == 'postgresql'
+                      else sqlite.insert)
+            session.execute(
+                insert(snapshot).values(**values).on_conflict_do_nothing(
+                    index_elements=['cache_key', 'revision_id']))
+        elif session.get(snapshot, (cache_key, revision_id)) is None:
+            session.add(snapshot(**values))
+            session.flush()
+
+
 ####################
 
 
@@ -855,7 +1783,7 @@ def revision_tag_get(revision_id, tag, session=None):
     :returns: None
     :raises RevisionTagNotFound: If ``tag`` for ``revision_id`` was not found.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -882,7 +1810,7 @@ def revision_tag_get_all(revision_id, session=None):
     :returns: List of tags for ``revision_id``, ordered by the tag name by
         default.
     """
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -930,101 +1858,101 @@ def revision_tag_delete_all(revision_id, session=None):
 ####################
 
 
+def _live_documents_subquery(session, revision_id):
+    """Build a subquery of the documents that are live at ``revision_id``.
+
+    That is, the newest row per unique key among all revisions up to and
+    including ``revision_id``, excluding deletion markers.
+    """
+    doc = models.Document
+    latest = _latest_document_ids(session, revision_id)
+    return session.query(doc)\
+        .join(latest, doc.id == latest.c.id)\
+        .filter(doc.deleted == sa.false())\
+        .subquery()
+
+
+@require_revision_exists
 def revision_rollback(revision_id, latest_revision, session=None):
     """Rollback the latest revision to revision specified by ``revision_id``.
 
     Rolls back the latest revision to the revision specified by ``revision_id``
     thereby creating a new, carbon-copy revision.
 
+    The new revision is populated server-side with two ``INSERT ... SELECT``
+    statements: one recording a deletion marker for each document that is
+    live in the latest revision but not in the target revision, and one
+    copying the live documents of the target revision. Document data and
+    metadata blobs are shared, so only their hashes are copied.
+
     :param revision_id: Revision ID to which to rollback.
     :param latest_revision: Dictionary representation of the latest revision
         in the system.
     :returns: The newly created revision.
     """
     session = session or get_session()
-    with _session_begin(session):
-        latest_revision_docs = revision_documents_get(latest_revision['id'],
-                                                      session=session)
-        latest_revision_hashes = [
-            (d['data_hash'], d['metadata_hash']) for d in latest_revision_docs
-        ]
-
-        if latest_revision['id'] == revision_id:
-            LOG.debug('The revision being rolled back to is the current '
-                      'revision. Expect no meaningful changes.')
-
-        if revision_id == 0:
-            # Delete all existing documents in all buckets
-            all_buckets = bucket_get_all(deleted=False, session=session)
-            bucket_names = [six.text_type(b['name']) for b in all_buckets]
-            revision = documents_delete_from_buckets_list(bucket_names,
-                                                          session=session)
-            return revision.to_dict()
-        else:
-            # Sorting the documents so the documents in the new revision are in
-            # the same order as the previous revision to support stable testing
-            orig_revision_docs = sorted(
-                revision_documents_get(revision_id, session=session),
-                key=lambda d: d['id'])
-
-        # A mechanism for determining whether a particular document has changed
-        # between revisions. Keyed with the document_id, the value is True if
-        # it has changed, else False.
-        doc_diff = {}
-        # List of unique buckets that exist in this revision
-        unique_buckets = []
-        for orig_doc in orig_revision_docs:
-            if ((orig_doc['data_hash'], orig_doc['metadata_hash'])
-                    not in latest_revision_hashes):
-                doc_diff[orig_doc['id']] = True
-            else:
-                doc_diff[orig_doc['id']] = False
-            if orig_doc['bucket_id'] not in unique_buckets:
-                unique_buckets.append(orig_doc['bucket_id'])
-
-        # We need to find which buckets did not exist at this revision
-        buckets_to_delete = []
-        all_buckets = bucket_get_all(deleted=False, session=session)
-        for bucket in all_buckets:
-            if bucket['id'] not in unique_buckets:
-                buckets_to_delete.append(six.text_type(bucket['name']))
-
-        # Create the new revision,
-        if len(buckets_to_delete) > 0:
-            new_revision = documents_delete_from_buckets_list(
-                buckets_to_delete, session=session)
-        else:
-            new_revision = models.Revision()
-            new_revision.save(session=session)
-
-        # No changes have been made between the target revision to rollback to
-        # and the latest revision.
-        if set(doc_diff.values()) == set([False]):
-            LOG.debug('The revision being rolled back to has the same '
-                      'documents as that of the current revision. Expect no '
-                      'meaningful changes.')
-
-        # Create the documents for the revision.
-        for orig_document in orig_revision_docs:
-            orig_document['revision_id'] = new_revision['id']
-            orig_document['meta'] = orig_document.pop('metadata')
-
-            new_document = models.Document()
-            new_document.update({x: orig_document[x] for x in (
-                'name', 'meta', 'layer', 'data', 'data_hash', 'metadata_hash',
-                'schema', 'bucket_id')})
-            new_document['revision_id'] = new_revision['id']
-
-            # If the document has changed, then use the revision_id of the new
-            # revision, otherwise use the original revision_id to preserve the
-            # revision history.
-            if doc_diff[orig_document['id']]:
-                new_document['orig_revision_id'] = new_revision['id']
-            else:
-                new_document['orig_revision_id'] = revision_id
+    doc = models.Document
 
-            new_document.save(session=session)
+    if latest_revision['id'] == revision_id:
+        LOG.debug('The revision being rolled back to is the current '
+                  'revision. Expect no meaningful changes.')
 
+    with _session_begin(session):
+        new_revision = models.Revision()
+        new_revision.save(session=session)
+
+        # Rolling back to revision 0 selects no target documents, so every
+        # live document is deleted, resulting in a blank slate.
+        target = _live_documents_subquery(session, revision_id)
+        current = _live_documents_subquery(session, latest_revision['id'])
+
+        def same_key(a, b):
+            return sa.and_(a.c.schema == b.c.schema, a.c.name == b.c.name,
+                           sa.or_(a.c.layer == b.c.layer,
+                                  sa.and_(a.c.layer.is_(None),
+                                          b.c.layer.is_(None))))
+
+        now = timeutils.utcnow()
+        empty_data_hash = _make_hash({})
+        _document_blobs_create({empty_data_hash: {}}, session)
+
+        # Delete the documents that didn't exist at the target revision, which
+        # covers both buckets and documents created since then.
+        deleted = sa.select(
+            current.c.schema, current.c.layer, current.c.name,
+            sa.literal(empty_data_hash), current.c.metadata_hash,
+            current.c.bucket_id, sa.literal(new_revision['id']),
+            sa.literal(now), sa.literal(now), sa.true())\
+            .where(~sa.exists().where(same_key(target, current)))\
+            .order_by(current.c.id)
+        session.execute(sa.insert(doc).from_select(
+            ['schema', 'layer', 'name', 'data_hash', 'metadata_hash',
+             'bucket_id', 'revision_id', 'created_at', 'deleted_at',
+             'deleted'],
+            deleted, include_defaults=False))
+
+        # If a document is unchanged in the latest revision, then keep the
+        # target revision as its original revision to preserve the revision
+        # history, otherwise use the new revision.
+        unchanged = sa.exists().where(sa.and_(
+            same_key(current, target),
+            current.c.data_hash == target.c.data_hash,
+            current.c.metadata_hash == target.c.metadata_hash))
+        copied = sa.select(
+            target.c.schema, target.c.layer, target.c.name,
+            target.c.data_hash, target.c.metadata_hash, target.c.bucket_id,
+            sa.literal(new_revision['id']),
+            sa.case((unchanged, sa.literal(revision_id)),
+                    else_=sa.literal(new_revision['id'])),
+            sa.literal(now), sa.false())\
+            .order_by(target.c.id)
+        session.execute(sa.insert(doc).from_select(
+            ['schema', 'layer', 'name', 'data_hash', 'metadata_hash',
+             'bucket_id', 'revision_id', 'orig_revision_id', 'created_at',
+             'deleted'],
+            copied, include_defaults=False))
+
+        session.expire(new_revision, ['documents'])
         new_revision = new_revision.to_dict()
         new_revision['documents'] = _update_revision_history(
             new_revision['documents'])
@@ -1036,10 +1964,10 @@ def revision_rollback(revision_id, latest_revision, session=None):
 
 
 def _get_validation_policies_for_revision(revision_id, session=None):
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
-    try:
+    def do_get():
         # Check if a ValidationPolicy for the revision exists.
         validation_policies = document_get_all(
             session, revision_id=revision_id, deleted=False,
@@ -1053,11 +1981,51 @@ def _get_validation_policies_for_revision(revision_id, session=None):
             validation_policies = []
 
         return validation_policies
+
+    try:
+        if CONF.engine.enable_cache:
+            return _get_validation_policy_cache().get(
+                key=six.text_type(revision_id), createfunc=do_get)
+        return do_get()
     finally:
         if own_session:
             session.close()
 
 
+def _validation_rollup_update(revision_id, val_name, status, session):
+    """Fold a newly registered validation result into its rollup."""
+    rollup = models.ValidationRollup
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        insert = (postgresql.insert if dialect == 'postgresql'
+                  else sqlite.insert)
+        # PostgreSQL has no scalar MIN(); SQLite has no LEAST().
+        least = sa.func.least if dialect == 'postgresql' else sa.func.min
+        stmt = insert(rollup).values(
+            revision_id=revision_id, name=val_name, worst_status=status,
+            count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['revision_id', 'name'],
+            set_={'worst_status': least(rollup.worst_status,
+                                        stmt.excluded.worst_status),
+                  'count': rollup.count + 1,
+                  'updated_at': timeutils.utcnow()})
+        session.execute(stmt)
+    else:
+        existing = session.query(rollup)\
+            .filter_by(revision_id=revision_id, name=val_name)\
+            .with_for_update()\
+            .one_or_none()
+        if existing is None:
+            existing = rollup(revision_id=revision_id, name=val_name,
+                              worst_status=status, count=0)
+            session.add(existing)
+        existing.worst_status = min(existing.worst_status, status)
+        existing.count += 1
+        session.flush()
+
+
 @require_revision_exists
 def validation_create(revision_id, val_name, val_data, session=None):
     session = session or get_session()
@@ -1075,36 +2043,33 @@ def validation_create(revision_id, val_name, val_data, session=None):
     with _session_begin(session):
         validation.update(validation_kwargs)
         validation.save(session=session)
+        _validation_rollup_update(
+            revision_id, val_name, validation.status, session)
 
     return validation.to_dict()
 
 
 @require_revision_exists
 def validation_get_all(revision_id, session=None):
-    # Query selects only unique combinations of (name, status) from the
-    # `Validations` table and prioritizes 'failure' result over 'success'
-    # result via alphabetical ordering of the status column. Each document
-    # has its own validation but for this query we want to return the result
-    # of the overall validation for the revision. If just 1 document failed
-    # validation, we regard the validation for the whole revision as 'failure'.
-    own_session = session is None
+    # Each document has its own validation but for this query we want to
+    # return the result of the overall validation for the revision, which is
+    # kept up to date by `validation_create` in the `ValidationRollup` table.
+    # The 'failure' result is prioritized over the 'success' result via
+    # alphabetical ordering of the status column: if just 1 document failed
+    # validation, we regard the validation for the whole revision as
+    # 'failure'.
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
-        query = raw_query("""
-            SELECT DISTINCT name, status FROM validations as v1
-                WHERE revision_id=:revision_id AND status = (
-                    SELECT status FROM validations as v2
-                        WHERE v2.name = v1.name
-                        ORDER BY status
-                        LIMIT 1
-                )
-                GROUP BY name, status
-                ORDER BY name, status;
-        """, revision_id=revision_id)
+        rollups = session.query(models.ValidationRollup.name,
+                                models.ValidationRollup.worst_status)\
+            .filter_by(revision_id=revision_id)\
+            .order_by(models.ValidationRollup.name)
 
-        result = {v[0]: v for v in query.fetchall()}
-        actual_validations = set(v[0] for v in result.values())
+        result = collections.OrderedDict(
+            (name, (name, status)) for name, status in rollups)
+        actual_validations = set(result)
 
         validation_policies = _get_validation_policies_for_revision(
             revision_id, session=session)
@@ -1141,7 +2106,7 @@ def validation_get_all(revision_id, session=None):
 
 def _check_validation_entries_against_validation_policies(
         revision_id, entries, val_name=None, session=None):
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -1214,7 +2179,7 @@ def _check_validation_entries_against_validation_policies(
 
 @require_revision_exists
 def validation_get_all_entries(revision_id, val_name=None, session=None):
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -1233,7 +2198,7 @@ def validation_get_all_entries(revision_id, val_name=None, session=None):
 
 @require_revision_exists
 def validation_get_entry(revision_id, val_name, entry_id, session=None):
-    own_session = session is None
+    own_session = _owns_session(session)
     session = session or get_session()
 
     try:
@@ -26,6 +26,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext import declarative
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy import String
@@ -133,6 +134,28 @@ def __build_tables(blob_type_obj, blob_type_list):
             d['tags'] = [tag.to_dict() for tag in self.tags]
             return d
 
+    class DocumentBlob(BASE, DeckhandBase):
+        """Content-addressed storage for document ``data`` and ``metadata``.
+
+        Blobs are keyed by the SHA-256 hash of their JSON serialization (see
+        ``Document.data_hash`` and ``Document.metadata_hash``) and are
+        immutable, so documents that are carried over unchanged into newer
+        revisions share the same blobs instead of duplicating them.
+        """
+        __tablename__ = 'document_blobs'
+
+        # Nested document filters are compiled into JSONB containment checks,
+        # which only PostgreSQL can index.
+        if blob_type_obj is JSONB:
+            __table_args__ = (
+                Index('ix_document_blobs_content', 'content',
+                      postgresql_using='gin',
+                      postgresql_ops={'content': 'jsonb_path_ops'}),
+            )
+
+        hash = Column(String, primary_key=True)
+        content = Column(blob_type_obj, nullable=True)
+
     class Document(BASE, DeckhandBase):
         UNIQUE_CONSTRAINTS = ('schema', 'layer', 'name', 'revision_id')
 
@@ -141,6 +164,11 @@ def __build_tables(blob_type_obj, blob_type_list):
         __table_args__ = (
             UniqueConstraint(*UNIQUE_CONSTRAINTS,
                              name='duplicate_document_constraint'),
+            # Supports ``LIKE 'namespace/%'`` schema prefix filtering.
+            Index('ix_documents_schema', 'schema',
+                  postgresql_ops={'schema': 'varchar_pattern_ops'}),
+            Index('ix_documents_data_hash', 'data_hash'),
+            Index('ix_documents_metadata_hash', 'metadata_hash'),
         )
 
         id = Column(Integer, primary_key=True)
@@ -148,11 +176,20 @@ def __build_tables(blob_type_obj, blob_type_list):
         schema = Column(String(64), nullable=False)
         layer = Column(String(64), nullable=True)
         # NOTE(fmontei): ``metadata`` is reserved by the DB, so ``meta`` must
-        # be used to store document metadata information in the DB.
-        meta = Column(blob_type_obj, nullable=False)
-        data = Column(blob_type_obj, nullable=True)
-        data_hash = Column(String, nullable=False)
-        metadata_hash = Column(String, nullable=False)
+        # be used to refer to document metadata information in the DB. Both
+        # ``meta`` and ``data`` are stored in ``document_blobs`` and referenced
+        # by their hashes.
+        data_hash = Column(String, ForeignKey('document_blobs.hash'),
+                           nullable=False)
+        metadata_hash = Column(String, ForeignKey('document_blobs.hash'),
+                               nullable=False)
+        # Blobs are shared by many documents across revisions, so load each
+        # distinct blob once per query rather than once per row.
+        data_blob = relationship("DocumentBlob", foreign_keys=[data_hash],
+                                 lazy='selectin')
+        meta_blob = relationship("DocumentBlob",
+                                 foreign_keys=[metadata_hash],
+                                 lazy='selectin')
         bucket_id = Column(Integer, ForeignKey('buckets.id',
                                                ondelete='CASCADE'),
                            nullable=False)
@@ -180,6 +217,14 @@ def __build_tables(blob_type_obj, blob_type_list):
                 return self.bucket.name
             return None
 
+        @property
+        def data(self):
+            return self.data_blob.content if self.data_blob else None
+
+        @property
+        def meta(self):
+            return self.meta_blob.content if self.meta_blob else None
+
         def to_dict(self, raw_dict=False):
             """Convert the object into dictionary format.
 
@@ -187,12 +232,14 @@ def __build_tables(blob_type_obj, blob_type_list):
             """
             d = super(Document, self).to_dict()
             d['bucket_name'] = self.bucket_name
+            d['data'] = self.data
+            d['meta'] = self.meta
 
             if not raw_dict:
                 d['metadata'] = d.pop('meta')
 
-            if 'bucket' in d:
-                d.pop('bucket')
+            for relationship_name in ('bucket', 'data_blob', 'meta_blob'):
+                d.pop(relationship_name, None)
 
             return d
 
@@ -209,8 +256,42 @@ def __build_tables(blob_type_obj, blob_type_list):
             ForeignKey('revisions.id', ondelete='CASCADE'),
             nullable=False)
 
+    class ValidationRollup(BASE, DeckhandBase):
+        """Rollup of the results registered for each validation of a revision.
+
+        Maintained alongside ``validations`` so that the overall status of
+        each validation can be read without scanning every result.
+        """
+        __tablename__ = 'validation_rollups'
+
+        revision_id = Column(
+            Integer,
+            ForeignKey('revisions.id', ondelete='CASCADE'),
+            primary_key=True)
+        name = Column(String(64), primary_key=True)
+        # Statuses are ranked alphabetically, so "failure" beats "success".
+        worst_status = Column(String(8), nullable=False)
+        count = Column(Integer, nullable=False, default=0)
+
+    class RenderedDocuments(BASE, DeckhandBase):
+        """Snapshot of the post-validated rendered documents of a revision.
+
+        Keyed by a digest of all rendering inputs (see
+        ``deckhand.engine.cache.make_cache_key``), so that a snapshot can be
+        read back for any revision with the same inputs.
+        """
+        __tablename__ = 'rendered_documents'
+
+        cache_key = Column(String(64), primary_key=True)
+        revision_id = Column(
+            Integer,
+            ForeignKey('revisions.id', ondelete='CASCADE'),
+            primary_key=True)
+        documents = Column(blob_type_list, nullable=False)
+
     this_module = sys.modules[__name__]
-    tables = [Bucket, Document, Revision, RevisionTag, Validation]
+    tables = [Bucket, Document, DocumentBlob, RenderedDocuments, Revision,
+              RevisionTag, Validation, ValidationRollup]
     for table in tables:
         setattr(this_module, table.__name__, table)
 
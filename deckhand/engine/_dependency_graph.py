@@ -0,0 +1,146 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dependency graph used to order documents for rendering."""
+
+import collections
+import itertools
+
+from deckhand import errors
+
+
+class DependencyGraph(object):
+    """Directed graph of documents and the documents they depend on.
+
+    Nodes are document ``meta`` tuples. An edge from a document to another
+    means the former must be rendered after the latter, because it is its
+    parent or one of its substitution sources.
+    """
+
+    __slots__ = ('_dependencies', '_dependents')
+
+    def __init__(self):
+        # Both are keyed by node in insertion order, so that sorting is
+        # deterministic.
+        self._dependencies = {}
+        self._dependents = {}
+
+    def __contains__(self, node):
+        return node in self._dependencies
+
+    def __len__(self):
+        return len(self._dependencies)
+
+    def add_node(self, node):
+        if node not in self._dependencies:
+            self._dependencies[node] = set()
+            self._dependents[node] = []
+
+    def add_dependency(self, node, dependency):
+        """Record that ``node`` depends on ``dependency``."""
+        self.add_node(node)
+        self.add_node(dependency)
+        if dependency not in self._dependencies[node]:
+            self._dependencies[node].add(dependency)
+            self._dependents[dependency].append(node)
+
+    def dependencies(self, node):
+        """Return the nodes ``node`` directly depends on."""
+        return self._dependencies.get(node, frozenset())
+
+    def closure(self, nodes):
+        """Return ``nodes`` along with all the nodes they transitively depend
+        on.
+
+        :returns: Set of nodes.
+        """
+        closure = set()
+        stack = [node for node in nodes if node in self._dependencies]
+        while stack:
+            node = stack.pop()
+            if node not in closure:
+                closure.add(node)
+                stack.extend(self._dependencies[node])
+        return closure
+
+    def components(self):
+        """Partition the nodes into weakly connected components.
+
+        Nodes in different components neither depend on each other nor on
+        any common node, so the components can be processed independently.
+
+        :returns: List of components, each a list of nodes. Both are ordered
+            by insertion of their nodes.
+        """
+        component_by_node = {}
+        components = []
+        for node in self._dependencies:
+            if node in component_by_node:
+                continue
+            component = [node]
+            component_by_node[node] = component
+            # The component grows while being iterated over.
+            for member in component:
+                for neighbour in itertools.chain(
+                        self._dependencies[member], self._dependents[member]):
+                    if neighbour not in component_by_node:
+                        component_by_node[neighbour] = component
+                        component.append(neighbour)
+            components.append(component)
+        order = {node: i for i, node in enumerate(self._dependencies)}
+        return [sorted(component, key=order.__getitem__)
+                for component in components]
+
+    def topological_sort(self):
+        """Sort the nodes so that each one comes after its dependencies.
+
+        Uses Kahn's algorithm, so runs in time linear in the number of nodes
+        and edges.
+
+        :returns: List of all nodes, dependencies first.
+        :raises SubstitutionDependencyCycle: If the graph contains a cycle.
+        """
+        in_degree = {node: len(dependencies)
+                     for node, dependencies in self._dependencies.items()}
+        queue = collections.deque(
+            node for node, degree in in_degree.items() if degree == 0)
+        result = []
+
+        while queue:
+            node = queue.popleft()
+            result.append(node)
+            for dependent in self._dependents[node]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        if len(result) != len(self._dependencies):
+            raise errors.SubstitutionDependencyCycle(
+                cycle=self._find_cycle(in_degree))
+        return result
+
+    def _find_cycle(self, in_degree):
+        # Every node left unsorted depends on at least one other unsorted
+        # node, so following those dependencies must lead back to a node
+        # already visited.
+        node = next(n for n, degree in in_degree.items() if degree > 0)
+        path = []
+        visited = {}
+        while node not in visited:
+            visited[node] = len(path)
+            dependency = next(d for d in self._dependencies[node]
+                              if in_degree[d] > 0)
+            path.append((node, dependency))
+            node = dependency
+        return path[visited[node]:]
@@ -0,0 +1,146 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Document type used by the engine while rendering."""
+
+import sys
+
+import yaml
+
+from deckhand.common import document as document_wrapper
+
+_EMPTY = document_wrapper.DocumentDict({})
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_mapping(mapping):
+    if not isinstance(mapping, dict):
+        return mapping
+    return {_intern(k): _intern(v) for k, v in mapping.items()}
+
+
+class Document(document_wrapper.DocumentDict):
+    """:class:`~deckhand.common.document.DocumentDict` whose metadata
+    properties are computed once rather than on every access.
+
+    Rendering reads the identity, selectors and flags of each document many
+    times over, so they are stored in slots when ``schema`` or ``metadata``
+    is assigned. The schema, layer, storage policy and label strings repeated
+    across documents are interned. Documents hash by their ``meta``, so equal
+    documents hash equally without serializing them.
+
+    .. note::
+
+        ``metadata`` is expected to be replaced -- ``doc['metadata'] = ...``
+        -- rather than have its identity or layering keys modified in place.
+        ``storage_policy`` is the only metadata property with a setter.
+
+    """
+
+    __slots__ = ('actions', 'is_abstract', 'is_control', 'is_encrypted',
+                 'is_replacement', 'labels', 'layer', 'meta', 'name',
+                 'parent_selector', 'schema', 'substitutions',
+                 '_barbican_ref')
+
+    def __init__(self, *args, **kwargs):
+        super(Document, self).__init__(*args, **kwargs)
+        self._barbican_ref = None
+        self._replaced_by = None
+        self._refresh()
+
+    def __setitem__(self, key, value):
+        super(Document, self).__setitem__(key, value)
+        if key in ('schema', 'metadata'):
+            self._refresh()
+
+    def _refresh(self):
+        schema = self.get('schema')
+        if type(schema) is str:
+            schema = sys.intern(schema)
+            dict.__setitem__(self, 'schema', schema)
+        metadata = self.get('metadata') or _EMPTY
+        layering_definition = metadata.get('layeringDefinition') or _EMPTY
+
+        if isinstance(metadata, dict):
+            for key in ('schema', 'storagePolicy'):
+                if key in metadata:
+                    metadata[key] = _intern(metadata[key])
+            if metadata.get('labels'):
+                metadata['labels'] = _intern_mapping(metadata['labels'])
+        if isinstance(layering_definition, dict):
+            if 'layer' in layering_definition:
+                layering_definition['layer'] = _intern(
+                    layering_definition['layer'])
+            if layering_definition.get('parentSelector'):
+                layering_definition['parentSelector'] = _intern_mapping(
+                    layering_definition['parentSelector'])
+
+        self.schema = schema or ''
+        self.name = metadata.get('name') or ''
+        self.layer = layering_definition.get('layer') or ''
+        self.meta = (self.schema, self.layer, self.name)
+        self.is_abstract = layering_definition.get('abstract') is True
+        self.is_control = metadata.get('schema', '').startswith(
+            'metadata/Control')
+        self.is_replacement = metadata.get('replacement') is True
+        self.is_encrypted = metadata.get('storagePolicy') == 'encrypted'
+        self.labels = metadata.get('labels') or _EMPTY
+        self.parent_selector = (
+            layering_definition.get('parentSelector') or _EMPTY)
+        self.actions = layering_definition.get('actions', [])
+        self.substitutions = metadata.get('substitutions', [])
+
+    @property
+    def storage_policy(self):
+        return self.metadata.get('storagePolicy') or ''
+
+    @storage_policy.setter
+    def storage_policy(self, value):
+        self.metadata['storagePolicy'] = value
+        self.is_encrypted = value == 'encrypted'
+
+    @property
+    def has_barbican_ref(self):
+        # Data is replaced rather than modified in place when it is a secret
+        # reference, so the result holds as long as the data is the same.
+        data = self.data
+        cached = self._barbican_ref
+        if cached is None or cached[0] is not data:
+            cached = (data, bool(
+                document_wrapper.DocumentDict.has_barbican_ref.fget(self)))
+            self._barbican_ref = cached
+        return cached[1]
+
+    @property
+    def replaced_by(self):
+        return self._replaced_by
+
+    @replaced_by.setter
+    def replaced_by(self, other):
+        self._replaced_by = other
+
+    @property
+    def has_replacement(self):
+        return self._replaced_by is not None
+
+    def __hash__(self):
+        return hash(self.meta)
+
+
+yaml.add_representer(Document, document_wrapper.document_dict_representer)
+yaml.representer.SafeRepresenter.add_representer(
+    Document, document_wrapper.document_dict_representer)
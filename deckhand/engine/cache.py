@@ -12,12 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import os
+import threading
+
 from beaker.cache import CacheManager
 from beaker.util import parse_cache_config_options
 from oslo_log import log as logging
+from oslo_serialization import jsonutils as json
 
+from deckhand.common.document import DocumentDict as dd
 from deckhand.conf import config
+from deckhand.db.sqlalchemy import api as db_api
 from deckhand.engine import layering
+from deckhand.engine import render_pool
 
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
@@ -27,55 +35,261 @@ _CACHE_OPTS = {
     'expire': CONF.engine.cache_timeout,
 }
 _CACHE = CacheManager(**parse_cache_config_options(_CACHE_OPTS))
-_DOCUMENT_RENDERING_CACHE = _CACHE.get_cache('rendered_documents_cache')
+# Created on first use so that the configured backend is honored.
+_DOCUMENT_RENDERING_CACHE = None
+# Cache keys looked up for each revision, so that they can be invalidated by
+# revision. Kept by the same backend as the rendered documents, so that they
+# expire along with them.
+_REVISION_CACHE_KEYS = None
+_REVISION_CACHE_KEYS_LOCK = threading.Lock()
+# State of the latest render, per set of rendering options that affect the
+# output, used to only re-render documents that changed since.
+_RENDER_STATE_CACHE = _CACHE.get_cache('render_state_cache')
+# Documents rendered by the current thread, pending post-validation before
+# they can be persisted as a snapshot.
+_pending_snapshot = threading.local()
+
+
+def _get_rendering_cache():
+    """Return the document rendering cache, using the backend configured by
+    ``[engine] cache_type``.
+
+    The ``file`` and ``dbm`` backends store pickled entries under
+    ``[engine] cache_data_dir``, guarded by file locks, so that all workers on
+    a host share the same entries and only one of them renders a missing one.
+    """
+    global _DOCUMENT_RENDERING_CACHE, _REVISION_CACHE_KEYS
+
+    if _DOCUMENT_RENDERING_CACHE is None:
+        cache_opts = {
+            'cache.type': CONF.engine.cache_type,
+            'cache.expire': CONF.engine.cache_timeout,
+        }
+        if CONF.engine.cache_type != 'memory':
+            cache_opts['cache.data_dir'] = CONF.engine.cache_data_dir
+            cache_opts['cache.lock_dir'] = os.path.join(
+                CONF.engine.cache_data_dir, 'lock')
+        cache_manager = CacheManager(
+            **parse_cache_config_options(cache_opts))
+        _REVISION_CACHE_KEYS = cache_manager.get_cache('revision_cache_keys')
+        _DOCUMENT_RENDERING_CACHE = cache_manager.get_cache(
+            'rendered_documents_cache')
+    return _DOCUMENT_RENDERING_CACHE
+
+
+def _add_revision_cache_key(revision_id, cache_key):
+    rendering_cache = _get_rendering_cache()
+    with _REVISION_CACHE_KEYS_LOCK:
+        try:
+            cache_keys = _REVISION_CACHE_KEYS.get(key=str(revision_id))
+        except KeyError:
+            cache_keys = set()
+        # Forget the keys of entries which have since been removed.
+        cache_keys = set(k for k in cache_keys if k in rendering_cache)
+        cache_keys.add(cache_key)
+        _REVISION_CACHE_KEYS.put(str(revision_id), cache_keys)
+
+
+def _make_hash(data):
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def make_cache_key(documents, **kwargs):
+    """Compute the key under which the rendered ``documents`` are cached.
+
+    The key is a digest of every input to rendering: the identity and content
+    hashes of each document -- including the layering policy and any
+    documents excluded by filters such as ``metadata.storagePolicy`` -- and
+    the rendering options. Identical inputs, e.g. from different revisions,
+    thus share the same key.
+
+    :param documents: List of raw documents to render.
+    :type documents: List[dict]
+    :param kwargs: Kwargs to pass to ``render``. ``encryption_sources`` is
+        ignored as it is derived from ``documents``.
+    :returns: Hex digest of the rendering inputs.
+    :rtype: str
+    """
+    inputs = []
+    for document in documents:
+        document = dd(document)
+        inputs.append((
+            list(document.meta),
+            document.get('data_hash') or _make_hash(document.data),
+            document.get('metadata_hash') or _make_hash(document.metadata)))
+    options = {k: v for k, v in kwargs.items() if k != 'encryption_sources'}
+    return _make_hash([sorted(inputs), options])
+
+
+def _render(documents, document_filters=None, **kwargs):
+    if not CONF.engine.enable_cache:
+        return layering.DocumentLayering(documents, **kwargs).render(
+            document_filters=document_filters)
+
+    state_key = 'cleartext_secrets=%s' % kwargs.get('cleartext_secrets', False)
+    try:
+        render_state = _RENDER_STATE_CACHE.get(key=state_key)
+    except KeyError:
+        render_state = None
 
+    document_layering = layering.DocumentLayering(
+        documents, render_state=render_state, **kwargs)
+    rendered_documents = document_layering.render(
+        document_filters=document_filters)
+    _RENDER_STATE_CACHE.put(state_key, document_layering.render_state)
+    return rendered_documents
 
-def lookup_by_revision_id(revision_id, documents, **kwargs):
-    """Look up rendered documents by ``revision_id``.
 
-    :param revision_id: Revision ID for which to render documents. Used as key
-        in cache.
+def _get_rendered_revision(revision_id, documents, **kwargs):
+    """Return the documents already rendered for the entire revision, from
+    the cache or a snapshot, or None.
+    """
+    if not (CONF.engine.enable_cache or
+            CONF.engine.enable_rendered_snapshots):
+        return None
+
+    cache_key = make_cache_key(documents, **kwargs)
+    if CONF.engine.enable_cache:
+        try:
+            rendered_documents = _get_rendering_cache().get(key=cache_key)
+        except KeyError:
+            pass
+        else:
+            _add_revision_cache_key(revision_id, cache_key)
+            return rendered_documents
+    if CONF.engine.enable_rendered_snapshots:
+        return db_api.rendered_documents_get(cache_key)
+    return None
+
+
+def lookup_by_revision_id(revision_id, documents, document_filters=None,
+                          **kwargs):
+    """Look up rendered documents for ``revision_id``.
+
+    Rendered documents are cached by :func:`make_cache_key`, so that
+    revisions with identical documents share the same cache entry. If
+    ``[engine] enable_rendered_snapshots`` is set, a snapshot persisted by
+    :func:`save_snapshot` is used before falling back to rendering.
+
+    :param revision_id: Revision ID for which to render documents. Tracked so
+        that its entries can be removed via :func:`invalidate_one`.
     :type revision_id: int
     :param documents: List of raw documents to render.
     :type documents: List[dict]
+    :param document_filters: Filters selecting the documents to render, as
+        accepted by :func:`deckhand.common.utils.deepfilter`. If the entire
+        revision was already rendered, its rendered documents are returned,
+        left to be filtered by the caller. Otherwise only the selected
+        documents are rendered, along with the documents they depend on,
+        and cached separately. These are never persisted as a snapshot.
+    :type document_filters: dict
     :param kwargs: Kwargs to pass to ``render``.
     :returns: Tuple, where first arg is rendered documents and second arg
-        indicates whether cache was hit.
+        indicates whether cache was hit, meaning that the rendered documents
+        were already post-validated.
     :rtype: Tuple[dict, boolean]
 
     """
 
+    if document_filters:
+        rendered_documents = _get_rendered_revision(
+            revision_id, documents, **kwargs)
+        if rendered_documents is not None:
+            return rendered_documents, True
+        kwargs['document_filters'] = document_filters
+
+    cache_key = None
+    if CONF.engine.enable_cache or CONF.engine.enable_rendered_snapshots:
+        cache_key = make_cache_key(documents, **kwargs)
+    from_snapshot = []
+
     def do_render():
         """Perform document rendering for the revision."""
-        document_layering = layering.DocumentLayering(documents, **kwargs)
-        return document_layering.render()
+        # Snapshots are only kept of entire revisions.
+        use_snapshots = (CONF.engine.enable_rendered_snapshots and
+                         not document_filters)
+        if use_snapshots:
+            snapshot = db_api.rendered_documents_get(cache_key)
+            if snapshot is not None:
+                LOG.debug('Using rendered documents snapshot for revision '
+                          '%s.', revision_id)
+                from_snapshot.append(True)
+                return snapshot
 
-    def contains_revision():
+        rendered_documents = render_pool.run(_render, documents, **kwargs)
+
+        # Rendered data can include secrets substituted from encrypted
+        # documents, which must not be persisted.
+        if use_snapshots and not any(dd(d).is_encrypted for d in documents):
+            _pending_snapshot.value = (
+                revision_id, cache_key, rendered_documents)
+        return rendered_documents
+
+    def contains_key(cache_key):
         try:
-            _DOCUMENT_RENDERING_CACHE.get(key=revision_id)
+            rendering_cache.get(key=cache_key)
             return True
         except KeyError:
             return False
 
     if CONF.engine.enable_cache:
-        cache_hit = contains_revision()
-        return _DOCUMENT_RENDERING_CACHE.get(key=revision_id,
-                                             createfunc=do_render), cache_hit
+        rendering_cache = _get_rendering_cache()
+        _add_revision_cache_key(revision_id, cache_key)
+        cache_hit = contains_key(cache_key)
+        rendered_documents = rendering_cache.get(key=cache_key,
+                                                 createfunc=do_render)
     else:
         # The cache is disabled, so this is necessarily false.
-        return do_render(), False
+        cache_hit = False
+        rendered_documents = do_render()
+    # Snapshots are only persisted once post-validated.
+    return rendered_documents, cache_hit or bool(from_snapshot)
+
+
+def save_snapshot(revision_id, rendered_documents):
+    """Persist the post-validated ``rendered_documents`` of ``revision_id``.
+
+    Only has an effect if ``[engine] enable_rendered_snapshots`` is set and
+    ``rendered_documents`` were just rendered by the current thread, for
+    documents none of which are encrypted.
+
+    :param revision_id: Revision ID for which documents were rendered.
+    :type revision_id: int
+    :param rendered_documents: Rendered documents returned by
+        :func:`lookup_by_revision_id`.
+    :type rendered_documents: List[dict]
+    """
+    pending = getattr(_pending_snapshot, 'value', None)
+    _pending_snapshot.value = None
+    if (pending is None or pending[0] != revision_id or
+            pending[2] is not rendered_documents):
+        return
+    db_api.rendered_documents_create(revision_id, pending[1],
+                                     rendered_documents)
 
 
 def invalidate():
     """Invalidate the entire cache."""
-    _DOCUMENT_RENDERING_CACHE.clear()
+    _get_rendering_cache().clear()
+    _RENDER_STATE_CACHE.clear()
+    _REVISION_CACHE_KEYS.clear()
 
 
 def invalidate_one(revision_id):
-    """Invalidate single entry in cache.
+    """Invalidate the entries in cache looked up for ``revision_id``.
 
     :param revision_id: Revision to invalidate.
     :type revision_id: int
 
     """
-    _DOCUMENT_RENDERING_CACHE.remove_value(key=revision_id)
+    _pending_snapshot.value = None
+    rendering_cache = _get_rendering_cache()
+    with _REVISION_CACHE_KEYS_LOCK:
+        try:
+            cache_keys = _REVISION_CACHE_KEYS.get(key=str(revision_id))
+        except KeyError:
+            return
+        _REVISION_CACHE_KEYS.remove_value(key=str(revision_id))
+    for cache_key in cache_keys:
+        rendering_cache.remove_value(key=cache_key)
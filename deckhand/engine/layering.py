@@ -12,19 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import collections
-
+import concurrent.futures
 import copy
+import multiprocessing
+import threading
 
-import networkx
-from networkx.algorithms.cycles import find_cycle
-from networkx.algorithms.dag import topological_sort
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import excutils
 
-from deckhand.common.document import DocumentDict as dd
 from deckhand.common import utils
 from deckhand.common.validation_message import ValidationMessage
+from deckhand.engine._document import Document as dd
+from deckhand.engine import _dependency_graph
 from deckhand.engine import _replacement as replacement
 from deckhand.engine import document_validation
 from deckhand.engine import secrets_manager
@@ -32,8 +32,57 @@ from deckhand.engine import utils as engine_utils
 from deckhand import errors
 from deckhand import types
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+_EXECUTOR_LOCK = threading.Lock()
+_EXECUTOR = None
+# Whether this is one of the executor's worker processes.
+_IN_WORKER = False
+
+
+def _init_worker():
+    global _IN_WORKER
+    _IN_WORKER = True
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # Forking this process, which may have other threads, could
+            # deadlock the workers.
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload([__name__])
+            _EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+                max_workers=CONF.engine.render_workers,
+                mp_context=context, initializer=_init_worker)
+        return _EXECUTOR
+
+
+def _reset_executor(executor):
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is executor:
+            _EXECUTOR = None
+    executor.shutdown(wait=False)
+
+
+def _render_partition(documents, **kwargs):
+    """Render ``documents`` in a worker process.
+
+    :param documents: Documents, along with the layering policy, which are
+        neither layered with nor substituted into any other documents.
+    :param kwargs: Kwargs to pass to ``DocumentLayering``.
+    :returns: Dictionary mapping the ``meta`` of each document to its
+        rendered data. Metadata isn't returned as it is only changed by
+        substitution of encrypted data, which is never rendered in workers.
+    """
+    document_layering = DocumentLayering(documents, validate=False, **kwargs)
+    document_layering.render()
+    return {doc.meta: document_layering._get_rendered_data(doc)
+            for doc in document_layering.documents if not doc.is_control}
+
 
 class DocumentLayering(object):
     """Class responsible for handling document layering.
@@ -51,9 +100,10 @@ class DocumentLayering(object):
         together into a fully rendered document.
     """
 
-    __slots__ = ('_documents_by_index', '_documents_by_labels',
+    __slots__ = ('_dependencies', '_documents_by_index',
                  '_documents_by_layer', '_layer_order', '_layering_policy',
-                 '_parents', '_sorted_documents', 'secrets_substitution')
+                 '_parents', '_previous_render_state', '_render_options',
+                 '_render_state', '_sorted_documents', 'secrets_substitution')
 
     _SUPPORTED_METHODS = (_MERGE_ACTION, _REPLACE_ACTION, _DELETE_ACTION) = (
         'merge', 'replace', 'delete')
@@ -101,80 +151,47 @@ class DocumentLayering(object):
 
         return substitution_source_map
 
-    def _replace_older_parent_with_younger_parent(self, child, parent,
-                                                  all_children):
-        # If child has layer N, parent N+1, and current_parent N+2, then swap
-        # parent with current_parent. In other words, if parent's layer is
-        # closer to child's layer than current_parent's layer, then use parent.
-        parent_meta = self._parents.get(child.meta)
-        current_parent = self._documents_by_index.get(parent_meta, None)
-        if current_parent:
-            if (self._layer_order.index(parent.layer) >
-                    self._layer_order.index(current_parent.layer)):
-                self._parents[child.meta] = parent.meta
-                all_children[child] -= 1
+    def _raise_invalid_parent(self, parent, child):
+        # Documents with different `schema`s are never layered together,
+        # so consider only documents with same schema as candidates.
+        if child.schema != parent.schema:
+            reason = ('Child has parentSelector which references parent, '
+                      'but their `schema`s do not match.')
+        # The highest order is 0, so the parent should be lower than the
+        # child.
         else:
-            self._parents.setdefault(child.meta, parent.meta)
-
-    def _is_actual_child_document(self, document, potential_child):
-        if document == potential_child:
-            return False
-
-        document_layer_idx = self._layer_order.index(document.layer)
-        child_layer_idx = self._layer_order.index(potential_child.layer)
-
-        parent_selector = potential_child.parent_selector
-        labels = document.labels
-        # Labels are key-value pairs which are unhashable, so use ``all``
-        # instead.
-        is_actual_child = all(
-            labels.get(x) == y for x, y in parent_selector.items())
-
-        if is_actual_child:
-            # Documents with different `schema`s are never layered together,
-            # so consider only documents with same schema as candidates.
-            if potential_child.schema != document.schema:
-                reason = ('Child has parentSelector which references parent, '
-                          'but their `schema`s do not match.')
-                LOG.error(reason)
-                raise errors.InvalidDocumentParent(
-                    parent_schema=document.schema, parent_name=document.name,
-                    document_schema=potential_child.schema,
-                    document_name=potential_child.name, reason=reason)
-
-            # The highest order is 0, so the parent should be lower than the
-            # child.
-            if document_layer_idx >= child_layer_idx:
-                reason = ('Child has parentSelector which references parent, '
-                          'but the child layer %s must be lower than the '
-                          'parent layer %s for layerOrder %s.' % (
-                              potential_child.layer, document.layer,
-                              ', '.join(self._layer_order)))
-                LOG.error(reason)
-                raise errors.InvalidDocumentParent(
-                    parent_schema=document.schema, parent_name=document.name,
-                    document_schema=potential_child.schema,
-                    document_name=potential_child.name, reason=reason)
-
-        return is_actual_child
-
-    def _calc_document_children(self, document):
-        potential_children = []
-        for label_key, label_val in document.labels.items():
-            _potential_children = self._documents_by_labels.get(
-                (label_key, label_val), [])
-            potential_children.extend(_potential_children)
-        unique_potential_children = set(potential_children)
-
-        for potential_child in unique_potential_children:
-            if self._is_actual_child_document(document, potential_child):
-                yield potential_child
+            reason = ('Child has parentSelector which references parent, '
+                      'but the child layer %s must be lower than the '
+                      'parent layer %s for layerOrder %s.' % (
+                          child.layer, parent.layer,
+                          ', '.join(self._layer_order)))
+        LOG.error(reason)
+        raise errors.InvalidDocumentParent(
+            parent_schema=parent.schema, parent_name=parent.name,
+            document_schema=child.schema, document_name=child.name,
+            reason=reason)
+
+    def _calc_document_parents(self, parent_selector, parents_by_label):
+        # A document is a parent of the child if its labels include every
+        # key-value pair of the child's ``parentSelector``: so intersect the
+        # documents indexed under each pair, smallest set first.
+        candidate_sets = []
+        for label in parent_selector.items():
+            candidates = parents_by_label.get(label)
+            if not candidates:
+                return []
+            candidate_sets.append(candidates)
+        candidate_sets.sort(key=len)
+        matches = candidate_sets[0].intersection(*candidate_sets[1:])
+        return sorted(matches)
 
     def _calc_all_document_children(self):
-        """Determine each document's children.
+        """Determine each document's parent.
 
-        For each document, attempts to find the document's children. Adds a new
-        key called "children" to the document's dictionary.
+        Documents are indexed by their labels, so that the parents of each
+        document are found by intersecting the documents indexed under each
+        key-value pair of its ``parentSelector``. Populates ``self._parents``,
+        mapping each child document's ``meta`` to its parent's.
 
         .. note::
 
@@ -183,60 +200,83 @@ class DocumentLayering(object):
             If a document does not have a parent, then its layer must be
             the topmost layer defined by the ``layerOrder``.
 
-        :returns: Ordered list of documents that need to be layered. Each
-            document contains a "children" property in addition to original
-            data. List of documents returned is ordered from highest to lowest
-            layer.
-        :rtype: List[:class:`DocumentDict`]
+        :raises InvalidDocumentParent: If a parent and its child have
+            different schemas or the parent isn't in a higher layer.
         :raises IndeterminateDocumentParent: If more than one parent document
             was found for a document.
         """
-        # ``all_children`` is a counter utility for verifying that each
-        # document has exactly one parent.
-        all_children = collections.Counter()
-        # Mapping of (doc.name, doc.metadata.name) => children, where children
-        # are the documents whose `parentSelector` references the doc.
-        self._parents = {}
-
-        for layer in self._layer_order:
-            documents_in_layer = self._documents_by_layer.get(layer, [])
-            for document in documents_in_layer:
-                children = list(self._calc_document_children(document))
-
-                if children:
-                    all_children.update(children)
-
-                for child in children:
-                    self._replace_older_parent_with_younger_parent(
-                        child, document, all_children)
+        layer_ranks = {layer: rank for rank, layer
+                       in enumerate(self._layer_order)}
+
+        # Potential parents as (rank, schema, meta, document), ordered from
+        # highest to lowest layer, and indexed by their position in that
+        # order under each label key-value pair.
+        parents = []
+        parents_by_label = {}
+        for rank, layer in enumerate(self._layer_order):
+            for document in self._documents_by_layer.get(layer, []):
+                for label in document.labels.items():
+                    parents_by_label.setdefault(label, set()).add(
+                        len(parents))
+                parents.append(
+                    (rank, document.schema, document.meta, document))
 
-        all_children_elements = list(all_children.elements())
-        secondary_documents = []
-        for layer, documents in self._documents_by_layer.items():
-            if self._layer_order and layer != self._layer_order[0]:
-                secondary_documents.extend(documents)
+        self._parents = {}
 
-        for doc in secondary_documents:
+        for child in self._documents_by_index.values():
+            parent_selector = child.parent_selector
+            if not parent_selector:
+                continue
+            child_meta = child.meta
+            child_schema, child_layer = child_meta[0], child_meta[1]
+            child_rank = layer_ranks.get(child_layer)
+
+            # Parents are visited from highest to lowest layer: a parent in a
+            # layer closer to the child's layer replaces the current one.
+            # ``found`` counts the parents found for the child, minus those
+            # replaced, and must be exactly 1.
+            parent = None
+            parent_rank = None
+            found = 0
+            for position in self._calc_document_parents(
+                    parent_selector, parents_by_label):
+                rank, schema, meta, candidate = parents[position]
+                if meta == child_meta:
+                    continue
+                if (schema != child_schema or child_rank is None or
+                        rank >= child_rank):
+                    self._raise_invalid_parent(candidate, child)
+                found += 1
+                if parent is None:
+                    parent, parent_rank = meta, rank
+                elif rank > parent_rank:
+                    parent, parent_rank = meta, rank
+                    found -= 1
+
+            if parent is not None:
+                self._parents[child_meta] = parent
+
+            if not child_rank:
+                continue
             # Unless the document is the topmost document in the
             # `layerOrder` of the LayeringPolicy, it should be a child document
             # of another document.
-            if doc not in all_children_elements:
-                if doc.parent_selector:
-                    LOG.debug(
-                        'Could not find parent for document with name=%s, '
-                        'schema=%s, layer=%s, parentSelector=%s.', doc.name,
-                        doc.schema, doc.layer, doc.parent_selector)
+            if parent is None:
+                LOG.debug(
+                    'Could not find parent for document with name=%s, '
+                    'schema=%s, layer=%s, parentSelector=%s.', child.name,
+                    child_schema, child_layer, parent_selector)
             # If the document is a child document of more than 1 parent, then
             # the document has too many parents, which is a validation error.
-            elif all_children[doc] > 1:
+            elif found > 1:
                 LOG.info('%d parent documents were found for child document '
                          'with name=%s, schema=%s, layer=%s, parentSelector=%s'
                          '. Each document must have exactly 1 parent.',
-                         all_children[doc], doc.name, doc.schema, doc.layer,
-                         doc.parent_selector)
+                         found, child.name, child_schema, child_layer,
+                         parent_selector)
                 raise errors.IndeterminateDocumentParent(
-                    name=doc.name, schema=doc.schema, layer=doc.layer,
-                    found=all_children[doc])
+                    name=child.name, schema=child_schema, layer=child_layer,
+                    found=found)
 
     def _get_layering_order(self, layering_policy):
         # Pre-processing stage that removes empty layers from the
@@ -260,8 +300,6 @@ class DocumentLayering(object):
         """Topologically sorts the DAG formed from the documents' layering
         and substitution dependency chain.
         """
-        result = []
-
         def _get_ancestor(doc, parent_meta):
             parent = self._documents_by_index.get(parent_meta)
             # Return the parent's replacement, but if that replacement is the
@@ -274,8 +312,9 @@ class DocumentLayering(object):
                 parent = parent.replaced_by
             return parent
 
-        g = networkx.DiGraph()
+        graph = _dependency_graph.DependencyGraph()
         for document in self._documents_by_index.values():
+            graph.add_node(document.meta)
             if document.parent_selector:
                 # NOTE: A child-replacement depends on its parent-replacement
                 # the same way any child depends on its parent: so that the
@@ -287,7 +326,7 @@ class DocumentLayering(object):
                 parent_meta = self._parents.get(document.meta)
                 ancestor = _get_ancestor(document, parent_meta)
                 if ancestor:
-                    g.add_edge(document.meta, ancestor.meta)
+                    graph.add_dependency(document.meta, ancestor.meta)
 
             for sub in document.substitutions:
                 # Retrieve the correct substitution source using
@@ -298,27 +337,20 @@ class DocumentLayering(object):
                 src = substitution_sources.get(
                     (sub['src']['schema'], sub['src']['name']))
                 if src:
-                    g.add_edge(document.meta, src.meta)
+                    graph.add_dependency(document.meta, src.meta)
 
         try:
-            cycle = find_cycle(g, orientation='reverse')
-        except networkx.exception.NetworkXNoCycle:
-            pass
-        else:
-            LOG.error('Cannot determine substitution order as a dependency '
-                      'cycle exists for the following documents: %s.', cycle)
-            raise errors.SubstitutionDependencyCycle(cycle=cycle)
-
-        sorted_documents = reversed(list(topological_sort(g)))
+            sorted_documents = graph.topological_sort()
+        except errors.SubstitutionDependencyCycle as e:
+            with excutils.save_and_reraise_exception():
+                LOG.error(e.format_message())
 
-        for document_meta in sorted_documents:
-            if document_meta in self._documents_by_index:
-                result.append(self._documents_by_index[document_meta])
-        for document in self._documents_by_index.values():
-            if document not in result:
-                result.append(document)
+        # Kept for incremental rendering, which compares each document's
+        # dependencies against those of the previous render.
+        self._dependencies = graph
 
-        return result
+        return [self._documents_by_index[meta] for meta in sorted_documents
+                if meta in self._documents_by_index]
 
     def _pre_validate_documents(self, documents):
         LOG.debug('%s performing document pre-validation.',
@@ -351,7 +383,8 @@ class DocumentLayering(object):
                  validate=True,
                  fail_on_missing_sub_src=True,
                  encryption_sources=None,
-                 cleartext_secrets=False):
+                 cleartext_secrets=False,
+                 render_state=None):
         """Contructor for ``DocumentLayering``.
 
         :param layering_policy: The document with schema
@@ -375,6 +408,12 @@ class DocumentLayering(object):
         :param cleartext_secrets: Whether to show unencrypted data as
             cleartext.
         :type cleartext_secrets: bool
+        :param render_state: The :attr:`render_state` of a previous render.
+            Documents unaffected by the changes made since then -- judged by
+            their ``data_hash`` and ``metadata_hash`` along with those of
+            their dependencies -- reuse their previously rendered data instead
+            of being rendered again.
+        :type render_state: dict
 
         :raises LayeringPolicyNotFound: If no LayeringPolicy was found among
             list of ``documents``.
@@ -386,10 +425,18 @@ class DocumentLayering(object):
             was found for a document.
         """
         self._documents_by_layer = {}
-        self._documents_by_labels = {}
         self._layering_policy = None
         self._sorted_documents = {}
         self._documents_by_index = {}
+        self._dependencies = _dependency_graph.DependencyGraph()
+        self._previous_render_state = render_state
+        self._render_state = None
+        # Options for rendering documents in other processes. Documents with
+        # encryption sources are always rendered in this one.
+        self._render_options = {
+            'fail_on_missing_sub_src': fail_on_missing_sub_src,
+            'cleartext_secrets': cleartext_secrets,
+        }
 
         # TODO(felipemonteiro): Add a hook for post-validation too.
         if validate:
@@ -433,12 +480,6 @@ class DocumentLayering(object):
                         layering_policy_name=self._layering_policy.name)
                 self._documents_by_layer.setdefault(document.layer, [])
                 self._documents_by_layer[document.layer].append(document)
-            if document.parent_selector:
-                for label_key, label_val in document.parent_selector.items():
-                    self._documents_by_labels.setdefault(
-                        (label_key, label_val), [])
-                    self._documents_by_labels[
-                        (label_key, label_val)].append(document)
 
         self._layer_order = self._get_layering_order(self._layering_policy)
         self._calc_all_document_children()
@@ -459,7 +500,6 @@ class DocumentLayering(object):
             substitution_sources)
 
         del self._documents_by_layer
-        del self._documents_by_labels
 
     def _log_data_for_layering_failure(self, child, parent, action):
         child_data = copy.deepcopy(child.data)
@@ -506,10 +546,6 @@ class DocumentLayering(object):
             raise errors.UnsupportedActionMethod(
                 action=action, document=child_data)
 
-        # Use copy to prevent these data from being updated referentially.
-        overall_data = copy.deepcopy(overall_data)
-        child_data = copy.deepcopy(child_data)
-
         # If None is used, then consider it as a placeholder and coerce the
         # data into a dictionary.
         if overall_data is None:
@@ -517,6 +553,10 @@ class DocumentLayering(object):
         if child_data is None:
             child_data = {}
 
+        # Neither document is modified. Their data is shared by other
+        # documents, so only the part of it the action changes is copied.
+        overall_data = dd(overall_data)
+
         action_path = action['path']
 
         if action_path.startswith('.data'):
@@ -542,7 +582,8 @@ class DocumentLayering(object):
                         parent_name=overall_data.name,
                         action=action)
 
-                engine_utils.deep_delete(from_child, overall_data.data, None)
+                overall_data.data, _ = engine_utils.deep_delete(
+                    from_child, overall_data.data)
 
         elif method == self._MERGE_ACTION:
             from_overall = utils.jsonpath_parse(overall_data.data, action_path)
@@ -565,7 +606,8 @@ class DocumentLayering(object):
             # that of the parent. This applies when the child data is a
             # non-dict, the parent data is a non-dict, or both.
             if all(isinstance(x, dict) for x in (from_overall, from_child)):
-                engine_utils.deep_merge(from_overall, from_child)
+                from_overall = engine_utils.deep_merge(from_overall,
+                                                       from_child)
             else:
                 LOG.info('Child data is type: %s for [%s, %s] %s. Parent data '
                          'is type: %s for [%s, %s] %s. Both must be '
@@ -602,7 +644,230 @@ class DocumentLayering(object):
 
         return overall_data
 
-    def render(self):
+    @staticmethod
+    def _get_fingerprint(document):
+        # Only documents retrieved from the database carry the hashes needed
+        # to recognize them as unchanged between renders.
+        data_hash = document.get('data_hash')
+        metadata_hash = document.get('metadata_hash')
+        if data_hash and metadata_hash:
+            return (data_hash, metadata_hash)
+        return None
+
+    @staticmethod
+    def _get_replaced_by(document):
+        if document.has_replacement:
+            return document.replaced_by.meta
+        return None
+
+    def _calc_reusable_documents(self):
+        """Determine which documents can reuse their previously rendered state.
+
+        A document must be rendered again if it is new, if its data, metadata
+        or dependencies changed, or if any document it depends on must be
+        rendered again. A parent must also be rendered again along with its
+        replacement, as the replacement overwrites the parent's data.
+
+        :returns: Dictionary mapping the ``meta`` of each reusable document to
+            its previously rendered state.
+        """
+        previous = self._previous_render_state
+        layering_policy = self._get_fingerprint(self._layering_policy)
+        if (not previous or layering_policy is None or
+                previous['layering_policy'] != layering_policy):
+            return {}
+
+        reusable = {}
+        for doc in self._sorted_documents:
+            state = previous['documents'].get(doc.meta)
+            dependencies = self._dependencies.dependencies(doc.meta)
+            if (state is None or
+                    state['fingerprint'] != self._get_fingerprint(doc) or
+                    state['dependencies'] != dependencies or
+                    state['replaced_by'] != self._get_replaced_by(doc)):
+                continue
+            # Documents are sorted so that dependencies come first.
+            if all(meta in reusable for meta in dependencies):
+                reusable[doc.meta] = state
+
+        for doc in self._sorted_documents:
+            if doc.is_replacement and doc.meta not in reusable:
+                reusable.pop(self._parents.get(doc.meta), None)
+
+        LOG.debug('Reusing previously rendered data for %d of %d documents.',
+                  len(reusable), len(self._sorted_documents))
+        return reusable
+
+    def _restore_rendered_document(self, doc, state):
+        # Rendered data is never modified in place, so it is shared with the
+        # render state rather than copied. Metadata is not: substitution
+        # redacts it in place.
+        if 'metadata' in state:
+            doc['metadata'] = copy.deepcopy(state['metadata'])
+        doc.data = state['data']
+        if state['index_data'] is None:
+            self._documents_by_index[doc.meta] = doc
+        else:
+            # A replaced parent whose data was overwritten by its replacement.
+            indexed_doc = dd(doc)
+            indexed_doc.data = state['index_data']
+            self._documents_by_index[doc.meta] = indexed_doc
+
+    def _get_rendered_data(self, doc):
+        # The data ``_restore_rendered_document`` needs to restore ``doc``.
+        indexed_doc = self._documents_by_index[doc.meta]
+        if indexed_doc is doc or indexed_doc.data is doc.data:
+            index_data = None
+        else:
+            index_data = indexed_doc.data
+        return {'data': doc.data, 'index_data': index_data}
+
+    def _snapshot_render_state(self, reusable, closure=None):
+        documents = {}
+        previous = self._previous_render_state
+        layering_policy = self._get_fingerprint(self._layering_policy)
+        if (closure is not None and previous and
+                previous['layering_policy'] == layering_policy):
+            # Documents left unrendered keep their previously rendered state,
+            # which is only reused if they are unchanged.
+            documents.update(previous['documents'])
+        # Documents rendered again by this render, along with the unrendered
+        # documents depending on them, whose previous state is thus stale.
+        stale = set()
+        for doc in self._sorted_documents:
+            if doc.is_control:
+                continue
+            if closure is not None and doc.meta not in closure:
+                # Documents are sorted so that dependencies come first.
+                if any(meta in stale for meta in
+                       self._dependencies.dependencies(doc.meta)):
+                    stale.add(doc.meta)
+                    documents.pop(doc.meta, None)
+                continue
+            if doc.meta in reusable:
+                documents[doc.meta] = reusable[doc.meta]
+                continue
+            stale.add(doc.meta)
+            fingerprint = self._get_fingerprint(doc)
+            if fingerprint is None:
+                continue
+            documents[doc.meta] = dict(
+                self._get_rendered_data(doc),
+                metadata=copy.deepcopy(doc.get('metadata')),
+                fingerprint=fingerprint,
+                dependencies=frozenset(
+                    self._dependencies.dependencies(doc.meta)),
+                replaced_by=self._get_replaced_by(doc))
+        return {
+            'layering_policy': layering_policy,
+            'documents': documents,
+        }
+
+    def _calc_partitions(self, reusable, closure=None):
+        """Split the documents left to render into at most ``[engine]
+        render_workers`` partitions to be rendered in other processes.
+
+        Documents layered or substituted into one another -- connected in
+        the dependency graph -- are always in the same partition. Those with
+        encrypted data stay in this process, as their secrets may have to be
+        retrieved from Barbican.
+
+        :param closure: If given, only the documents whose ``meta`` is in it
+            are rendered.
+        :returns: List of partitions, each a list of documents. Empty if the
+            documents should all be rendered in this process.
+        """
+        if _IN_WORKER or not CONF.engine.render_workers:
+            return []
+
+        components = []
+        pending = 0
+        for component in self._dependencies.components():
+            if closure is not None:
+                component = [meta for meta in component if meta in closure]
+            documents = [self._documents_by_index[meta] for meta in component]
+            if any(doc.is_encrypted for doc in documents):
+                continue
+            documents = [doc for doc in documents if not doc.is_control]
+            size = sum(1 for doc in documents if doc.meta not in reusable)
+            if size:
+                components.append((size, documents))
+                pending += size
+
+        if (len(components) < 2 or
+                pending < CONF.engine.render_workers_threshold):
+            return []
+
+        # Balance partitions by assigning the largest components first, each
+        # to the partition with the fewest documents left to render.
+        partitions = [[0, []] for _ in range(
+            min(CONF.engine.render_workers, len(components)))]
+        for size, documents in sorted(
+                components, key=lambda c: c[0], reverse=True):
+            partition = min(partitions, key=lambda p: p[0])
+            partition[0] += size
+            partition[1].extend(documents)
+        return [documents for _, documents in partitions]
+
+    def _render_partitions(self, partitions):
+        """Render ``partitions`` in parallel in other processes.
+
+        :returns: Dictionary mapping the ``meta`` of each rendered document to
+            its rendered data. Empty if the processes died, in which case
+            the documents are left to render in this process.
+        """
+        previous = self._previous_render_state
+        executor = _get_executor()
+        futures = []
+        for documents in partitions:
+            render_state = None
+            if previous:
+                render_state = {
+                    'layering_policy': previous['layering_policy'],
+                    'documents': {
+                        doc.meta: previous['documents'][doc.meta]
+                        for doc in documents
+                        if doc.meta in previous['documents']
+                    },
+                }
+            futures.append(executor.submit(
+                _render_partition,
+                [dict(self._layering_policy)] + [dict(d) for d in documents],
+                render_state=render_state, **self._render_options))
+
+        LOG.debug('Rendering %d documents in %d processes.',
+                  sum(len(p) for p in partitions), len(partitions))
+        rendered = {}
+        try:
+            # Raise the error of the first partition which failed, if any.
+            for future in futures:
+                rendered.update(future.result())
+        except concurrent.futures.process.BrokenProcessPool:
+            LOG.warning('Render worker processes died. Rendering documents '
+                        'in this process instead.', exc_info=True)
+            _reset_executor(executor)
+            return {}
+        return rendered
+
+    def _calc_closure(self, document_filters):
+        """Select the documents matching ``document_filters`` and all those
+        they depend on: their ancestors, substitution sources and, in turn,
+        everything these depend on.
+
+        :returns: Tuple of the selected concrete documents which aren't
+            replaced, and the set of ``meta`` of all documents to render.
+        """
+        targets = [
+            doc for doc in self._sorted_documents
+            if doc.is_abstract is False and doc.has_replacement is False and
+            utils.deepfilter(doc, **document_filters)
+        ]
+        closure = self._dependencies.closure(doc.meta for doc in targets)
+        LOG.debug('Rendering %d of %d documents for %d selected documents.',
+                  len(closure), len(self._sorted_documents), len(targets))
+        return targets, closure
+
+    def render(self, document_filters=None):
         """Perform layering on the list of documents passed to ``__init__``.
 
         Each concrete document will undergo layering according to the actions
@@ -611,6 +876,11 @@ class DocumentLayering(object):
         the child, and its ``metadata.labels`` must much the child's
         ``metadata.layeringDefinition.parentSelector``.
 
+        :param document_filters: Filters, as accepted by
+            :func:`deckhand.common.utils.deepfilter`, selecting the documents
+            to return. If given, only these and the documents they depend on
+            are rendered.
+        :type document_filters: dict
         :returns: The list of concrete rendered documents.
         :rtype: List[dict]
 
@@ -619,11 +889,31 @@ class DocumentLayering(object):
         :raises MissingDocumentKey: If a layering action path isn't found
             in both the parent and child documents being layered together.
         """
+        targets, closure = None, None
+        if document_filters:
+            targets, closure = self._calc_closure(document_filters)
+
+        reusable = self._calc_reusable_documents()
+        partitions = self._calc_partitions(reusable, closure)
+        rendered = self._render_partitions(partitions) if partitions else {}
+
         for doc in self._sorted_documents:
             # Control documents don't need to be layered.
             if doc.is_control:
                 continue
 
+            if closure is not None and doc.meta not in closure:
+                continue
+
+            if doc.meta in reusable:
+                LOG.debug("Reusing rendered document %s:%s:%s", *doc.meta)
+                self._restore_rendered_document(doc, reusable[doc.meta])
+                continue
+
+            if doc.meta in rendered:
+                self._restore_rendered_document(doc, rendered[doc.meta])
+                continue
+
             # Retrieve the encrypted data for the document if its
             # data has been encrypted so that future references use the actual
             # secret payload, rather than the Barbican secret reference.
@@ -707,6 +997,11 @@ class DocumentLayering(object):
             if doc.is_replacement:
                 parent.data = doc.data
 
+        self._render_state = self._snapshot_render_state(reusable, closure)
+
+        if targets is not None:
+            return targets
+
         # Return only concrete documents and non-replacements.
         return [d for d in self._sorted_documents
                 if d.is_abstract is False and d.has_replacement is False]
@@ -714,3 +1009,10 @@ class DocumentLayering(object):
     @property
     def documents(self):
         return self._sorted_documents
+
+    @property
+    def render_state(self):
+        """State of the last :meth:`render`, which can be passed to a later
+        ``DocumentLayering`` to only render documents affected by changes.
+        """
+        return self._render_state
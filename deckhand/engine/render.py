@@ -16,6 +16,7 @@ from oslo_log import log as logging
 
 from deckhand.common import validation_message as vm
 from deckhand.engine import cache
+from deckhand.engine import render_pool
 from deckhand import errors
 
 LOG = logging.getLogger(__name__)
@@ -25,10 +26,12 @@ __all__ = ('render',
 
 
 def render(revision_id, documents, encryption_sources=None,
-           cleartext_secrets=False):
+           cleartext_secrets=False, document_filters=None):
     """Render revision documents for ``revision_id`` using raw ``documents``.
 
-    :param revision_id: Key used for caching rendered documents by.
+    :param revision_id: Revision whose documents are rendered. Rendered
+        documents are cached by a digest of their inputs, so that revisions
+        with identical documents share the same cache entry.
     :type revision_id: int
     :param documents: List of raw documents corresponding to ``revision_id``
         to render.
@@ -40,6 +43,11 @@ def render(revision_id, documents, encryption_sources=None,
     :type encryption_sources: dict
     :param cleartext_secrets: Whether to show unencrypted data as cleartext.
     :type cleartext_secrets: bool
+    :param document_filters: Filters selecting the documents needed, as
+        accepted by :func:`deckhand.common.utils.deepfilter`. Unless the
+        entire revision was already rendered, only these documents and the
+        documents they depend on are rendered.
+    :type document_filters: dict
     :returns: Rendered documents for ``revision_id``.
     :rtype: List[dict]
 
@@ -53,13 +61,15 @@ def render(revision_id, documents, encryption_sources=None,
         documents,
         encryption_sources=encryption_sources,
         validate=False,
-        cleartext_secrets=cleartext_secrets)
+        cleartext_secrets=cleartext_secrets,
+        document_filters=document_filters)
 
 
 def validate_render(revision_id, rendered_documents, validator):
     """Validate rendered documents using ``validator``.
 
-    :param revision_id: Key used for caching rendered documents by.
+    :param revision_id: Revision whose cached rendered documents are
+        invalidated if validation fails.
     :type revision_id: int
     :param documents: List of rendered documents corresponding to
         ``revision_id``.
@@ -74,7 +84,7 @@ def validate_render(revision_id, rendered_documents, validator):
     # Perform schema validation post-rendering to ensure that rendering
     # and substitution didn't break anything.
     try:
-        validations = validator.validate_all()
+        validations = render_pool.run(validator.validate_all)
     except errors.InvalidDocumentFormat as e:
         # Invalidate cache entry so that future lookups also fail.
         cache.invalidate_one(revision_id)
@@ -115,3 +125,5 @@ def validate_render(revision_id, rendered_documents, validator):
             error_list=error_list,
             reason='Validation',
         )
+
+    cache.save_snapshot(revision_id, rendered_documents)
@@ -0,0 +1,186 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run the CPU-bound jobs of API requests in worker processes.
+
+Rendering a large revision holds the GIL for as long as it takes, starving
+the API worker's other threads, health checks included. If
+``[engine] render_pool_workers`` is set, :func:`run` runs such jobs --
+rendering, post-validation and deep diffing -- in a pool of processes
+instead. At most ``[engine] render_pool_queue_size`` jobs wait for a free
+process: further jobs are rejected with
+:class:`~deckhand.errors.RenderPoolFull` rather than left to wait until the
+request times out.
+"""
+
+import concurrent.futures
+import math
+import multiprocessing
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from deckhand import errors
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+# Groups of options which affect the jobs, copied to the worker processes as
+# they don't load the configuration themselves.
+_WORKER_CONF_GROUPS = ('engine', 'jsonpath')
+# Weight of the latest job in the moving averages of wait and run times.
+_SMOOTHING = 0.2
+
+_LOCK = threading.Lock()
+_EXECUTOR = None
+# Whether this is one of the pool's worker processes.
+_IN_WORKER = False
+# Number of jobs submitted and not yet finished.
+_depth = 0
+_stats = {
+    'jobs': 0,
+    'rejected': 0,
+    'wait_time': 0.0,
+    'run_time': 0.0,
+}
+
+
+def _init_worker(conf_overrides):
+    global _IN_WORKER
+    _IN_WORKER = True
+    for group, options in conf_overrides.items():
+        for name, value in options.items():
+            CONF.set_override(name, value, group=group)
+    # Jobs render in the worker itself: each worker starting its own
+    # ``render_workers`` processes would escape the admission control.
+    CONF.set_override('render_workers', 0, group='engine')
+
+
+def _get_executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        conf_overrides = {group: dict(CONF[group])
+                          for group in _WORKER_CONF_GROUPS}
+        # Forking this process, which has other threads, could deadlock the
+        # workers.
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        _EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+            max_workers=CONF.engine.render_pool_workers,
+            mp_context=context, initializer=_init_worker,
+            initargs=(conf_overrides,))
+    return _EXECUTOR
+
+
+def _reset_executor(executor):
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is executor:
+            _EXECUTOR = None
+    executor.shutdown(wait=False)
+
+
+def _call(func, args, kwargs):
+    # Runs in a worker process. Exceptions are returned rather than raised so
+    # that the start time is returned either way.
+    started = time.time()
+    try:
+        return started, func(*args, **kwargs), None
+    except Exception as e:
+        return started, None, e
+
+
+def _average(average, value):
+    return average + _SMOOTHING * (value - average)
+
+
+def _estimate_retry_after():
+    # Time for the jobs ahead in the queue to start, assuming they take as
+    # long as recent ones.
+    queued = _depth - CONF.engine.render_pool_workers + 1
+    return max(1, int(math.ceil(
+        _stats['run_time'] * queued / CONF.engine.render_pool_workers)))
+
+
+def run(func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` in the render pool.
+
+    Runs it in the current thread if the render pool is disabled. Renders
+    run in the pool don't use ``[engine] render_workers``, which only
+    applies to renders run in the API worker itself.
+
+    :param func: Function to run, which must be picklable: e.g. a
+        module-level function or a method of a picklable object.
+    :param args: Positional arguments to pass to ``func``.
+    :param kwargs: Keyword arguments to pass to ``func``.
+    :returns: What ``func`` returns.
+    :raises RenderPoolFull: If too many jobs are waiting for the pool.
+    """
+    global _depth
+
+    if not CONF.engine.render_pool_workers or _IN_WORKER:
+        return func(*args, **kwargs)
+
+    with _LOCK:
+        if _depth >= (CONF.engine.render_pool_workers +
+                      CONF.engine.render_pool_queue_size):
+            _stats['rejected'] += 1
+            retry_after = _estimate_retry_after()
+            LOG.warning('Rejecting render job as %d jobs are pending. '
+                        'Retry after %d seconds.', _depth, retry_after)
+            raise errors.RenderPoolFull(retry_after=retry_after)
+        _depth += 1
+        executor = _get_executor()
+
+    submitted = time.time()
+    try:
+        started, result, error = executor.submit(
+            _call, func, args, kwargs).result()
+    except concurrent.futures.process.BrokenProcessPool:
+        LOG.warning('Render pool processes died. Running render job in this '
+                    'process instead.', exc_info=True)
+        _reset_executor(executor)
+        return func(*args, **kwargs)
+    finally:
+        with _LOCK:
+            _depth -= 1
+
+    finished = time.time()
+    with _LOCK:
+        _stats['jobs'] += 1
+        _stats['wait_time'] = _average(
+            _stats['wait_time'], max(0.0, started - submitted))
+        _stats['run_time'] = _average(_stats['run_time'], finished - started)
+    LOG.debug('Render job waited %.3fs and ran for %.3fs.',
+              started - submitted, finished - started)
+
+    if error is not None:
+        raise error
+    return result
+
+
+def get_stats():
+    """Return statistics about the render pool of this API worker.
+
+    :returns: Dictionary with the number of jobs pending (``depth``), the
+        number of jobs run and rejected since startup (``jobs`` and
+        ``rejected``), and moving averages of the time recent jobs waited for
+        a free process and took to run, in seconds (``wait_time`` and
+        ``run_time``).
+    :rtype: dict
+    """
+    with _LOCK:
+        return dict(_stats, depth=_depth)
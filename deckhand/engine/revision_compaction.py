@@ -0,0 +1,82 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import gzip
+import os
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils as json
+from oslo_utils import timeutils
+
+from deckhand.conf import config
+from deckhand.db.sqlalchemy import api as db_api
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+
+def archive_revisions(revisions, archive_dir):
+    """Archive ``revisions`` to a gzip-compressed JSON Lines file.
+
+    Each line holds one revision along with all of its documents. The file
+    only appears under its final name once it has been completely written.
+
+    :param revisions: Iterable of revisions to archive.
+    :param archive_dir: Directory in which to create the archive.
+    :returns: Path to the archive.
+    """
+    if not os.path.isdir(archive_dir):
+        os.makedirs(archive_dir)
+
+    path = os.path.join(archive_dir, 'revisions-%s.jsonl.gz' % (
+        timeutils.utcnow().strftime('%Y%m%dT%H%M%S%f')))
+    partial_path = path + '.partial'
+
+    with gzip.open(partial_path, 'wt') as f:
+        for revision in revisions:
+            f.write(json.dumps(revision))
+            f.write('\n')
+    os.rename(partial_path, path)
+
+    LOG.info('Archived revisions to %s.', path)
+    return path
+
+
+def compact_revisions(retention_days=None, archive_dir=None):
+    """Remove revisions older than the retention window from the history.
+
+    Tagged revisions, revisions with validations and the latest revision are
+    always kept. The removed revisions are archived before being removed.
+
+    :param retention_days: How long (in days) revisions are retained.
+        Defaults to ``[compaction] retention_days``.
+    :param archive_dir: Directory in which to archive removed revisions.
+        Defaults to ``[compaction] archive_dir``.
+    :returns: Dictionary with the IDs of the removed ``revisions`` and the
+        path to their ``archive``, if any.
+    """
+    if retention_days is None:
+        retention_days = CONF.compaction.retention_days
+    if archive_dir is None:
+        archive_dir = CONF.compaction.archive_dir
+
+    older_than = timeutils.utcnow() - datetime.timedelta(days=retention_days)
+    result = {'revisions': [], 'archive': None}
+
+    def archive(revisions):
+        result['archive'] = archive_revisions(revisions, archive_dir)
+
+    result['revisions'] = db_api.revisions_compact(older_than, archive=archive)
+    return result
@@ -19,6 +19,7 @@ import six
 
 from deckhand.control import common
 from deckhand.db.sqlalchemy import api as db_api
+from deckhand.engine import render_pool
 from deckhand.engine import utils
 from deckhand import errors
 
@@ -166,8 +167,9 @@ def revision_diff(revision_id, comparison_revision_id, deepdiff=False):
             result[bucket_name] = 'modified'
             # If deepdiff is enabled, find out diff between buckets
             if deepdiff:
-                bucket_diff = _diff_buckets(buckets[bucket_name],
-                                            comparison_buckets[bucket_name])
+                bucket_diff = render_pool.run(
+                    _diff_buckets, buckets[bucket_name],
+                    comparison_buckets[bucket_name])
                 result[bucket_name + ' diff'] = bucket_diff
 
     for bucket_name in unshared_buckets:
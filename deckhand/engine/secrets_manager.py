@@ -116,7 +116,7 @@ class SecretsSubstitution(object):
     """Class for document substitution logic for YAML files."""
 
     __slots__ = ('_fail_on_missing_sub_src', '_substitution_sources',
-                 '_encryption_sources', '_cleartext_secrets')
+                 '_encryption_sources', '_cleartext_secrets', '_source_values')
 
     _insecure_reg_exps = (
         re.compile(r'^.* is not of type .+$'),
@@ -202,6 +202,9 @@ class SecretsSubstitution(object):
         self._encryption_sources = encryption_sources or {}
         self._fail_on_missing_sub_src = fail_on_missing_sub_src
         self._cleartext_secrets = cleartext_secrets
+        # Values extracted from substitution sources, keyed by the source's
+        # (schema, name) and then by path. Dropped when the source changes.
+        self._source_values = {}
 
         if isinstance(substitution_sources, dict):
             self._substitution_sources = substitution_sources
@@ -241,10 +244,27 @@ class SecretsSubstitution(object):
                             src_doc.name, dest_doc.schema, dest_doc.layer,
                             dest_doc.name)
 
+    def _get_source_value(self, src_doc, src_path):
+        values = self._source_values.setdefault(
+            (src_doc.schema, src_doc.name), {})
+        try:
+            return values[src_path]
+        except KeyError:
+            pass
+        # If the data is a dictionary, retrieve the nested secret via
+        # jsonpath_parse, else the secret is the primitive/string stored in
+        # the data section itself.
+        if isinstance(src_doc.get('data'), dict):
+            value = utils.jsonpath_parse(src_doc.get('data', {}), src_path)
+        else:
+            value = src_doc.get('data')
+        values[src_path] = value
+        return value
+
     def _substitute_one(self, document, src_doc, src_secret, dest_path,
                         dest_pattern, dest_recurse=None,
                         src_pattern=None, src_match_group=0,
-                        src_deepcopy=None):
+                        src_deepcopy=None, owned=None):
         dest_recurse = dest_recurse or {}
         exc_message = ''
         try:
@@ -252,8 +272,11 @@ class SecretsSubstitution(object):
                 document.data, src_secret, dest_path,
                 pattern=dest_pattern, recurse=dest_recurse,
                 src_pattern=src_pattern, src_match_group=src_match_group,
-                src_deepcopy=src_deepcopy)
-            if (isinstance(document.data, dict) and
+                src_deepcopy=src_deepcopy, owned=owned)
+            if substituted_data is document.data:
+                # Updated in place, as its containers are owned.
+                pass
+            elif (isinstance(document.data, dict) and
                     isinstance(substituted_data, dict)):
                 document.data.update(substituted_data)
             elif substituted_data:
@@ -320,6 +343,12 @@ class SecretsSubstitution(object):
             redact_dest = False
             LOG.debug('Checking for substitutions for document [%s, %s] %s.',
                       *document.meta)
+            # The containers of the document's data copied by one
+            # substitution are updated in place by the next ones, rather
+            # than copied again. The data itself is updated in place anyway.
+            owned = {}
+            if isinstance(document.data, dict):
+                owned[id(document.data)] = document.data
             for sub in document.substitutions:
                 src_schema = sub['src']['schema']
                 src_name = sub['src']['name']
@@ -348,14 +377,13 @@ class SecretsSubstitution(object):
                 if src_doc.is_encrypted:
                     redact_dest = True
 
-                # If the data is a dictionary, retrieve the nested secret
-                # via jsonpath_parse, else the secret is the primitive/string
-                # stored in the data section itself.
-                if isinstance(src_doc.get('data'), dict):
-                    src_secret = utils.jsonpath_parse(src_doc.get('data', {}),
-                                                      src_path)
-                else:
-                    src_secret = src_doc.get('data')
+                if src_doc.get('data') is document.data:
+                    # The document is its own source, so neither its values
+                    # nor its containers may be reused from here on.
+                    self._source_values.pop((src_schema, src_name), None)
+                    owned = {id(document.data): document.data}
+
+                src_secret = self._get_source_value(src_doc, src_path)
 
                 self._check_src_secret_is_not_none(src_secret, src_path,
                                                    src_doc, document)
@@ -403,7 +431,8 @@ class SecretsSubstitution(object):
                         src_deepcopy=src_deepcopy,
                         dest_path=dest_path,
                         dest_pattern=dest_pattern,
-                        dest_recurse=dest_recurse)
+                        dest_recurse=dest_recurse,
+                        owned=owned)
 
             # If we just substituted from an encrypted document
             # into a cleartext document, we need to redact the
@@ -412,6 +441,9 @@ class SecretsSubstitution(object):
                     self._cleartext_secrets):
                 document.storage_policy = 'encrypted'
 
+            # The document may be the source of later substitutions.
+            self._source_values.pop((document.schema, document.name), None)
+
         yield document
 
     def update_substitution_sources(self, meta, data):
@@ -432,6 +464,7 @@ class SecretsSubstitution(object):
 
         if (schema, name) not in self._substitution_sources:
             return
+        self._source_values.pop((schema, name), None)
 
         # Substitution sources only use schema/name which doesn't uniquely
         # identify replacement documents. The check below ensures that the
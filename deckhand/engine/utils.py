@@ -27,53 +27,61 @@ def deep_merge(dct, merge_dct):
     ``dct``, except for merge conflicts, which are resolved by prioritizing
     the ``dct`` value.
 
+    Neither dict is modified: only the dicts of ``dct`` that the merge updates
+    are copied, while the rest of ``dct`` and the values of ``merge_dct`` are
+    shared with the result.
+
     Borrowed from: https://gist.github.com/angstwad/bf22d1822c38a92ec0a9#file-deep_merge-py # noqa
 
     :param dct: dict onto which the merge is executed
     :param merge_dct: dct merged into dct
-    :return: None
+    :return: The merged dict.
     """
+    merged = dict(dct)
     for k, v in merge_dct.items():
-        if (k in dct and isinstance(dct[k], dict) and
-                isinstance(merge_dct[k], Mapping)):
-            deep_merge(dct[k], merge_dct[k])
+        if (k in merged and isinstance(merged[k], dict) and
+                isinstance(v, Mapping)):
+            merged[k] = deep_merge(merged[k], v)
         else:
-            dct[k] = merge_dct[k]
+            merged[k] = v
+    return merged
+
 
+def deep_delete(target, value):
+    """Recursively search for then delete ``target`` from ``value``.
 
-def deep_delete(target, value, parent):
-    """Recursively search for then delete ``target`` from ``parent``.
+    ``value`` isn't modified: only the lists and dicts leading to ``target``
+    are copied, while the rest is shared with the result.
 
     :param target: Target value to remove.
-    :param value: Current value in a list or dict to compare against
-        ``target`` and removed from ``parent`` given match.
-    :param parent: Tracks the parent data structure from which ``value``
-        is removed.
-    :type parent: list or dict
-    :returns: Whether ``target`` was found.
-    :rtype: bool
+    :param value: List or dict to search for ``target``.
+    :type value: list or dict
+    :returns: Tuple of ``value`` without ``target`` and whether ``target``
+        was found.
+    :rtype: tuple
     """
 
-    if value == target:
-        if isinstance(parent, list):
-            parent.remove(value)
-            return True
-        elif isinstance(parent, dict):
-            for k, v in parent.items():
-                if v == value:
-                    parent.pop(k)
-                    return True
-    elif isinstance(value, list):
-        for v in value:
-            found = deep_delete(target, v, value)
+    if isinstance(value, list):
+        for idx, v in enumerate(value):
+            if v == target:
+                return value[:idx] + value[idx + 1:], True
+            result, found = deep_delete(target, v)
             if found:
-                return True
+                value = list(value)
+                value[idx] = result
+                return value, True
     elif isinstance(value, dict):
-        for v in value.values():
-            found = deep_delete(target, v, value)
+        for k, v in value.items():
+            if v == target:
+                value = dict(value)
+                value.pop(k)
+                return value, True
+            result, found = deep_delete(target, v)
             if found:
-                return True
-    return False
+                value = dict(value)
+                value[k] = result
+                return value, True
+    return value, False
 
 
 def deep_scrub(value, parent):
@@ -97,8 +97,8 @@ def format_error_resp(req,
         },
         'code': status_code,
         # TODO(fmontei): Make this class-specific later. For now, retry
-        # is set to True only for internal server errors.
-        'retry': True if status_code is falcon.HTTP_500 else False
+        # is set to True only for internal server errors and unavailability.
+        'retry': status_code in (falcon.HTTP_500, falcon.HTTP_503)
     }
 
     resp.status = status_code
@@ -118,6 +118,8 @@ def default_exception_handler(req, resp, ex, params):
         status_code = (getattr(falcon, 'HTTP_%d' % ex.code, falcon.HTTP_500)
                        if hasattr(ex, 'code') else falcon.HTTP_500)
 
+        if getattr(ex, 'retry_after', None) is not None:
+            resp.set_header('Retry-After', six.text_type(ex.retry_after))
         format_error_resp(
             req,
             resp,
@@ -484,6 +486,25 @@ class DeepDiffException(DeckhandException):
     code = 500
 
 
+class RenderPoolFull(DeckhandException):
+    """Too many jobs are waiting for the render pool.
+
+    **Troubleshoot:**
+
+    * Retry the request after the number of seconds given by its
+      ``Retry-After`` header.
+    * Increase ``[engine] render_pool_workers`` or
+      ``[engine] render_pool_queue_size``.
+    """
+    msg_fmt = ("Too many render jobs are pending. Retry after "
+               "%(retry_after)s seconds")
+    code = 503
+
+    def __init__(self, message=None, **kwargs):
+        self.retry_after = kwargs.get('retry_after')
+        super(RenderPoolFull, self).__init__(message, **kwargs)
+
+
 class UnknownSubstitutionError(DeckhandException):
     """An unknown error occurred during substitution.
 
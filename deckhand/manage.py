@@ -0,0 +1,82 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Administrative commands for Deckhand.
+
+Usage::
+
+    deckhand-manage --config-file /etc/deckhand/deckhand.conf \\
+        compact-revisions [--retention-days DAYS] [--archive-dir DIR]
+"""
+
+import os
+import sys
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from deckhand.common import utils
+from deckhand.conf import config
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand.engine import revision_compaction
+
+CONF = config.CONF
+LOG = logging.getLogger(__name__)
+
+
+def compact_revisions():
+    result = revision_compaction.compact_revisions(
+        retention_days=CONF.command.retention_days,
+        archive_dir=CONF.command.archive_dir)
+    print(utils.safe_yaml_dump(result), end='')
+
+
+def add_command_parsers(subparsers):
+    parser = subparsers.add_parser(
+        'compact-revisions',
+        help='Remove revisions older than the retention window that are '
+             'neither tagged nor validated, after archiving them.')
+    parser.add_argument('--retention-days', type=int,
+                        help='Overrides [compaction] retention_days.')
+    parser.add_argument('--archive-dir',
+                        help='Overrides [compaction] archive_dir.')
+    parser.set_defaults(func=compact_revisions)
+
+
+command_opt = cfg.SubCommandOpt('command',
+                                title='Commands',
+                                help='Available commands',
+                                handler=add_command_parsers)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    logging.register_options(CONF)
+    CONF.register_cli_opt(command_opt)
+    config_file = os.path.join(
+        os.environ.get('DECKHAND_CONFIG_DIR', '/etc/deckhand').strip(),
+        'deckhand.conf')
+    CONF(argv, project='deckhand',
+         default_config_files=(
+             [config_file] if os.path.exists(config_file) else []))
+    logging.setup(CONF, 'deckhand')
+
+    db_api.setup_db(CONF.database.connection)
+    CONF.command.func()
+
+
+if __name__ == '__main__':
+    main()
@@ -49,6 +49,17 @@ database.""",
                 'path': '/api/v1.0/revisions'
             }
         ]),
+    policy.DocumentedRuleDefault(
+        base.POLICY_ROOT % 'compact_revisions',
+        base.RULE_ADMIN_API,
+        """Remove revisions older than the retention window that are neither
+tagged nor validated, after archiving them.""",
+        [
+            {
+                'method': 'POST',
+                'path': '/api/v1.0/compact'
+            }
+        ]),
     policy.DocumentedRuleDefault(
         base.POLICY_ROOT % 'show_revision_deepdiff',
         base.RULE_ADMIN_API,
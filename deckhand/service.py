@@ -21,6 +21,7 @@ from werkzeug.middleware.profiler import ProfilerMiddleware
 
 from deckhand.control import base
 from deckhand.control import buckets
+from deckhand.control import compaction
 from deckhand.control import health
 from deckhand.control import middleware
 from deckhand.control import revision_deepdiffing
@@ -41,6 +42,7 @@ def configure_app(app, version=''):
 
     v1_0_routes = [
         ('buckets/{bucket_name}/documents', buckets.BucketsResource()),
+        ('compact', compaction.CompactionResource()),
         ('health', health.HealthResource()),
         ('revisions', revisions.RevisionsResource()),
         ('revisions/{revision_id}', revisions.RevisionsResource()),
@@ -83,8 +85,12 @@ def configure_app(app, version=''):
 def deckhand_app_factory(global_config, **local_config):
     # The order of the middleware is important because the `process_response`
     # method for `YAMLTranslator` should execute after that of any other
-    # middleware to convert the response to YAML format.
+    # middleware to convert the response to YAML format. Likewise, that of
+    # `PreRenderMiddleware` should execute after the request's transaction is
+    # committed by `DatabaseSessionMiddleware`.
     middleware_list = [middleware.YAMLTranslator(),
+                       middleware.PreRenderMiddleware(),
+                       middleware.DatabaseSessionMiddleware(),
                        middleware.ContextMiddleware(),
                        middleware.LoggingMiddleware()]
 
@@ -48,6 +48,9 @@ class DeckhandTestCase(testtools.TestCase):
             api_endpoint='http://127.0.0.1/key-manager', group='barbican'))
         self.useFixture(dh_fixtures.ConfPatcher(
             development_mode=True, group=None))
+        # Background renders would outlive the test's database.
+        self.useFixture(dh_fixtures.ConfPatcher(
+            prerender_workers=0, group='engine'))
 
     def tearDown(self):
         # Clear the cache between tests.
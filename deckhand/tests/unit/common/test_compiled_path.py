@@ -0,0 +1,112 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import jsonpath_ng
+from unittest import mock
+
+from deckhand.common import compiled_path
+from deckhand.common import utils
+from deckhand.tests.unit import base as test_base
+
+
+class TestCompiledPath(test_base.DeckhandTestCase):
+
+    data = {
+        'a': {'b': [{'c': 1}, {'c': 2}], 'd.e': 'f', 'none': None},
+        'g': [[1, 2], [3]],
+        'h': 'str',
+    }
+
+    def test_parse_unsupported_paths(self):
+        for path in ('$..c', '$.a[?c]', '$.a.b[0:1]', '$.a.where',
+                     "$.'a\\'b'", '$.a b', '$.', '$.a[-1]'):
+            self.assertIsNone(compiled_path.parse(path), path)
+
+    def test_find_matches_jsonpath_ng(self):
+        for path in ('$', 'a', '$.a.b', '$.a.b[1].c', '$.a.b[*].c',
+                     "$.a.'d.e'", '$.a."d.e"', '$.g[0][1]', '$.g[*][*]',
+                     '$.g[5]', '$.a.none[*]', '$.a[*]', '$.h[*]', '$.h[1]',
+                     '$.h.c', '$.missing.c', '$.a.b.c'):
+            expected = [m.value for m in jsonpath_ng.parse(path).find(
+                self.data)]
+            self.assertEqual(
+                expected, compiled_path.parse(path).find(self.data), path)
+
+    def test_update_copies_only_path(self):
+        data = copy.deepcopy(self.data)
+        expected = copy.deepcopy(self.data)
+        expected['a']['b'][1]['c'] = 3
+
+        result = compiled_path.parse('$.a.b[1].c').update(
+            data, lambda value: value + 1)
+
+        self.assertEqual(expected, result)
+        self.assertEqual(self.data, data)
+        self.assertIsNot(data['a']['b'], result['a']['b'])
+        self.assertIs(data['a']['b'][0], result['a']['b'][0])
+        self.assertIs(data['g'], result['g'])
+
+    def test_update_creates_missing_path(self):
+        result = compiled_path.parse('$.x[1].y[0][1]').update(
+            {}, lambda value: (value, 'new'))
+        self.assertEqual({'x': [{}, {'y': [[{}, ({}, 'new')]]}]}, result)
+
+    def test_update_owned_containers_in_place(self):
+        data = copy.deepcopy(self.data)
+        owned = {id(data): data}
+
+        first = compiled_path.parse('$.a.b[1].c').update(
+            data, lambda value: value + 1, owned=owned)
+        b = first['a']['b']
+        second = compiled_path.parse('$.a.b[0]').update(
+            first, lambda value: 'new', owned=owned)
+
+        self.assertIs(data, first)
+        self.assertIs(data, second)
+        self.assertIs(b, second['a']['b'])
+        self.assertEqual(['new', {'c': 3}], second['a']['b'])
+        self.assertEqual(2, self.data['a']['b'][1]['c'])
+        self.assertIn(id(b), owned)
+
+    def test_update_unsupported(self):
+        for path in ('$.a.b[*].c', '$.h.c', '$.a[0]'):
+            self.assertRaises(
+                compiled_path.UnsupportedUpdate,
+                compiled_path.parse(path).update, self.data, lambda v: v)
+
+
+class TestJSONPathFallback(test_base.DeckhandTestCase):
+
+    def test_compiled_paths_skip_jsonpath_ng(self):
+        data = {'values': {'endpoints': [{'admin': 'foo'}]}}
+        with mock.patch.object(utils, 'jsonpath_ng',  # noqa: H210
+                               autospec=True) as mock_jsonpath_ng:
+            path = '.values.endpoints[0].admin'
+            self.assertEqual('foo', utils.jsonpath_parse(data, path))
+            result = utils.jsonpath_replace(data, 'bar', path)
+        self.assertEqual({'values': {'endpoints': [{'admin': 'bar'}]}},
+                         result)
+        mock_jsonpath_ng.parse.assert_not_called()
+
+    def test_jsonpath_parse_falls_back_to_jsonpath_ng(self):
+        data = {'a': {'admin': 'foo'}, 'b': [{'admin': 'bar'}]}
+        self.assertEqual(['foo', 'bar'],
+                         utils.jsonpath_parse(data, '$..admin', True))
+
+    def test_jsonpath_replace_falls_back_to_jsonpath_ng(self):
+        data = {'a': [{'b': 'foo'}, {'b': 'bar'}]}
+        result = utils.jsonpath_replace(data, 'baz', '.a[*].b')
+        self.assertEqual({'a': [{'b': 'baz'}, {'b': 'baz'}]}, result)
+        self.assertEqual({'a': [{'b': 'foo'}, {'b': 'bar'}]}, data)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import hashlib
 import jsonpath_ng
 from unittest import mock
@@ -270,6 +271,30 @@ class TestJSONPathReplace(test_base.DeckhandTestCase):
         src['images']['image'] = 'repo.com/image:v4.5.6'
         self.assertEqual(expected, result)
 
+    def test_jsonpath_replace_copies_only_path(self):
+        body = {"values": {"endpoints": [{"admin": "foo"}],
+                           "images": {"image": "bar"}},
+                "other": {"key": "baz"}}
+        expected = copy.deepcopy(body)
+        for path, pattern, recurse in ((".values.endpoints[0].admin", None,
+                                        None),
+                                       (".values.endpoints[1].admin", None,
+                                        None),
+                                       (".values.endpoints", "foo",
+                                        {'depth': -1}),
+                                       (".values.new.key", None, None),
+                                       (".'values'.endpoints", None, None)):
+            result = utils.jsonpath_replace(body, "YES", jsonpath=path,
+                                            pattern=pattern, recurse=recurse)
+            self.assertEqual(expected, body)
+            self.assertNotEqual(body, result)
+
+        # Data outside of the path is shared rather than copied.
+        result = utils.jsonpath_replace(body, "YES",
+                                        jsonpath=".values.endpoints")
+        self.assertIs(body['other'], result['other'])
+        self.assertIs(body['values']['images'], result['values']['images'])
+
 
 class TestJSONPathReplaceNegative(test_base.DeckhandTestCase):
     """Validate JSONPath replace negative scenarios."""
@@ -0,0 +1,81 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import fixtures
+import yaml
+
+from deckhand import factories
+from deckhand.tests import test_utils
+from deckhand.tests.unit.control import base as test_base
+
+
+class TestCompactionController(test_base.BaseControllerTest):
+    """Test basic scenarios for the ``CompactionResource`` controller."""
+
+    def test_compact_revisions(self):
+        rules = {'deckhand:create_cleartext_documents': '@',
+                 'deckhand:compact_revisions': '@',
+                 'deckhand:list_revisions': '@'}
+        self.policy.set_rules(rules)
+        archive_dir = self.useFixture(fixtures.TempDir()).path
+        self.override_config('archive_dir', archive_dir, group='compaction')
+
+        payload = factories.DocumentFactory(1, [1]).gen_test({})
+        for _ in range(3):
+            payload[-1]['data'] = test_utils.rand_name('data')
+            resp = self.app.simulate_put(
+                '/api/v1.0/buckets/mop/documents',
+                headers={'Content-Type': 'application/x-yaml'},
+                body=yaml.safe_dump_all(payload))
+            self.assertEqual(200, resp.status_code)
+
+        resp = self.app.simulate_post(
+            '/api/v1.0/compact', params={'retention_days': 0},
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        body = yaml.safe_load(resp.text)
+        self.assertEqual([1, 2], body['revisions'])
+        self.assertEqual(archive_dir, os.path.dirname(body['archive']))
+
+        resp = self.app.simulate_get(
+            '/api/v1.0/revisions',
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, yaml.safe_load(resp.text)['count'])
+
+    def test_compact_revisions_invalid_retention_days(self):
+        rules = {'deckhand:compact_revisions': '@'}
+        self.policy.set_rules(rules)
+
+        resp = self.app.simulate_post(
+            '/api/v1.0/compact', params={'retention_days': -1},
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(400, resp.status_code)
+
+
+class TestCompactionControllerNegativeRBAC(test_base.BaseControllerTest):
+    """Test suite for validating negative RBAC scenarios for compaction
+    controller.
+    """
+
+    def test_compact_revisions_except_forbidden(self):
+        rules = {'deckhand:compact_revisions': 'rule:admin_api'}
+        self.policy.set_rules(rules)
+
+        resp = self.app.simulate_post(
+            '/api/v1.0/compact',
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(403, resp.status_code)
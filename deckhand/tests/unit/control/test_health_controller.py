@@ -21,3 +21,5 @@ class TestHealthController(test_base.BaseControllerTest):
         resp = self.app.simulate_get(
             '/api/v1.0/health', headers={'Content-Type': 'application/x-yaml'})
         self.assertEqual(204, resp.status_code)
+        self.assertEqual('0', resp.headers['X-Deckhand-Render-Queue-Depth'])
+        self.assertIn('X-Deckhand-Render-Queue-Wait', resp.headers)
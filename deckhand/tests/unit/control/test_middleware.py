@@ -16,6 +16,9 @@ import yaml
 
 from unittest import mock
 
+from deckhand.control.views import document as document_view
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand import errors
 from deckhand import factories
 from deckhand.tests.unit.control import base as test_base
 
@@ -198,3 +201,39 @@ class TestYAMLTranslatorNegative(test_base.BaseControllerTest):
             'status': 'Failure'
         }
         self.assertEqual(expected, yaml.safe_load(resp.content))
+
+
+class TestDatabaseSessionMiddleware(test_base.BaseControllerTest):
+
+    def _put_documents(self):
+        documents_factory = factories.DocumentFactory(1, [1])
+        document = documents_factory.gen_test({})[-1]
+
+        return self.app.simulate_put(
+            '/api/v1.0/buckets/b1/documents',
+            headers={'Content-Type': 'application/x-yaml'},
+            body=yaml.safe_dump(document),
+        )
+
+    def test_successful_request_commits_session(self):
+        rules = {'deckhand:create_cleartext_documents': '@'}
+        self.policy.set_rules(rules)
+
+        resp = self._put_documents()
+        self.assertEqual(200, resp.status_code)
+
+        self.assertIsNone(db_api._get_request_session())
+        self.assertEqual(1, len(db_api.revision_summary_get_all()))
+
+    def test_failed_request_rolls_back_session(self):
+        rules = {'deckhand:create_cleartext_documents': '@'}
+        self.policy.set_rules(rules)
+
+        with mock.patch.object(document_view.ViewBuilder, 'list',
+                               autospec=True) as m_list:
+            m_list.side_effect = errors.DeckhandException()
+            resp = self._put_documents()
+        self.assertEqual(500, resp.status_code)
+
+        self.assertIsNone(db_api._get_request_session())
+        self.assertEmpty(db_api.revision_summary_get_all())
@@ -0,0 +1,110 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import yaml
+
+import fixtures
+from unittest import mock
+
+from deckhand.control import prerender
+from deckhand.engine import document_validation
+from deckhand.engine import layering
+from deckhand import factories
+from deckhand.tests.unit.control import base as test_base
+
+
+class TestPreRender(test_base.BaseControllerTest):
+
+    def setUp(self):
+        super(TestPreRender, self).setUp()
+        self.override_config('prerender_workers', 1, group='engine')
+        self.override_config('enable_cache', True, group='engine')
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.control.prerender._EXECUTOR', None))
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.control.prerender._IN_FLIGHT', {}))
+        self.addCleanup(self._shutdown_executor)
+
+    def _shutdown_executor(self):
+        if prerender._EXECUTOR is not None:
+            prerender._EXECUTOR.shutdown()
+
+    def _create_revision(self):
+        rules = {'deckhand:list_cleartext_documents': '@',
+                 'deckhand:list_encrypted_documents': '@',
+                 'deckhand:create_cleartext_documents': '@'}
+        self.policy.set_rules(rules)
+
+        documents_factory = factories.DocumentFactory(1, [1])
+        payload = documents_factory.gen_test({})
+        resp = self.app.simulate_put(
+            '/api/v1.0/buckets/mop/documents',
+            headers={'Content-Type': 'application/x-yaml'},
+            body=yaml.safe_dump_all(payload))
+        self.assertEqual(200, resp.status_code)
+        return list(yaml.safe_load_all(resp.text))[0]['status']['revision']
+
+    def test_put_documents_prerenders_revision(self):
+        revision_id = self._create_revision()
+        future = prerender._IN_FLIGHT[revision_id]
+        future.result()
+
+        with mock.patch.object(layering, 'DocumentLayering',
+                               autospec=True) as mock_layering, \
+                mock.patch.object(document_validation, 'DocumentValidation',
+                                  autospec=True) as mock_validation:
+            resp = self.app.simulate_get(
+                '/api/v1.0/revisions/%s/rendered-documents' % revision_id,
+                headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(1, len(list(yaml.safe_load_all(resp.text))))
+        mock_layering.assert_not_called()
+        mock_validation.assert_not_called()
+
+    def test_failed_request_does_not_prerender(self):
+        rules = {'deckhand:create_cleartext_documents': '@'}
+        self.policy.set_rules(rules)
+
+        resp = self.app.simulate_put(
+            '/api/v1.0/buckets/mop/documents',
+            headers={'Content-Type': 'application/x-yaml'},
+            body='invalid: [yaml')
+        self.assertEqual(400, resp.status_code)
+        self.assertEmpty(prerender._IN_FLIGHT)
+
+    def test_wait_for_prerender(self):
+        started = threading.Event()
+        proceed = threading.Event()
+        rendered = []
+
+        def fake_prerender(revision_id):
+            started.set()
+            proceed.wait()
+            rendered.append(revision_id)
+
+        with mock.patch.object(prerender, '_prerender', fake_prerender):
+            prerender.submit(1)
+            prerender.submit(2)
+            started.wait()
+
+            # Revision 2 hasn't started rendering, so it's taken off the queue
+            # rather than waited for.
+            prerender.wait(2)
+            self.assertTrue(prerender._IN_FLIGHT.get(2) is None or
+                            prerender._IN_FLIGHT[2].cancelled())
+
+            threading.Timer(0.1, proceed.set).start()
+            prerender.wait('1')
+            self.assertEqual([1], rendered)
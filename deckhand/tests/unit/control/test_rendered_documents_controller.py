@@ -16,10 +16,14 @@ import re
 import six
 import yaml
 
+import fixtures
 from unittest import mock
 
 from deckhand.common.document import DocumentDict as dd
-from deckhand.control import revision_documents
+from deckhand.control import common
+from deckhand.engine import document_validation
+from deckhand.engine import layering
+from deckhand.engine import render_pool
 from deckhand.engine import secrets_manager
 from deckhand import errors
 from deckhand import factories
@@ -201,6 +205,131 @@ class TestRenderedDocumentsController(test_base.BaseControllerTest):
         self.assertEqual([2, 2], first_revision_ids)
         self.assertEqual([4, 4], second_revision_ids)
 
+    def test_list_rendered_documents_from_snapshot(self):
+        """Validates that post-validated rendered documents are persisted and
+        read back instead of being rendered again.
+        """
+        self.override_config('enable_cache', False, group='engine')
+        self.override_config('enable_rendered_snapshots', True,
+                             group='engine')
+        rules = {'deckhand:list_cleartext_documents': '@',
+                 'deckhand:list_encrypted_documents': '@',
+                 'deckhand:create_cleartext_documents': '@'}
+        self.policy.set_rules(rules)
+
+        documents_factory = factories.DocumentFactory(2, [1, 1])
+        payload = documents_factory.gen_test({
+            '_SITE_ACTIONS_1_': {
+                'actions': [{'method': 'merge', 'path': '.'}]
+            }
+        }, global_abstract=False)
+        resp = self.app.simulate_put(
+            '/api/v1.0/buckets/mop/documents',
+            headers={'Content-Type': 'application/x-yaml'},
+            body=yaml.safe_dump_all(payload))
+        self.assertEqual(200, resp.status_code)
+        revision_id = list(yaml.safe_load_all(resp.text))[0]['status'][
+            'revision']
+
+        resp = self.app.simulate_get(
+            '/api/v1.0/revisions/%s/rendered-documents' % revision_id,
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        rendered_documents = list(yaml.safe_load_all(resp.text))
+
+        with mock.patch.object(layering, 'DocumentLayering',
+                               autospec=True) as mock_layering, \
+                mock.patch.object(document_validation, 'DocumentValidation',
+                                  autospec=True) as mock_validation:
+            resp = self.app.simulate_get(
+                '/api/v1.0/revisions/%s/rendered-documents' % revision_id,
+                headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(rendered_documents, list(yaml.safe_load_all(
+            resp.text)))
+        mock_layering.assert_not_called()
+        mock_validation.assert_not_called()
+
+    def _use_render_pool(self, queue_size):
+        self.override_config('prerender_workers', 0, group='engine')
+        self.override_config('render_pool_workers', 1, group='engine')
+        self.override_config('render_pool_queue_size', queue_size,
+                             group='engine')
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.render_pool._EXECUTOR', None))
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.render_pool._stats',
+            dict(render_pool._stats, jobs=0)))
+        self.addCleanup(lambda: render_pool._EXECUTOR and
+                        render_pool._EXECUTOR.shutdown())
+
+    def _create_revision(self, **kwargs):
+        rules = {'deckhand:list_cleartext_documents': '@',
+                 'deckhand:list_encrypted_documents': '@',
+                 'deckhand:create_cleartext_documents': '@'}
+        self.policy.set_rules(rules)
+
+        documents_factory = factories.DocumentFactory(2, [1, 1])
+        payload = documents_factory.gen_test({
+            '_SITE_ACTIONS_1_': {
+                'actions': [{'method': 'merge', 'path': '.'}]
+            }
+        }, global_abstract=False, **kwargs)
+        resp = self.app.simulate_put(
+            '/api/v1.0/buckets/mop/documents',
+            headers={'Content-Type': 'application/x-yaml'},
+            body=yaml.safe_dump_all(payload))
+        self.assertEqual(200, resp.status_code)
+        return list(yaml.safe_load_all(resp.text))[0]['status']['revision']
+
+    def test_list_rendered_documents_renders_only_filtered_documents(self):
+        revision_id = self._create_revision(site_abstract=False)
+
+        with mock.patch.object(common, 'validate_rendered_docs',
+                               autospec=True) as mock_validate:
+            resp = self.app.simulate_get(
+                '/api/v1.0/revisions/%s/rendered-documents' % revision_id,
+                headers={'Content-Type': 'application/x-yaml'},
+                params={'metadata.layeringDefinition.layer': 'site'})
+        self.assertEqual(200, resp.status_code)
+        rendered_documents = list(yaml.safe_load_all(resp.text))
+        self.assertEqual(
+            ['site'], [d['metadata']['layeringDefinition']['layer']
+                       for d in rendered_documents])
+
+        # The site document is rendered with its parent, but only the site
+        # document is post-validated.
+        validated_documents = mock_validate.call_args[0][1]
+        self.assertEqual([rendered_documents[0]['metadata']['name']],
+                         [d.name for d in validated_documents])
+
+    def test_list_rendered_documents_in_render_pool(self):
+        self._use_render_pool(queue_size=0)
+        revision_id = self._create_revision()
+
+        resp = self.app.simulate_get(
+            '/api/v1.0/revisions/%s/rendered-documents' % revision_id,
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, len(list(yaml.safe_load_all(resp.text))))
+        # Rendering and post-validation.
+        self.assertEqual(2, render_pool.get_stats()['jobs'])
+
+    def test_list_rendered_documents_render_pool_full(self):
+        self._use_render_pool(queue_size=0)
+        revision_id = self._create_revision()
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.render_pool._depth', 1))
+
+        resp = self.app.simulate_get(
+            '/api/v1.0/revisions/%s/rendered-documents' % revision_id,
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(503, resp.status_code)
+        self.assertEqual('1', resp.headers['Retry-After'])
+        body = yaml.safe_load(resp.text)
+        self.assertEqual('RenderPoolFull', body['details']['errorType'])
+        self.assertTrue(body['retry'])
+
 
 class TestRenderedDocumentsControllerRedaction(test_base.BaseControllerTest):
 
@@ -476,7 +605,7 @@ class TestRenderedDocumentsControllerNegative(test_base.BaseControllerTest):
             'revision']
 
         with mock.patch.object(
-                revision_documents, 'document_validation',
+                common, 'document_validation',
                 autospec=True) as m_doc_validation:
             (m_doc_validation.DocumentValidation.return_value
                 .validate_all.side_effect) = errors.InvalidDocumentFormat
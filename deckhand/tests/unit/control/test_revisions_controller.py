@@ -58,6 +58,45 @@ class TestRevisionsController(test_base.BaseControllerTest):
             m_barbican_driver.delete_secret.assert_called_once_with(
                 fake_secret_ref)
 
+    def test_list_revisions_with_limit_and_marker(self):
+        rules = {'deckhand:create_cleartext_documents': '@',
+                 'deckhand:list_revisions': '@'}
+        self.policy.set_rules(rules)
+
+        payload = factories.DocumentFactory(1, [1]).gen_test({})
+        for _ in range(3):
+            payload[-1]['data'] = test_utils.rand_name('data')
+            resp = self.app.simulate_put(
+                '/api/v1.0/buckets/mop/documents',
+                headers={'Content-Type': 'application/x-yaml'},
+                body=yaml.safe_dump_all(payload))
+            self.assertEqual(200, resp.status_code)
+
+        resp = self.app.simulate_get(
+            '/api/v1.0/revisions', params={'sort': 'id', 'limit': 2},
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        body = yaml.safe_load(resp.text)
+        self.assertEqual([1, 2], [r['id'] for r in body['results']])
+
+        resp = self.app.simulate_get(
+            '/api/v1.0/revisions',
+            params={'sort': 'id', 'limit': 2, 'marker': 2},
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(200, resp.status_code)
+        body = yaml.safe_load(resp.text)
+        self.assertEqual([3], [r['id'] for r in body['results']])
+        self.assertEqual(1, len(body['results'][0]['buckets']))
+
+    def test_list_revisions_with_unsupported_sort(self):
+        rules = {'deckhand:list_revisions': '@'}
+        self.policy.set_rules(rules)
+
+        resp = self.app.simulate_get(
+            '/api/v1.0/revisions', params={'sort': 'tags'},
+            headers={'Content-Type': 'application/x-yaml'})
+        self.assertEqual(400, resp.status_code)
+
 
 class TestRevisionsControllerNegativeRBAC(test_base.BaseControllerTest):
     """Test suite for validating negative RBAC scenarios for revisions
@@ -305,6 +305,37 @@ class TestDocuments(base.DeckhandWithDBTestCase):
             sorted(duplicate_documents, key=lambda d: d['created_at']),
             ignore=['created_at', 'updated_at', 'revision_id', 'id'])
 
+    def test_create_unchanged_document_after_unrelated_revision(self):
+        """Validates that an unchanged document references the revision it
+        was originally created in, even if revisions for other buckets were
+        created in the meantime.
+        """
+        bucket_name = test_utils.rand_name('bucket')
+        payload = base.DocumentFixture.get_minimal_fixture()
+
+        orig_documents = self.create_documents(bucket_name, [payload])
+        self.create_documents(test_utils.rand_name('bucket'),
+                              [base.DocumentFixture.get_minimal_fixture()])
+        duplicate_documents = self.create_documents(bucket_name, [payload])
+
+        self.assertEqual(orig_documents[0]['revision_id'],
+                         duplicate_documents[0]['orig_revision_id'])
+
+    def test_create_many_documents_uses_single_insert(self):
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=5)
+        bucket_name = test_utils.rand_name('bucket')
+
+        with mock.patch.object(
+                db_api, '_documents_bulk_insert', autospec=True,
+                side_effect=db_api._documents_bulk_insert) as m_bulk_insert:
+            created_documents = self.create_documents(bucket_name, payload)
+
+        self.assertEqual(1, m_bulk_insert.call_count)
+        self.assertEqual(5, len(created_documents))
+        self.assertEqual(
+            sorted(d['metadata']['name'] for d in payload),
+            sorted(d['name'] for d in created_documents))
+
     def test_document_creation_failure_rolls_back_in_flight_revision(self):
         """Regression test that an exception that occurs between creation of
         a revision and creation of all bucket documents results in the
@@ -0,0 +1,88 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import fixtures
+
+from deckhand.conf import config
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand import errors
+from deckhand.tests.unit import base
+
+CONF = config.CONF
+
+
+class TestReadReplica(base.DeckhandTestCase):
+    """Route read-only requests to a replica, using two SQLite files.
+
+    Nothing replicates between the files, which stands in for a replica
+    lagging arbitrarily far behind the primary.
+    """
+
+    def setUp(self):
+        super(TestReadReplica, self).setUp()
+        if os.environ.get('PIFPAF_URL'):
+            # Column types are chosen once per process, based on the backend
+            # of the first database set up.
+            self.skipTest('Read replica tests run against SQLite only.')
+        tempdir = self.useFixture(fixtures.TempDir()).path
+        primary = 'sqlite:///%s' % os.path.join(tempdir, 'primary.db')
+        replica = 'sqlite:///%s' % os.path.join(tempdir, 'replica.db')
+
+        self.override_config('connection', replica, group='database')
+        db_api.setup_db(replica, create_tables=True)
+
+        self.override_config('connection', primary, group='database')
+        self.override_config('slave_connection', replica, group='database')
+        db_api.setup_db(primary, create_tables=True)
+        self.addCleanup(db_api.drop_db)
+
+    def _create_revision(self):
+        db_api.bind_request_session()
+        try:
+            return db_api.revision_create()
+        finally:
+            db_api.release_request_session()
+
+    def _bind_request_session(self, read_only):
+        db_api.bind_request_session(read_only=read_only)
+        self.addCleanup(db_api.release_request_session)
+
+    def test_read_only_request_reads_from_replica(self):
+        self._create_revision()
+
+        self._bind_request_session(read_only=True)
+        self.assertEmpty(db_api.revision_summary_get_all())
+
+    def test_writing_request_reads_its_own_writes(self):
+        self._bind_request_session(read_only=False)
+        revision = db_api.revision_create()
+
+        self.assertEqual([revision['id']],
+                         [r['id'] for r in db_api.revision_summary_get_all()])
+
+    def test_read_only_request_falls_back_to_primary(self):
+        revision = self._create_revision()
+
+        self._bind_request_session(read_only=True)
+        self.assertEqual(revision['id'],
+                         db_api.revision_get(revision['id'])['id'])
+        # The rest of the request is served by the primary.
+        self.assertEqual([revision['id']],
+                         [r['id'] for r in db_api.revision_summary_get_all()])
+
+    def test_read_only_request_missing_revision_raises_exc(self):
+        self._bind_request_session(read_only=True)
+        self.assertRaises(errors.RevisionNotFound, db_api.revision_get, 1)
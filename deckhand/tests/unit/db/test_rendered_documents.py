@@ -0,0 +1,52 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand import errors
+from deckhand.tests import test_utils
+from deckhand.tests.unit import base
+
+
+class TestRenderedDocuments(base.DeckhandWithDBTestCase):
+
+    def setUp(self):
+        super(TestRenderedDocuments, self).setUp()
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name = test_utils.rand_name('bucket')
+        self.documents = self.create_documents(bucket_name, payload)
+        self.revision_id = self.documents[0]['revision_id']
+
+    def test_create_and_get_rendered_documents(self):
+        self.assertIsNone(db_api.rendered_documents_get('key'))
+
+        db_api.rendered_documents_create(self.revision_id, 'key',
+                                         self.documents)
+        # Creating the same snapshot again is ignored.
+        db_api.rendered_documents_create(self.revision_id, 'key', [])
+
+        rendered_documents = db_api.rendered_documents_get('key')
+        self.assertEqual(
+            sorted((d['name'], d['data']) for d in self.documents),
+            sorted((d.name, d.data) for d in rendered_documents))
+
+    def test_rendered_documents_deleted_with_revision(self):
+        db_api.rendered_documents_create(self.revision_id, 'key',
+                                         self.documents)
+        db_api.revision_delete_all()
+        self.assertIsNone(db_api.rendered_documents_get('key'))
+
+    def test_create_rendered_documents_missing_revision_raises_exc(self):
+        self.assertRaises(errors.RevisionNotFound,
+                          db_api.rendered_documents_create,
+                          self.revision_id + 1, 'key', [])
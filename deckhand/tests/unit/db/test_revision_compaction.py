@@ -0,0 +1,133 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from oslo_utils import timeutils
+
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand import errors
+from deckhand.tests import test_utils
+from deckhand.tests.unit import base
+from deckhand import types
+
+
+class TestRevisionCompaction(base.DeckhandWithDBTestCase):
+
+    def setUp(self):
+        super(TestRevisionCompaction, self).setUp()
+        self.older_than = timeutils.utcnow() + datetime.timedelta(days=1)
+
+    def _revision_state(self, revision_id):
+        documents = self.list_revision_documents(revision_id, deleted=False)
+        return sorted((d['schema'], d['name'], d['data_hash'],
+                       d['metadata_hash'], d['revision_id'])
+                      for d in documents)
+
+    def test_compaction_preserves_surviving_revisions(self):
+        # Revision 1: Create bucket a.
+        payload_a = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name_a = test_utils.rand_name('bucket')
+        self.create_documents(bucket_name_a, payload_a)
+
+        # Revision 2: Create bucket b.
+        payload_b = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name_b = test_utils.rand_name('bucket')
+        self.create_documents(bucket_name_b, payload_b)
+
+        # Revision 3: Update bucket a. Tagged, so kept.
+        payload_a[0]['data'] = {'foo': 'bar'}
+        self.create_documents(bucket_name_a, payload_a)
+        db_api.revision_tag_create(3, 'keep')
+
+        # Revision 4: Delete a document from bucket b.
+        self.create_documents(bucket_name_b, payload_b[:1])
+
+        # Revision 5: Update bucket a again.
+        payload_a[1]['data'] = {'baz': 'qux'}
+        self.create_documents(bucket_name_a, payload_a)
+
+        expected = {r: self._revision_state(r) for r in (3, 5)}
+
+        removed = db_api.revisions_compact(self.older_than)
+
+        self.assertEqual([1, 2, 4], removed)
+        self.assertEqual([3, 5], [r['id'] for r in db_api.revision_get_all()])
+        for revision_id in (1, 2, 4):
+            self.assertRaises(errors.RevisionNotFound,
+                              db_api.revision_get, revision_id)
+
+        # Documents created in removed revisions are attributed to the next
+        # surviving revision.
+        next_surviving = {1: 3, 2: 3, 3: 3, 4: 5, 5: 5}
+        for revision_id, documents in expected.items():
+            documents = sorted(d[:-1] + (next_surviving[d[-1]],)
+                               for d in documents)
+            self.assertEqual(documents, self._revision_state(revision_id))
+
+    def test_compaction_keeps_validated_and_recent_revisions(self):
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=1)
+        bucket_name = test_utils.rand_name('bucket')
+        for _ in range(3):
+            payload[0]['data'] = test_utils.rand_name('data')
+            self.create_documents(bucket_name, payload)
+        db_api.validation_create(
+            2, 'promenade', {'status': 'success', 'validator': {}})
+
+        # Nothing is old enough.
+        self.assertEmpty(db_api.revisions_compact(timeutils.utcnow() -
+                                                  datetime.timedelta(days=1)))
+
+        # The latest revision is always kept.
+        self.assertEqual([1], db_api.revisions_compact(self.older_than))
+        self.assertEqual([2, 3], [r['id'] for r in db_api.revision_get_all()])
+
+    def test_compaction_preserves_validations(self):
+        # Revision 1: Create a ValidationPolicy. Kept.
+        validation_policy = base.DocumentFixture.get_minimal_fixture(
+            schema=types.VALIDATION_POLICY_SCHEMA + '/v1',
+            data={'validations': [{'name': 'promenade'}]})
+        self.create_documents(test_utils.rand_name('bucket'),
+                              [validation_policy])
+
+        # Revisions 2 and 3: Create then update bucket b.
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=1)
+        bucket_name = test_utils.rand_name('bucket')
+        for _ in range(2):
+            payload[0]['data'] = test_utils.rand_name('data')
+            self.create_documents(bucket_name, payload)
+        db_api.validation_create(
+            3, 'armada', {'status': 'success', 'validator': {}})
+
+        expected = [tuple(v) for v in db_api.validation_get_all(3)]
+
+        self.assertEqual([2], db_api.revisions_compact(self.older_than))
+        self.assertEqual(expected,
+                         [tuple(v) for v in db_api.validation_get_all(3)])
+        self.assertEqual([1, 3], [r['id'] for r in db_api.revision_get_all()])
+
+    def test_compaction_archives_removed_revisions(self):
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name = test_utils.rand_name('bucket')
+        created_documents = self.create_documents(bucket_name, payload)
+        self.create_documents(bucket_name, [])
+
+        archived = []
+        db_api.revisions_compact(
+            self.older_than, archive=lambda r: archived.extend(r))
+
+        self.assertEqual([1], [r['id'] for r in archived])
+        self.assertEqual(
+            sorted((d['name'], d['data']) for d in created_documents),
+            sorted((d['name'], d['data']) for d in archived[0]['documents']))
@@ -12,6 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import types
+
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand.db.sqlalchemy import models
+from deckhand import errors
 from deckhand.tests import test_utils
 from deckhand.tests.unit import base
 
@@ -115,3 +120,168 @@ class TestRevisionDocumentsFiltering(base.DeckhandWithDBTestCase):
                 **{'metadata.storagePolicy': ['wrong_val', 'encrypted']})
 
             self.assertEmpty(retrieved_documents)
+
+    def test_revision_document_filtering_by_schema_namespace(self):
+        documents = base.DocumentFixture.get_minimal_multi_fixture(count=3)
+        documents[0]['schema'] = 'promenade/Node/v1'
+        documents[1]['schema'] = 'promenade/Genesis/v1'
+        documents[2]['schema'] = 'promenade_x/Node/v1'
+        bucket_name = test_utils.rand_name('bucket')
+        revision_id = self.create_documents(bucket_name, documents)[0][
+            'revision_id']
+
+        for schema, expected in (
+                ('promenade', ['promenade/Genesis/v1', 'promenade/Node/v1']),
+                ('promenade/Node', ['promenade/Node/v1']),
+                ('promenade/Node/v1', ['promenade/Node/v1']),
+                ('promenade%', []),
+                ('promenade/Node/v', [])):
+            retrieved_documents = self.list_revision_documents(
+                revision_id, schema=schema)
+            self.assertEqual(
+                expected, sorted(d['schema'] for d in retrieved_documents))
+
+    def test_revision_document_filtering_by_labels(self):
+        documents = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        documents[0]['metadata']['labels'] = {'foo': 'bar', 'baz': 'qux'}
+        documents[1]['metadata']['labels'] = {'foo': 'bar'}
+        bucket_name = test_utils.rand_name('bucket')
+        revision_id = self.create_documents(bucket_name, documents)[0][
+            'revision_id']
+
+        retrieved_documents = self.list_revision_documents(
+            revision_id, **{'metadata.labels': {'foo': 'bar'}})
+        self.assertEqual(2, len(retrieved_documents))
+
+        retrieved_documents = self.list_revision_documents(
+            revision_id, **{'metadata.labels': {'foo': 'bar', 'baz': 'qux'}})
+        self.assertEqual(1, len(retrieved_documents))
+        self.assertEqual(documents[0]['metadata']['name'],
+                         retrieved_documents[0]['metadata']['name'])
+
+    def test_revision_document_filtering_by_boolean_string(self):
+        documents = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        documents[0]['metadata']['layeringDefinition']['abstract'] = True
+        documents[1]['metadata']['layeringDefinition']['abstract'] = False
+        bucket_name = test_utils.rand_name('bucket')
+        revision_id = self.create_documents(bucket_name, documents)[0][
+            'revision_id']
+
+        for filter_val, expected in (('true', documents[0]),
+                                     ('False', documents[1])):
+            retrieved_documents = self.list_revision_documents(
+                revision_id,
+                **{'metadata.layeringDefinition.abstract': filter_val})
+            self.assertEqual([expected['metadata']['name']],
+                             [d['metadata']['name']
+                              for d in retrieved_documents])
+
+
+class TestRevisionDocumentsHistory(base.DeckhandWithDBTestCase):
+
+    def test_list_revision_documents_returns_latest_per_document(self):
+        document = base.DocumentFixture.get_minimal_fixture()
+        other_document = base.DocumentFixture.get_minimal_fixture()
+        bucket_name = test_utils.rand_name('bucket')
+        other_bucket_name = test_utils.rand_name('bucket')
+
+        self.create_documents(other_bucket_name, other_document)
+        self.create_documents(bucket_name, document)
+        document['data'] = {'updated': True}
+        revision_id = self.create_documents(bucket_name, document)[0][
+            'revision_id']
+
+        retrieved_documents = self.list_revision_documents(revision_id)
+
+        self.assertEqual(2, len(retrieved_documents))
+        retrieved_by_bucket = {
+            d['bucket_name']: d for d in retrieved_documents}
+        self.assertEqual({'updated': True},
+                         retrieved_by_bucket[bucket_name]['data'])
+        self.assertEqual(other_document['data'],
+                         retrieved_by_bucket[other_bucket_name]['data'])
+
+    def test_list_revision_documents_ignores_newer_revisions(self):
+        document = base.DocumentFixture.get_minimal_fixture()
+        bucket_name = test_utils.rand_name('bucket')
+        original_data = document['data']
+
+        revision_id = self.create_documents(bucket_name, document)[0][
+            'revision_id']
+        document['data'] = {'updated': True}
+        self.create_documents(bucket_name, document)
+
+        retrieved_documents = self.list_revision_documents(revision_id)
+
+        self.assertEqual(1, len(retrieved_documents))
+        self.assertEqual(original_data, retrieved_documents[0]['data'])
+
+    def test_list_revision_documents_excludes_deleted_history(self):
+        documents = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name = test_utils.rand_name('bucket')
+        other_bucket_name = test_utils.rand_name('bucket')
+
+        self.create_documents(bucket_name, documents)
+        self.create_documents(bucket_name, documents[:1])
+        revision_id = self.create_documents(
+            other_bucket_name,
+            base.DocumentFixture.get_minimal_fixture())[0]['revision_id']
+
+        retrieved_documents = self.list_revision_documents(
+            revision_id, deleted=False)
+
+        self.assertEqual(2, len(retrieved_documents))
+        self.assertNotIn(documents[1]['metadata']['name'],
+                         [d['name'] for d in retrieved_documents])
+
+
+class TestRevisionDocumentsStreaming(base.DeckhandWithDBTestCase):
+
+    def test_revision_documents_iter_matches_revision_documents_get(self):
+        documents = base.DocumentFixture.get_minimal_multi_fixture(count=3)
+        bucket_name = test_utils.rand_name('bucket')
+        self.create_documents(bucket_name, documents)
+        documents[0]['data'] = {'foo': 'bar'}
+        revision_id = self.create_documents(
+            bucket_name, documents)[0]['revision_id']
+
+        streamed_documents = db_api.revision_documents_iter(
+            revision_id, deleted=False)
+        self.assertIsInstance(streamed_documents, types.GeneratorType)
+        streamed_documents = list(streamed_documents)
+
+        retrieved_documents = self.list_revision_documents(
+            revision_id, deleted=False)
+        self.assertEqual(
+            sorted(retrieved_documents, key=lambda d: d['id']),
+            sorted(streamed_documents, key=lambda d: d['id']))
+        self.assertEqual(
+            sorted(d['created_at'] for d in streamed_documents),
+            [d['created_at'] for d in streamed_documents])
+
+    def test_revision_documents_iter_missing_revision_raises_exc(self):
+        # The error is raised on the call, not once iteration begins.
+        self.assertRaises(errors.RevisionNotFound,
+                          db_api.revision_documents_iter, 1)
+
+
+class TestDocumentFilterCompilation(base.DeckhandWithDBTestCase):
+
+    def test_nested_filters_pushed_down_when_supported(self):
+        session = db_api.get_session()
+        query = session.query(models.Document)
+        filters = {
+            'schema': 'promenade',
+            'metadata.labels': {'foo': 'bar'},
+            'metadata.storagePolicy': ['cleartext', 'encrypted'],
+            'metadata.schema': 'metadata/Document',
+            'tags.[*].tag': 'foo'
+        }
+
+        _, remaining_filters = db_api._filter_documents_query(
+            session, query, filters)
+
+        expected = {'metadata.schema', 'tags.[*].tag'}
+        if session.get_bind().dialect.name != 'postgresql':
+            expected.update(['metadata.labels', 'metadata.storagePolicy'])
+        self.assertEqual(expected, set(remaining_filters))
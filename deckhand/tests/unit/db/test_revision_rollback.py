@@ -85,6 +85,30 @@ class TestRevisionRollback(base.DeckhandWithDBTestCase):
         self.assertEqual([1, 1, 4, 4],
                          [d['orig_revision_id'] for d in rollback_documents])
 
+    def test_rollback_deletes_documents_created_since_revision(self):
+        # Revision 1: Create 2 documents.
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name = test_utils.rand_name('bucket')
+        created_documents = self.create_documents(bucket_name, payload)
+        orig_revision_id = created_documents[0]['revision_id']
+
+        # Revision 2: Add a third document to the same bucket.
+        payload.extend(base.DocumentFixture.get_minimal_multi_fixture(count=1))
+        self.create_documents(bucket_name, payload)
+
+        # Revision 3: rollback to revision 1.
+        rollback_revision = self.rollback_revision(orig_revision_id)
+
+        rollback_documents = self.list_revision_documents(
+            rollback_revision['id'], include_history=False, deleted=False)
+        self.assertEqual(
+            sorted(d['name'] for d in created_documents),
+            sorted(d['name'] for d in rollback_documents))
+        deleted_documents = [
+            d for d in rollback_revision['documents'] if d['deleted']]
+        self.assertEqual([payload[-1]['metadata']['name']],
+                         [d['name'] for d in deleted_documents])
+
     def test_rollback_to_revision_same_as_current_revision(self):
         payload = base.DocumentFixture.get_minimal_multi_fixture(count=4)
         bucket_name = test_utils.rand_name('bucket')
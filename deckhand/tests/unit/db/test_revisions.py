@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest import mock
+
+from deckhand.db.sqlalchemy import api as db_api
 from deckhand import errors
 from deckhand.tests import test_utils
 from deckhand.tests.unit import base
+from deckhand import types
 
 
 class TestRevisions(base.DeckhandWithDBTestCase):
@@ -166,3 +170,81 @@ class TestRevisions(base.DeckhandWithDBTestCase):
                             alt_created_documents[0]['id']]
         self.assertEqual(
             expected_doc_ids, [d['id'] for d in alt_revision_docs])
+
+    def test_list_revision_summaries(self):
+        bucket_name = test_utils.rand_name('bucket')
+        alt_bucket_name = test_utils.rand_name('bucket')
+        self.create_documents(
+            bucket_name, base.DocumentFixture.get_minimal_fixture())
+        revision_id = self.create_documents(
+            alt_bucket_name, base.DocumentFixture.get_minimal_fixture())[0][
+                'revision_id']
+        db_api.revision_tag_create(revision_id, 'foo')
+
+        summaries = db_api.revision_summary_get_all()
+        self.assertEqual(2, len(summaries))
+        self.assertNotIn('documents', summaries[0])
+        self.assertEqual([bucket_name], summaries[0]['buckets'])
+        self.assertEqual([], summaries[0]['tags'])
+        self.assertEqual([alt_bucket_name], summaries[1]['buckets'])
+        self.assertEqual(['foo'], [t['tag'] for t in summaries[1]['tags']])
+
+        summaries = db_api.revision_summary_get_all(tags=['foo', 'bar'])
+        self.assertEqual([revision_id], [s['id'] for s in summaries])
+
+    def test_list_revision_summaries_keyset_pagination(self):
+        revision_ids = [self.create_revision() for _ in range(5)]
+
+        for order_by, expected in (('asc', revision_ids),
+                                   ('desc', revision_ids[::-1])):
+            retrieved_ids = []
+            marker = None
+            while True:
+                page = db_api.revision_summary_get_all(
+                    sort_by='id', order_by=order_by, limit=2, marker=marker)
+                if not page:
+                    break
+                self.assertLessEqual(len(page), 2)
+                retrieved_ids.extend(s['id'] for s in page)
+                marker = page[-1]['id']
+            self.assertEqual(expected, retrieved_ids)
+
+    def test_list_revision_summaries_with_missing_marker(self):
+        self.assertRaises(errors.RevisionNotFound,
+                          db_api.revision_summary_get_all, marker=1)
+
+    def test_list_revision_summaries_with_unsupported_sort(self):
+        self.assertRaises(errors.InvalidInputException,
+                          db_api.revision_summary_get_all,
+                          sort_by=['created_at', 'tags'])
+
+    def test_show_revision_summary(self):
+        documents = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        documents[0]['schema'] = types.VALIDATION_POLICY_SCHEMA + '/v1'
+        bucket_name = test_utils.rand_name('bucket')
+        revision_id = self.create_documents(bucket_name, documents)[0][
+            'revision_id']
+
+        summary = db_api.revision_summary_get(revision_id)
+        self.assertEqual(revision_id, summary['id'])
+        self.assertEqual([bucket_name], summary['buckets'])
+        self.assertEqual([documents[0]['schema']],
+                         [d['schema'] for d in summary['documents']])
+
+    def test_revision_exists(self):
+        revision_id = self.create_revision()
+        self.assertTrue(db_api.revision_exists(revision_id))
+        self.assertFalse(db_api.revision_exists(revision_id + 1))
+
+    def test_revision_exists_memoized_within_request(self):
+        revision_id = self.create_revision()
+
+        db_api.bind_request_session()
+        self.addCleanup(db_api.release_request_session)
+        self.assertTrue(db_api.revision_exists(revision_id))
+
+        with mock.patch.object(db_api, 'get_session',
+                               autospec=True) as m_get_session:
+            self.assertTrue(db_api.revision_exists(revision_id))
+            self.assertTrue(db_api.revision_exists(str(revision_id)))
+        m_get_session.assert_not_called()
@@ -0,0 +1,78 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand.tests import test_utils
+from deckhand.tests.unit import base
+from deckhand import types
+
+
+class TestValidations(base.DeckhandWithDBTestCase):
+
+    def _create_validation(self, revision_id, name, status):
+        return db_api.validation_create(
+            revision_id, name, {'status': status, 'validator': {}})
+
+    def test_validation_get_all_reports_worst_status(self):
+        revision_id = self.create_revision()
+        self._create_validation(revision_id, 'promenade', 'success')
+        self._create_validation(revision_id, 'promenade', 'failure')
+        self._create_validation(revision_id, 'promenade', 'success')
+        self._create_validation(revision_id, 'armada', 'success')
+
+        validations = list(db_api.validation_get_all(revision_id))
+        self.assertEqual([('armada', 'success'), ('promenade', 'failure')],
+                         [tuple(v) for v in validations])
+
+    def test_validation_get_all_is_scoped_to_revision(self):
+        revision_id = self.create_revision()
+        self._create_validation(revision_id, 'promenade', 'failure')
+        alt_revision_id = self.create_revision()
+        self._create_validation(alt_revision_id, 'promenade', 'success')
+
+        validations = list(db_api.validation_get_all(alt_revision_id))
+        self.assertEqual([('promenade', 'success')],
+                         [tuple(v) for v in validations])
+
+    def test_validation_get_all_against_validation_policy(self):
+        validation_policy = base.DocumentFixture.get_minimal_fixture(
+            schema=types.VALIDATION_POLICY_SCHEMA + '/v1',
+            data={'validations': [{'name': 'promenade'}]})
+        bucket_name = test_utils.rand_name('bucket')
+        revision_id = self.create_documents(
+            bucket_name, [validation_policy])[0]['revision_id']
+
+        validations = list(db_api.validation_get_all(revision_id))
+        self.assertEqual([('promenade', 'failure')],
+                         [tuple(v) for v in validations])
+
+        self._create_validation(revision_id, 'promenade', 'success')
+        self._create_validation(revision_id, 'armada', 'success')
+
+        # The ValidationPolicy documents of the revision are cached.
+        with mock.patch.object(db_api, 'document_get_all',
+                               autospec=True) as m_document_get_all:
+            validations = list(db_api.validation_get_all(revision_id))
+        m_document_get_all.assert_not_called()
+        self.assertEqual([('armada', 'ignored [success]'),
+                          ('promenade', 'success')],
+                         sorted(tuple(v) for v in validations))
+
+    def test_validation_policy_cache_honors_cache_timeout(self):
+        self.override_config('cache_timeout', 60, group='engine')
+        with mock.patch.object(db_api, '_VALIDATION_POLICY_CACHE', None):
+            self.assertEqual(
+                60, db_api._get_validation_policy_cache().expiretime)
@@ -14,8 +14,9 @@
 
 from threading import Thread
 import time
+from unittest import mock
 
-import testtools
+import fixtures
 
 from deckhand.engine import cache
 from deckhand import factories
@@ -25,16 +26,7 @@ from deckhand.tests.unit import base as test_base
 class RenderedDocumentsCacheTest(test_base.DeckhandTestCase):
 
     def test_lookup_by_revision_id_cache(self):
-        """Validate ``lookup_by_revision_id`` caching works.
-
-        Passing in None in lieu of the actual documents proves that:
-
-        * if the payload is in the cache, then no error is thrown since the
-          cache is hit so no further processing is performed, where otherwise a
-          method would be called on `None`
-        * if the payload is not in the cache, then following logic above,
-          method is called on `None`, raising AttributeError
-        """
+        """Validate ``lookup_by_revision_id`` caching works."""
 
         document_factory = factories.DocumentFactory(1, [1])
         documents = document_factory.gen_test({})
@@ -47,46 +39,138 @@ class RenderedDocumentsCacheTest(test_base.DeckhandTestCase):
 
         # Validate that the cache actually works.
         next_rendered_documents, cache_hit = cache.lookup_by_revision_id(
-            1, None)
+            1, documents)
         self.assertEqual(rendered_documents, next_rendered_documents)
         self.assertTrue(cache_hit)
 
-        # No documents passed in and revision ID 2 isn't cached - so expect
-        # this to blow up.
-        with testtools.ExpectedException(AttributeError):
-            cache.lookup_by_revision_id(2, None)
-
         # Invalidate the cache and ensure the original data isn't there.
         cache.invalidate()
+        _, cache_hit = cache.lookup_by_revision_id(1, documents)
+        self.assertFalse(cache_hit)
+
+    def test_lookup_by_revision_id_cache_keyed_by_content(self):
+        """Validate that the cache is keyed by the rendering inputs rather
+        than by revision.
+        """
+        document_factory = factories.DocumentFactory(1, [1])
+        documents = document_factory.gen_test({})
+        other_documents = document_factory.gen_test({})
+        cache.invalidate()
+
+        cache.lookup_by_revision_id(1, documents)
+
+        # Identical documents in another revision hit the cache.
+        _, cache_hit = cache.lookup_by_revision_id(2, documents)
+        self.assertTrue(cache_hit)
+
+        # Different documents or rendering options miss the cache.
+        _, cache_hit = cache.lookup_by_revision_id(1, other_documents)
+        self.assertFalse(cache_hit)
+        _, cache_hit = cache.lookup_by_revision_id(
+            1, documents, cleartext_secrets=True)
+        self.assertFalse(cache_hit)
+
+        # Invalidating a revision removes all of its entries.
+        cache.invalidate_one(1)
+        _, cache_hit = cache.lookup_by_revision_id(2, documents)
+        self.assertFalse(cache_hit)
+        _, cache_hit = cache.lookup_by_revision_id(1, other_documents)
+        self.assertFalse(cache_hit)
+
+    def test_make_cache_key(self):
+        document_factory = factories.DocumentFactory(1, [1])
+        documents = document_factory.gen_test({})
+
+        self.assertEqual(cache.make_cache_key(documents),
+                         cache.make_cache_key(list(reversed(documents))))
+        self.assertNotEqual(
+            cache.make_cache_key(documents),
+            cache.make_cache_key(documents, cleartext_secrets=True))
+        self.assertNotEqual(cache.make_cache_key(documents),
+                            cache.make_cache_key(documents[1:]))
+
+        # Stored content hashes are used when available.
+        hashed_documents = [dict(d, data_hash='x', metadata_hash='y')
+                            for d in documents]
+        self.assertNotEqual(cache.make_cache_key(documents),
+                            cache.make_cache_key(hashed_documents))
+
+    def test_lookup_by_revision_id_with_document_filters(self):
+        """Validate that only the documents selected by filters are rendered,
+        unless the entire revision was already rendered.
+        """
+        document_factory = factories.DocumentFactory(2, [1, 1])
+        documents = document_factory.gen_test({
+            '_GLOBAL_DATA_1_': {'data': {'a': 1}},
+            '_SITE_DATA_1_': {'data': {'b': 2}},
+            '_SITE_ACTIONS_1_': {
+                'actions': [{'method': 'merge', 'path': '.'}]}
+        }, global_abstract=False, site_abstract=False)
+        site_name = documents[-1]['metadata']['name']
+        cache.invalidate()
+
+        # The site document is rendered along with its parent, but only the
+        # site document is returned.
+        rendered_documents, cache_hit = cache.lookup_by_revision_id(
+            1, documents, document_filters={'metadata.name': site_name})
+        self.assertFalse(cache_hit)
+        self.assertEqual([site_name], [d.name for d in rendered_documents])
+        self.assertEqual({'a': 1, 'b': 2}, rendered_documents[0].data)
+
+        _, cache_hit = cache.lookup_by_revision_id(
+            1, documents, document_filters={'metadata.name': site_name})
+        self.assertTrue(cache_hit)
+
+        # Once the entire revision is rendered, it is used for any filters.
+        all_rendered_documents, _ = cache.lookup_by_revision_id(1, documents)
+        rendered_documents, cache_hit = cache.lookup_by_revision_id(
+            1, documents, document_filters={'schema': 'example/Kind/v1'})
+        self.assertTrue(cache_hit)
+        self.assertIs(all_rendered_documents, rendered_documents)
+
+    def test_invalidate_one_forgets_removed_entries(self):
+        document_factory = factories.DocumentFactory(1, [1])
+        documents = document_factory.gen_test({})
+        other_documents = document_factory.gen_test({})
+        cache.invalidate()
 
-        # The cache won't be hit this time - expect AttributeError.
-        with testtools.ExpectedException(AttributeError):
-            cache.lookup_by_revision_id(1, None)
+        cache.lookup_by_revision_id(1, documents)
+        cache_key = cache.make_cache_key(documents)
+        # E.g. expired or evicted.
+        cache._get_rendering_cache().remove_value(key=cache_key)
+        cache.lookup_by_revision_id(1, other_documents)
+        other_cache_key = cache.make_cache_key(other_documents)
+        self.assertEqual({other_cache_key},
+                         cache._REVISION_CACHE_KEYS.get(key='1'))
+
+        cache.invalidate_one(1)
+        self.assertNotIn(other_cache_key, cache._get_rendering_cache())
+        self.assertNotIn('1', cache._REVISION_CACHE_KEYS)
+        _, cache_hit = cache.lookup_by_revision_id(1, other_documents)
+        self.assertFalse(cache_hit)
 
     def test_lookup_by_revision_id_cache_multiple_threads(self):
         """Validate that cache works across multiple threads: each thread
         should use the same set of rendered documents.
         """
         document_factory = factories.DocumentFactory(1, [1])
-        documents1 = document_factory.gen_test({})
-        documents2 = document_factory.gen_test({})
-        # Sanity-check that the document sets differ.
-        self.assertNotEqual(documents1, documents2)
+        documents = document_factory.gen_test({})
+        cache.invalidate()
 
         rendered_documents_by_thread = []
         cache_hit_by_thread = []
 
-        def threaded_function(documents):
+        def threaded_function(revision_id):
             # Validate that caching the ref returns expected payload.
             rendered_documents, cache_hit = cache.lookup_by_revision_id(
-                1, documents)
+                revision_id, documents)
             rendered_documents_by_thread.append(rendered_documents)
             cache_hit_by_thread.append(cache_hit)
 
         thread1 = Thread(target=threaded_function,
-                         kwargs={'documents': documents1})
+                         kwargs={'revision_id': 1})
         thread2 = Thread(target=threaded_function,
-                         kwargs={'documents': documents2})
+                         kwargs={'revision_id': 2})
         thread1.start()
         # NOTE(felipemonteiro): Add a sleep here to avoid a data race where the
         # cache might not be populated fast enough before the second thread
@@ -97,10 +181,58 @@ class RenderedDocumentsCacheTest(test_base.DeckhandTestCase):
         thread1.join()
         thread2.join()
 
-        # Validate that 2nd thread uses 1st thread's document set which proves
-        # caching working across threads.
+        # Validate that 2nd thread uses 1st thread's rendered documents which
+        # proves caching working across threads.
         self.assertEqual(2, len(rendered_documents_by_thread))
-        self.assertEqual(rendered_documents_by_thread[0],
-                         rendered_documents_by_thread[1])
+        self.assertIs(rendered_documents_by_thread[0],
+                      rendered_documents_by_thread[1])
         self.assertFalse(cache_hit_by_thread[0])  # 1st time missing in cache.
         self.assertTrue(cache_hit_by_thread[1])  # 2nd time should hit cache.
+
+    def test_lookup_by_revision_id_reuses_previous_render_state(self):
+        """Validate that rendering a revision is seeded with the state of the
+        previous render, so only changed documents are rendered again.
+        """
+        document_factory = factories.DocumentFactory(1, [1])
+        documents = document_factory.gen_test({})
+        cache.invalidate()
+
+        cache.lookup_by_revision_id(1, documents)
+        documents = document_factory.gen_test({})
+        with mock.patch.object(cache.layering, 'DocumentLayering',
+                               wraps=cache.layering.DocumentLayering) as m:
+            cache.lookup_by_revision_id(2, documents)
+        self.assertIsNotNone(m.call_args[1]['render_state'])
+
+        # Invalidating the cache discards the render state too.
+        cache.invalidate()
+        with mock.patch.object(cache.layering, 'DocumentLayering',
+                               wraps=cache.layering.DocumentLayering) as m:
+            cache.lookup_by_revision_id(3, documents)
+        self.assertIsNone(m.call_args[1]['render_state'])
+
+    def test_lookup_by_revision_id_shared_cache(self):
+        """Validate that the ``file`` and ``dbm`` backends share rendered
+        documents between workers.
+        """
+        document_factory = factories.DocumentFactory(1, [1])
+        documents = document_factory.gen_test({})
+
+        for cache_type in ('file', 'dbm'):
+            data_dir = self.useFixture(fixtures.TempDir()).path
+            self.override_config('cache_type', cache_type, group='engine')
+            self.override_config('cache_data_dir', data_dir, group='engine')
+
+            # Each worker creates its own cache on first use.
+            with mock.patch.multiple(cache, _DOCUMENT_RENDERING_CACHE=None,
+                                     _REVISION_CACHE_KEYS=None):
+                rendered_documents, cache_hit = cache.lookup_by_revision_id(
+                    1, documents)
+                self.assertFalse(cache_hit)
+            with mock.patch.multiple(cache, _DOCUMENT_RENDERING_CACHE=None,
+                                     _REVISION_CACHE_KEYS=None):
+                next_rendered_documents, cache_hit = (
+                    cache.lookup_by_revision_id(2, documents))
+                self.assertTrue(cache_hit)
+                self.assertEqual(rendered_documents, next_rendered_documents)
+                cache.invalidate()
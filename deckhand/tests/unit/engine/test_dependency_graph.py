@@ -0,0 +1,80 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from deckhand.engine import _dependency_graph
+from deckhand import errors
+from deckhand.tests.unit import base as test_base
+
+
+class TestDependencyGraph(test_base.DeckhandTestCase):
+
+    def test_topological_sort(self):
+        graph = _dependency_graph.DependencyGraph()
+        graph.add_node('e')
+        graph.add_dependency('a', 'b')
+        graph.add_dependency('a', 'c')
+        graph.add_dependency('b', 'd')
+        graph.add_dependency('c', 'd')
+        graph.add_dependency('c', 'd')
+
+        result = graph.topological_sort()
+
+        self.assertEqual(5, len(result))
+        self.assertEqual({'b', 'c'}, graph.dependencies('a'))
+        self.assertEqual(set(), graph.dependencies('e'))
+        for node in result:
+            for dependency in graph.dependencies(node):
+                self.assertLess(result.index(dependency), result.index(node))
+
+    def test_topological_sort_with_cycle_raises_exc(self):
+        graph = _dependency_graph.DependencyGraph()
+        graph.add_dependency('a', 'b')
+        graph.add_dependency('b', 'c')
+        graph.add_dependency('c', 'b')
+
+        e = self.assertRaises(errors.SubstitutionDependencyCycle,
+                              graph.topological_sort)
+        self.assertIn("('b', 'c')", e.format_message())
+        self.assertIn("('c', 'b')", e.format_message())
+        self.assertNotIn("'a'", e.format_message())
+
+    def test_topological_sort_with_self_reference_raises_exc(self):
+        graph = _dependency_graph.DependencyGraph()
+        graph.add_dependency('a', 'a')
+
+        e = self.assertRaises(errors.SubstitutionDependencyCycle,
+                              graph.topological_sort)
+        self.assertIn("[('a', 'a')]", e.format_message())
+
+    def test_components(self):
+        graph = _dependency_graph.DependencyGraph()
+        graph.add_dependency('a', 'b')
+        graph.add_node('c')
+        graph.add_dependency('d', 'e')
+        graph.add_dependency('f', 'e')
+        graph.add_dependency('f', 'b')
+
+        self.assertEqual([['a', 'b', 'd', 'e', 'f'], ['c']],
+                         graph.components())
+
+    def test_closure(self):
+        graph = _dependency_graph.DependencyGraph()
+        graph.add_dependency('a', 'b')
+        graph.add_dependency('b', 'c')
+        graph.add_dependency('d', 'c')
+        graph.add_node('e')
+
+        self.assertEqual({'a', 'b', 'c'}, graph.closure(['a']))
+        self.assertEqual({'b', 'c', 'd'}, graph.closure(['b', 'd']))
+        self.assertEqual(set(), graph.closure(['missing']))
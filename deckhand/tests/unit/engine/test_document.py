@@ -0,0 +1,117 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import pickle
+
+import yaml
+
+from deckhand.common.document import DocumentDict
+from deckhand.engine._document import Document
+from deckhand.tests.unit import base as test_base
+from deckhand.tests.unit.engine import test_document_layering_and_replacement
+from deckhand.tests.unit.engine import test_document_layering_incremental
+
+_PROPERTIES = ('actions', 'is_abstract', 'is_control', 'is_encrypted',
+               'is_replacement', 'labels', 'layer', 'meta', 'name',
+               'parent_selector', 'schema', 'storage_policy', 'substitutions',
+               'has_replacement', 'replaced_by')
+
+_SECRET_REF = ('https://barbican.example.org/v1/secrets/'
+               '7b3e9f1c-5a2d-4086-9e4b-2d7a1c3f6058')
+
+
+class TestDocument(test_base.DeckhandTestCase):
+
+    def test_properties_match_document_dict(self):
+        documents = (
+            test_document_layering_incremental.INCREMENTAL_SAMPLE +
+            test_document_layering_and_replacement.REPLACEMENT_3_TIER_SAMPLE +
+            [{}, {'schema': 'deckhand/Certificate/v1',
+                  'metadata': {'name': 'cert', 'storagePolicy': 'encrypted'},
+                  'data': _SECRET_REF}])
+        for document in copy.deepcopy(documents):
+            expected = DocumentDict(document)
+            actual = Document(document)
+            self.assertEqual(expected, actual)
+            for name in _PROPERTIES:
+                self.assertEqual(getattr(expected, name),
+                                 getattr(actual, name), name)
+            self.assertEqual(bool(expected.has_barbican_ref),
+                             actual.has_barbican_ref)
+
+    def test_properties_follow_assignments(self):
+        document = Document(copy.deepcopy(
+            test_document_layering_incremental.INCREMENTAL_SAMPLE[2]))
+        self.assertEqual('site-1', document.name)
+        self.assertFalse(document.is_encrypted)
+        self.assertFalse(document.has_barbican_ref)
+
+        document['metadata'] = dict(document['metadata'], name='site-3')
+        self.assertEqual(('example/Kind/v1', 'site', 'site-3'), document.meta)
+
+        document.storage_policy = 'encrypted'
+        self.assertTrue(document.is_encrypted)
+        self.assertEqual('encrypted', document['metadata']['storagePolicy'])
+
+        document.data = _SECRET_REF
+        self.assertTrue(document.has_barbican_ref)
+        document.data = {}
+        self.assertFalse(document.has_barbican_ref)
+
+    def test_hash_by_meta(self):
+        document = Document(
+            test_document_layering_incremental.INCREMENTAL_SAMPLE[2])
+        self.assertEqual(hash(document.meta), hash(document))
+        self.assertEqual(hash(document), hash(Document(document)))
+
+    def test_strings_interned(self):
+        # Equal strings built at runtime are distinct objects until interned.
+        documents = [
+            Document(yaml.safe_load(yaml.safe_dump(
+                test_document_layering_incremental.INCREMENTAL_SAMPLE[1])))
+            for _ in range(2)]
+        first, second = documents
+        self.assertIs(first.schema, second.schema)
+        self.assertIs(first['schema'], second['schema'])
+        self.assertIs(first.layer, second.layer)
+        label_key, label_value = next(iter(first.labels.items()))
+        other_key, other_value = next(iter(second.labels.items()))
+        self.assertIs(label_key, other_key)
+        self.assertIs(label_value, other_value)
+
+    def test_copy_and_pickle(self):
+        parent, child = [
+            Document(d) for d in copy.deepcopy(
+                test_document_layering_incremental.INCREMENTAL_SAMPLE[1:3])]
+        parent.replaced_by = child
+
+        for copied in (copy.deepcopy(parent),
+                       pickle.loads(pickle.dumps(parent))):
+            self.assertIsInstance(copied, Document)
+            self.assertEqual(parent, copied)
+            self.assertEqual(parent.meta, copied.meta)
+            self.assertEqual(child, copied.replaced_by)
+            self.assertTrue(copied.has_replacement)
+
+    def test_no_instance_dict(self):
+        for document in (DocumentDict({}), Document({})):
+            self.assertFalse(hasattr(document, '__dict__'))
+
+    def test_yaml_dump(self):
+        document = Document(
+            test_document_layering_incremental.INCREMENTAL_SAMPLE[2])
+        self.assertEqual(
+            test_document_layering_incremental.INCREMENTAL_SAMPLE[2],
+            yaml.safe_load(yaml.safe_dump(document)))
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import yaml
 
 from unittest import mock
@@ -560,6 +561,69 @@ class TestDocumentLayering2Layers(TestDocumentLayering):
         }
         self._test_layering(documents, site_expected={})
 
+    def test_layering_multi_parentselector_overlapping_labels(self):
+        mapping = {
+            "_GLOBAL_DATA_1_": {"data": {"a": 1}},
+            "_GLOBAL_DATA_2_": {"data": {"a": 2}},
+            "_GLOBAL_DATA_3_": {"data": {"a": 3}},
+            "_SITE_DATA_1_": {"data": {"b": 1}},
+            "_SITE_DATA_2_": {"data": {"b": 2}},
+            "_SITE_ACTIONS_1_": {
+                "actions": [{"method": "merge", "path": "."}]},
+            "_SITE_ACTIONS_2_": {
+                "actions": [{"method": "merge", "path": "."}]}
+        }
+        doc_factory = factories.DocumentFactory(2, [3, 2])
+        documents = doc_factory.gen_test(mapping, site_abstract=False,
+                                         global_abstract=False)
+
+        # Each global document shares each of its labels with another one, so
+        # only the intersection of the documents matching each label of a
+        # parentSelector identifies a single parent.
+        documents[1]['metadata']['labels'] = {'foo': 'bar', 'baz': 'qux'}
+        documents[2]['metadata']['labels'] = {'foo': 'bar', 'baz': 'quux'}
+        documents[3]['metadata']['labels'] = {'foo': 'other', 'baz': 'qux'}
+        documents[4]['metadata']['layeringDefinition']['parentSelector'] = {
+            'foo': 'bar', 'baz': 'quux'}
+        documents[5]['metadata']['layeringDefinition']['parentSelector'] = {
+            'foo': 'other', 'baz': 'qux'}
+
+        site_expected = [{'a': 2, 'b': 1}, {'a': 3, 'b': 2}]
+        global_expected = [{'a': 1}, {'a': 2}, {'a': 3}]
+        self._test_layering(documents, site_expected,
+                            global_expected=global_expected)
+
+    def test_layering_shares_data_not_touched_by_actions(self):
+        mapping = {
+            "_GLOBAL_DATA_1_": {"data": {"a": {"x": 1, "y": 2},
+                                         "b": {"z": [3]}}},
+            "_SITE_DATA_1_": {"data": {"a": {"x": 7}, "b": {"z": [4]}}},
+            "_SITE_ACTIONS_1_": {
+                "actions": [{"method": "merge", "path": ".a"},
+                            {"method": "delete", "path": ".b.z"}]}
+        }
+        doc_factory = factories.DocumentFactory(2, [1, 1])
+        documents = doc_factory.gen_test(mapping, site_abstract=False,
+                                         global_abstract=False)
+        documents[1]['data']['c'] = {'untouched': True}
+        expected_documents = copy.deepcopy(documents)
+
+        rendered_documents = {
+            d.layer: d for d in layering.DocumentLayering(
+                documents, validate=False).render()}
+
+        self.assertEqual({'a': {'x': 7, 'y': 2}, 'b': {},
+                          'c': {'untouched': True}},
+                         rendered_documents['site'].data)
+        # Neither the parent nor the child were modified by layering...
+        self.assertEqual(expected_documents, documents)
+        self.assertEqual({'a': {'x': 1, 'y': 2}, 'b': {'z': [3]},
+                          'c': {'untouched': True}},
+                         rendered_documents['global'].data)
+        # ... and only the data actions touched was copied.
+        self.assertIs(rendered_documents['global'].data['c'],
+                      rendered_documents['site'].data['c'])
+
     def test_layering_method_delete(self):
         site_expected = [{}, {'c': 9}, {"a": {"x": 1, "y": 2}}]
         doc_factory = factories.DocumentFactory(2, [1, 1])
@@ -0,0 +1,267 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import hashlib
+import inspect
+import json
+import yaml
+
+from unittest import mock
+
+from deckhand.engine import layering
+from deckhand import errors
+from deckhand.tests.unit import base as test_base
+from deckhand.tests.unit.engine import test_document_layering_and_replacement
+
+INCREMENTAL_SAMPLE = list(yaml.safe_load_all(inspect.cleandoc(
+    """
+    ---
+    schema: deckhand/LayeringPolicy/v1
+    metadata:
+      schema: metadata/Control/v1
+      name: layering-policy
+      storagePolicy: cleartext
+    data:
+      layerOrder:
+        - global
+        - site
+    ---
+    schema: example/Kind/v1
+    metadata:
+      schema: metadata/Document/v1
+      name: global-1
+      storagePolicy: cleartext
+      labels:
+        name: global-1
+      layeringDefinition:
+        abstract: true
+        layer: global
+    data:
+      a: 1
+      b: 2
+    ---
+    schema: example/Kind/v1
+    metadata:
+      schema: metadata/Document/v1
+      name: site-1
+      storagePolicy: cleartext
+      layeringDefinition:
+        abstract: false
+        layer: site
+        parentSelector:
+          name: global-1
+        actions:
+          - method: merge
+            path: .
+      substitutions:
+        - dest:
+            path: .password
+          src:
+            schema: deckhand/Passphrase/v1
+            name: password
+            path: .
+    data:
+      b: 3
+    ---
+    schema: deckhand/Passphrase/v1
+    metadata:
+      schema: metadata/Document/v1
+      name: password
+      storagePolicy: cleartext
+      layeringDefinition:
+        abstract: false
+        layer: site
+    data: my-secret
+    ---
+    schema: example/Other/v1
+    metadata:
+      schema: metadata/Document/v1
+      name: site-2
+      storagePolicy: cleartext
+      labels:
+        name: site-2
+      layeringDefinition:
+        abstract: false
+        layer: site
+    data:
+      c: 4
+    """)))
+
+
+def _with_hashes(documents):
+    documents = copy.deepcopy(documents)
+    for document in documents:
+        for key, section in (('data_hash', 'data'),
+                             ('metadata_hash', 'metadata')):
+            document[key] = hashlib.sha256(json.dumps(
+                document[section], sort_keys=True).encode()).hexdigest()
+    return documents
+
+
+class TestDocumentLayeringIncremental(test_base.DeckhandTestCase):
+
+    def _render(self, documents, render_state=None):
+        document_layering = layering.DocumentLayering(
+            documents, validate=False, render_state=render_state)
+        rendered_documents = document_layering.render()
+        return (sorted(rendered_documents, key=lambda d: d.meta),
+                document_layering.render_state)
+
+    def _update(self, documents, name, data):
+        for document in documents:
+            if document['metadata']['name'] == name:
+                document['data'] = data
+        return _with_hashes(documents)
+
+    def test_incremental_render_matches_full_render(self):
+        documents = _with_hashes(INCREMENTAL_SAMPLE)
+        _, render_state = self._render(documents)
+
+        for name, data in (('global-1', {'a': 5, 'b': 2}),
+                           ('password', 'new-secret'),
+                           ('site-2', {'c': 6})):
+            updated_documents = self._update(documents, name, data)
+            expected, _ = self._render(copy.deepcopy(updated_documents))
+            actual, _ = self._render(updated_documents, render_state)
+            self.assertEqual(expected, actual)
+
+    def test_incremental_render_only_renders_affected_documents(self):
+        documents = _with_hashes(INCREMENTAL_SAMPLE)
+        _, render_state = self._render(documents)
+
+        substitution = layering.secrets_manager.SecretsSubstitution
+        with mock.patch.object(layering.DocumentLayering, '_apply_action',
+                               autospec=True,
+                               side_effect=layering.DocumentLayering
+                               ._apply_action) as apply_action, \
+                mock.patch.object(substitution, 'substitute_all',
+                                  autospec=True,
+                                  side_effect=substitution.substitute_all
+                                  ) as substitute_all:
+            # Nothing changed: nothing is rendered again.
+            rendered_documents, render_state = self._render(
+                copy.deepcopy(documents), render_state)
+            self.assertFalse(apply_action.called)
+            self.assertFalse(substitute_all.called)
+            self.assertEqual(
+                {'a': 1, 'b': 3, 'password': 'my-secret'},
+                [d for d in rendered_documents
+                 if d.name == 'site-1'][0].data)
+
+            # Only the substitution source and its dependents are rendered.
+            documents = self._update(documents, 'password', 'new-secret')
+            self._render(documents, render_state)
+            self.assertEqual(1, apply_action.call_count)
+            self.assertEqual(
+                ['site-1'],
+                [c[0][1].name for c in substitute_all.call_args_list])
+
+    def test_incremental_render_reuses_nothing_without_hashes(self):
+        documents = _with_hashes(INCREMENTAL_SAMPLE)
+        _, render_state = self._render(documents)
+
+        with mock.patch.object(layering.DocumentLayering, '_apply_action',
+                               autospec=True,
+                               side_effect=layering.DocumentLayering
+                               ._apply_action) as apply_action:
+            self._render(copy.deepcopy(INCREMENTAL_SAMPLE), render_state)
+        self.assertEqual(1, apply_action.call_count)
+
+    def test_incremental_render_with_replacement(self):
+        documents = _with_hashes(
+            test_document_layering_and_replacement.REPLACEMENT_3_TIER_SAMPLE)
+        _, render_state = self._render(documents)
+
+        for document in documents:
+            if document['metadata'].get('replacement'):
+                document['data'] = {'values': {'pod': {'replicas': {
+                    'server': 32}}}}
+        documents = _with_hashes(documents)
+
+        expected, _ = self._render(copy.deepcopy(documents))
+        actual, _ = self._render(documents, render_state)
+        self.assertEqual(expected, actual)
+
+
+class TestDocumentLayeringFiltered(test_base.DeckhandTestCase):
+
+    def _render(self, documents, document_filters=None, render_state=None):
+        document_layering = layering.DocumentLayering(
+            copy.deepcopy(documents), validate=False,
+            render_state=render_state)
+        rendered_documents = document_layering.render(
+            document_filters=document_filters)
+        return rendered_documents, document_layering.render_state
+
+    def test_filtered_render_matches_full_render(self):
+        samples = (
+            INCREMENTAL_SAMPLE,
+            test_document_layering_and_replacement.REPLACEMENT_3_TIER_SAMPLE)
+        for documents in samples:
+            expected, _ = self._render(documents)
+            for document in expected:
+                actual, _ = self._render(
+                    documents, {'schema': document.schema,
+                                'metadata.name': document.name})
+                self.assertEqual([document], actual)
+
+    def test_filtered_render_only_renders_closure(self):
+        documents = copy.deepcopy(INCREMENTAL_SAMPLE)
+        # Unrelated to site-2, so never rendered for it.
+        documents[2]['metadata']['layeringDefinition']['actions'] = [
+            {'method': 'merge', 'path': '.missing'}]
+
+        rendered_documents, _ = self._render(
+            documents, {'metadata.name': 'site-2'})
+        self.assertEqual(['site-2'], [d.name for d in rendered_documents])
+
+        self.assertRaises(errors.MissingDocumentKey, self._render,
+                          documents, {'metadata.name': 'site-1'})
+
+    def test_filtered_render_keeps_previous_render_state(self):
+        documents = _with_hashes(INCREMENTAL_SAMPLE)
+        _, render_state = self._render(documents)
+
+        _, filtered_render_state = self._render(
+            documents, {'metadata.name': 'site-2'}, render_state)
+        self.assertEqual(render_state['documents'].keys(),
+                         filtered_render_state['documents'].keys())
+
+        _, filtered_render_state = self._render(
+            documents, {'metadata.name': 'site-2'})
+        self.assertEqual(
+            [('example/Other/v1', 'site', 'site-2')],
+            list(filtered_render_state['documents']))
+
+    def test_full_render_after_filtered_render_of_dependency(self):
+        documents = _with_hashes(INCREMENTAL_SAMPLE)
+        _, render_state = self._render(documents)
+
+        # Only the password is rendered, leaving site-1, which it is
+        # substituted into, with a stale previous state.
+        documents[3]['data'] = 'new-secret'
+        documents = _with_hashes(documents)
+        _, render_state = self._render(
+            documents, {'metadata.name': 'password'}, render_state)
+        self.assertNotIn(('example/Kind/v1', 'site', 'site-1'),
+                         render_state['documents'])
+
+        documents[4]['data'] = {'c': 5}
+        documents = _with_hashes(documents)
+        expected, _ = self._render(documents)
+        actual, _ = self._render(documents, render_state=render_state)
+        self.assertEqual(expected, actual)
+        self.assertEqual('new-secret', [
+            d for d in actual if d.name == 'site-1'][0].data['password'])
@@ -0,0 +1,92 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+
+import fixtures
+from unittest import mock
+
+from deckhand.engine import layering
+from deckhand import errors
+from deckhand.tests.unit import base as test_base
+from deckhand.tests.unit.engine import test_document_layering_and_replacement
+from deckhand.tests.unit.engine import test_document_layering_incremental
+
+# Three independent groups of documents: site-1 with its parent and
+# substitution source, site-2, and the replacement sample.
+PARALLEL_SAMPLE = (
+    test_document_layering_and_replacement.REPLACEMENT_3_TIER_SAMPLE +
+    test_document_layering_incremental.INCREMENTAL_SAMPLE[1:])
+
+
+class TestDocumentLayeringParallel(test_base.DeckhandTestCase):
+
+    def setUp(self):
+        super(TestDocumentLayeringParallel, self).setUp()
+        self.override_config('render_workers', 2, group='engine')
+        self.override_config('render_workers_threshold', 0, group='engine')
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.layering._EXECUTOR', None))
+        self.addCleanup(self._shutdown_executor)
+
+    def _shutdown_executor(self):
+        if layering._EXECUTOR is not None:
+            layering._EXECUTOR.shutdown()
+
+    def _render(self, documents, **kwargs):
+        return layering.DocumentLayering(
+            copy.deepcopy(documents), validate=False, **kwargs).render()
+
+    def _render_in_process(self, documents, **kwargs):
+        with mock.patch.object(layering, '_get_executor',
+                               autospec=True) as mock_get_executor:
+            rendered_documents = self._render(documents, **kwargs)
+        mock_get_executor.assert_not_called()
+        return rendered_documents
+
+    def test_parallel_render_matches_serial_render(self):
+        actual = self._render(PARALLEL_SAMPLE)
+        self.assertIsNotNone(layering._EXECUTOR)
+
+        self.override_config('render_workers', 0, group='engine')
+        expected = self._render_in_process(PARALLEL_SAMPLE)
+        self.assertEqual(expected, actual)
+        self.assertEqual([d.meta for d in expected],
+                         [d.meta for d in actual])
+
+    def test_small_revision_rendered_in_process(self):
+        expected = self._render(PARALLEL_SAMPLE)
+
+        self.override_config('render_workers_threshold', 100, group='engine')
+        self.assertEqual(expected, self._render_in_process(PARALLEL_SAMPLE))
+
+    def test_encrypted_documents_rendered_in_process(self):
+        documents = copy.deepcopy(
+            test_document_layering_incremental.INCREMENTAL_SAMPLE)
+        for document in documents:
+            if document['metadata']['name'] == 'site-2':
+                document['metadata']['storagePolicy'] = 'encrypted'
+
+        # Only site-1 and its dependencies are left to render in other
+        # processes, which isn't worth it.
+        self._render_in_process(documents)
+
+    def test_parallel_render_raises_error(self):
+        documents = copy.deepcopy(PARALLEL_SAMPLE)
+        for document in documents:
+            if document['metadata']['name'] == 'site-1':
+                document['metadata']['layeringDefinition']['actions'] = [
+                    {'method': 'merge', 'path': '.missing'}]
+
+        self.assertRaises(errors.MissingDocumentKey, self._render, documents)
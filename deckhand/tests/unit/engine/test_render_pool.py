@@ -0,0 +1,91 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import os
+
+import fixtures
+from unittest import mock
+
+from deckhand.engine import layering
+from deckhand.engine import render_pool
+from deckhand import errors
+from deckhand.tests.unit import base as test_base
+from deckhand.tests.unit.engine import test_document_layering_parallel
+
+
+def _render_counting_executors(documents):
+    # Runs in a worker process, where mocks of the test process don't apply.
+    with mock.patch.object(layering, '_get_executor',
+                           autospec=True) as mock_get_executor:
+        layering.DocumentLayering(documents, validate=False).render()
+    return mock_get_executor.call_count
+
+
+class TestRenderPool(test_base.DeckhandTestCase):
+
+    def setUp(self):
+        super(TestRenderPool, self).setUp()
+        self.override_config('render_pool_workers', 1, group='engine')
+        self.override_config('render_pool_queue_size', 0, group='engine')
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.render_pool._EXECUTOR', None))
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.render_pool._depth', 0))
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.render_pool._stats',
+            dict(render_pool._stats, jobs=0, rejected=0)))
+        self.addCleanup(self._shutdown_executor)
+
+    def _shutdown_executor(self):
+        if render_pool._EXECUTOR is not None:
+            render_pool._EXECUTOR.shutdown()
+
+    def test_run_in_worker_process(self):
+        self.assertNotEqual(os.getpid(), render_pool.run(os.getpid))
+        self.assertEqual('10', render_pool.run(format, 10, 'd'))
+
+        stats = render_pool.get_stats()
+        self.assertEqual(2, stats['jobs'])
+        self.assertEqual(0, stats['depth'])
+
+    def test_run_in_current_thread_if_disabled(self):
+        self.override_config('render_pool_workers', 0, group='engine')
+        with mock.patch.object(render_pool, '_get_executor',
+                               autospec=True) as mock_get_executor:
+            self.assertEqual(os.getpid(), render_pool.run(os.getpid))
+        mock_get_executor.assert_not_called()
+
+    def test_run_raises_job_error(self):
+        self.assertRaises(ValueError, render_pool.run, int, 'not-an-int')
+        self.assertEqual(1, render_pool.get_stats()['jobs'])
+
+    def test_run_rejects_job_if_queue_full(self):
+        self.useFixture(fixtures.MonkeyPatch(
+            'deckhand.engine.render_pool._depth', 1))
+        with mock.patch.object(render_pool, '_get_executor',
+                               autospec=True) as mock_get_executor:
+            e = self.assertRaises(errors.RenderPoolFull, render_pool.run,
+                                  os.getpid)
+        mock_get_executor.assert_not_called()
+        self.assertEqual(1, e.retry_after)
+        self.assertEqual(1, render_pool.get_stats()['rejected'])
+
+    def test_render_in_worker_without_render_workers(self):
+        self.override_config('render_workers', 4, group='engine')
+        self.override_config('render_workers_threshold', 0, group='engine')
+        documents = copy.deepcopy(
+            test_document_layering_parallel.PARALLEL_SAMPLE)
+        self.assertEqual(
+            0, render_pool.run(_render_counting_executors, documents))
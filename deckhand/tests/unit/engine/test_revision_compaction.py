@@ -0,0 +1,65 @@
+# Copyright 2018 AT&T Intellectual Property.  All other rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import os
+
+import fixtures
+from oslo_serialization import jsonutils as json
+
+from deckhand.db.sqlalchemy import api as db_api
+from deckhand.engine import revision_compaction
+from deckhand.tests import test_utils
+from deckhand.tests.unit import base
+
+
+class TestRevisionCompaction(base.DeckhandWithDBTestCase):
+
+    def setUp(self):
+        super(TestRevisionCompaction, self).setUp()
+        self.archive_dir = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'archive')
+        self.override_config('archive_dir', self.archive_dir,
+                             group='compaction')
+
+    def test_compact_revisions_archives_removed_revisions(self):
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name = test_utils.rand_name('bucket')
+        created_documents = self.create_documents(bucket_name, payload)
+        self.create_documents(bucket_name, [])
+
+        result = revision_compaction.compact_revisions(retention_days=0)
+
+        self.assertEqual([1], result['revisions'])
+        self.assertEqual([result['archive']], [
+            os.path.join(self.archive_dir, f)
+            for f in os.listdir(self.archive_dir)])
+        with gzip.open(result['archive'], 'rt') as f:
+            archived = [json.loads(line) for line in f]
+        self.assertEqual([1], [r['id'] for r in archived])
+        self.assertEqual(
+            sorted(d['id'] for d in created_documents),
+            sorted(d['id'] for d in archived[0]['documents']))
+
+    def test_compact_revisions_within_retention_window(self):
+        payload = base.DocumentFixture.get_minimal_multi_fixture(count=2)
+        bucket_name = test_utils.rand_name('bucket')
+        self.create_documents(bucket_name, payload)
+        self.create_documents(bucket_name, [])
+
+        result = revision_compaction.compact_revisions()
+
+        self.assertEqual({'revisions': [], 'archive': None}, result)
+        self.assertFalse(os.path.exists(self.archive_dir))
+        self.assertEqual(2, len(db_api.revision_get_all()))
@@ -1050,6 +1050,87 @@ data:
             val = documents[idx]['data']['values']
             self.assertEqual(val['endpoints']['oslo_db']['client'], expected)
 
+    def test_doc_substitution_reuses_source_values(self):
+        test_yaml = """
+---
+schema: pegleg/CommonAddresses/v1
+metadata:
+  name: common-addresses
+  schema: metadata/Document/v1
+  layeringDefinition:
+    abstract: false
+    layer: global
+data:
+  dns:
+    cluster_domain: cluster.local
+---
+schema: armada/Chart/v1
+metadata:
+  name: example-chart-01
+  schema: metadata/Document/v1
+  layeringDefinition:
+    abstract: false
+    layer: global
+  substitutions:
+    - src:
+        schema: pegleg/CommonAddresses/v1
+        name: common-addresses
+        path: .dns
+      dest:
+        - path: .values.conf.dns
+        - path: .values.conf.resolver
+    - src:
+        schema: pegleg/CommonAddresses/v1
+        name: common-addresses
+        path: .dns.cluster_domain
+      dest:
+        path: .values.conf.dns.search
+data:
+  values:
+    conf:
+      debug: true
+---
+schema: armada/Chart/v1
+metadata:
+  name: example-chart-02
+  schema: metadata/Document/v1
+  layeringDefinition:
+    abstract: false
+    layer: global
+  substitutions:
+    - src:
+        schema: pegleg/CommonAddresses/v1
+        name: common-addresses
+        path: .dns.cluster_domain
+      dest:
+        path: .values.domain
+data: {}
+"""
+        documents = list(yaml.safe_load_all(test_yaml))
+        source_data = copy.deepcopy(documents[0]['data'])
+        secret_substitution = secrets_manager.SecretsSubstitution(
+            documents)
+
+        with mock.patch.object(  # noqa: H210
+                secrets_manager.utils, 'jsonpath_parse',
+                wraps=secrets_manager.utils.jsonpath_parse) as (
+                    mock_jsonpath_parse):
+            for document in documents[1:]:
+                list(secret_substitution.substitute_all(document))
+
+        # Each source path is only looked up once.
+        self.assertEqual(2, mock_jsonpath_parse.call_count)
+        self.assertEqual(source_data, documents[0]['data'])
+        self.assertEqual(
+            {'values': {'conf': {
+                'debug': True,
+                'dns': {'cluster_domain': 'cluster.local',
+                        'search': 'cluster.local'},
+                'resolver': {'cluster_domain': 'cluster.local'}}}},
+            documents[1]['data'])
+        self.assertEqual({'values': {'domain': 'cluster.local'}},
+                         documents[2]['data'])
+
 
 class TestSecretsSubstitutionNegative(test_base.DeckhandWithDBTestCase):
 
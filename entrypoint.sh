@@ -56,8 +56,11 @@ if [ "$1" = 'server' ]; then
         --module deckhand.cmd
 elif [ "$1" = 'alembic' ]; then
     exec alembic ${@:2}
+elif [ "$1" = 'manage' ]; then
+    exec deckhand-manage \
+        --config-file ${DECKHAND_CONFIG_DIR}/deckhand.conf ${@:2}
 elif [ "$1" = 'shell' ]; then
     exec bash
 else
-    echo "Valid commands are 'alembic <command>' and 'server'"
+    echo "Valid commands are 'alembic <command>', 'manage <command>' and 'server'"
 fi